@@ -1,19 +1,93 @@
 from __future__ import annotations
 
-import shutil
+import asyncio
+import hashlib
+import os
+import stat
+import tempfile
 from pathlib import Path
-from typing import Literal
+from typing import BinaryIO, Literal
 
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Response, UploadFile
 from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
 
 from app.config import Settings
+from app.db.models import ProjectRow
 
-from .common import get_repo, ok
+from .common import etag_matches, get_repo, ok, require_project
 
 router = APIRouter(prefix="/api/v1", tags=["assets"])
 
 
+class ZeroCopyFileResponse(FileResponse):
+    """FileResponse that hands the fd to the server when it advertises zero-copy send."""
+
+    _zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zerocopy = "http.response.zerocopysend" in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool, send_pathsend: bool) -> None:
+        if send_header_only or send_pathsend or not self._zerocopy:
+            await super()._handle_simple(send, send_header_only, send_pathsend)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as fh:
+            await send({"type": "http.response.zerocopysend", "file": fh.fileno()})
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        # Video seeks arrive as single ranges; let the server sendfile just that slice.
+        if send_header_only or not self._zerocopy:
+            await super()._handle_single_range(send, start, end, file_size, send_header_only)
+            return
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        with open(self.path, "rb") as fh:
+            await send(
+                {
+                    "type": "http.response.zerocopysend",
+                    "file": fh.fileno(),
+                    "offset": start,
+                    "count": end - start,
+                }
+            )
+
+
+def _stage_upload(src: BinaryIO, upload_dir: Path, chunk_size: int) -> tuple[Path, str]:
+    """Stream ``src`` into a temp file inside ``upload_dir`` and return it with its SHA-256.
+
+    Nothing under a name another asset might point to is touched until the digest
+    is known.
+    """
+    # hashlib's sha256 uses the CPU's SHA extensions when OpenSSL has them.
+    digest = hashlib.sha256()
+    fd, tmp_name = tempfile.mkstemp(dir=upload_dir, prefix=".upload-")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := src.read(chunk_size):
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, digest.hexdigest()
+
+
+def _commit_upload(tmp_path: Path, out_path: Path) -> None:
+    # Names are digest-addressed, so an existing file already holds these bytes;
+    # leave it alone rather than swapping the inode under an open download.
+    if out_path.is_file():
+        tmp_path.unlink(missing_ok=True)
+    else:
+        os.replace(tmp_path, out_path)
+
+
 @router.post("/assets/upload")
 async def upload_asset(
     request: Request,
@@ -23,23 +97,35 @@ async def upload_asset(
 ) -> dict:
     repo = get_repo(request)
     settings: Settings = request.app.state.settings
-    project = repo.get_project(project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{project_id}' was not found")
+    await require_project(request, project_id)
 
-    project_dir = settings.projects_dir / project_id / "uploads"
-    project_dir.mkdir(parents=True, exist_ok=True)
+    upload_dir = settings.projects_dir / project_id / "uploads"
+    upload_dir.mkdir(parents=True, exist_ok=True)
     safe_name = Path(file.filename or "upload.bin").name
-    out_path = project_dir / safe_name
-    with out_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    tmp_path, sha256 = await asyncio.to_thread(
+        _stage_upload, file.file, upload_dir, settings.upload_chunk_bytes
+    )
+
+    existing = await asyncio.to_thread(
+        repo.get_asset_by_hash, project_id=project_id, kind=kind, sha256=sha256
+    )
+    if existing is not None and Path(existing["path"]).is_file():
+        await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        return ok({"asset": existing, "asset_id": existing["id"]})
 
-    asset = repo.create_asset(
+    out_path = upload_dir / f"{sha256}{Path(safe_name).suffix.lower()}"
+    await asyncio.to_thread(_commit_upload, tmp_path, out_path)
+    asset = await asyncio.to_thread(
+        repo.create_asset,
         project_id=project_id,
         job_id=None,
         kind=kind,
         path=str(out_path),
-        meta={"uploaded_name": safe_name, "content_type": file.content_type},
+        meta={
+            "uploaded_name": safe_name,
+            "content_type": file.content_type,
+            "sha256": sha256,
+        },
     )
     return ok({"asset": asset, "asset_id": asset["id"]})
 
@@ -47,21 +133,36 @@ async def upload_asset(
 @router.get("/assets/{asset_id}")
 async def get_asset_file(request: Request, asset_id: str):
     repo = get_repo(request)
-    asset = repo.get_asset(asset_id)
+    asset = await asyncio.to_thread(repo.get_asset, asset_id)
     if asset is None:
         raise HTTPException(status_code=404, detail=f"asset_id '{asset_id}' was not found")
-    file_path = Path(asset["path"])
-    if not file_path.exists():
+    file_path = asset["path"]
+    # One stat answers existence, size, mtime and the ETag; FileResponse reuses it.
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(status_code=404, detail=f"asset file missing at '{file_path}'")
-    return FileResponse(file_path)
+
+    # Strong validators so If-Range lets browsers resume and scrub video byte ranges.
+    sha256 = asset["meta"].get("sha256")
+    if sha256:
+        etag = f'"{sha256[:16]}"'
+    else:
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return ZeroCopyFileResponse(file_path, stat_result=stat_result, headers={"ETag": etag})
 
 
 @router.get("/projects/{project_id}/assets")
-async def list_project_assets(request: Request, project_id: str) -> dict:
+async def list_project_assets(
+    request: Request,
+    project_id: str,
+    _project: ProjectRow = Depends(require_project),
+) -> dict:
     repo = get_repo(request)
-    project = repo.get_project(project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{project_id}' was not found")
-    assets = repo.list_assets(project_id=project_id)
+    assets = await asyncio.to_thread(repo.list_assets, project_id=project_id)
     return ok({"assets": assets})
 
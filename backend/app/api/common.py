@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import cache
+from typing import Any, TypeVar
 
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 
+from app.db.models import ProjectRow
 from app.db.repo import Repository
+from app.services.job_events import JobEventBus
 from app.services.job_queue import JobQueue
 
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
 def ok(data: dict[str, Any] | None = None) -> dict[str, Any]:
     return {"ok": True, "data": data or {}, "error": None}
 
@@ -23,6 +33,18 @@ def raise_not_found(entity: str, entity_id: str) -> None:
     )
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` per RFC 9110: ``*``, comma-separated lists and weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
 def get_repo(request: Request) -> Repository:
     return request.app.state.repo
 
@@ -30,3 +52,63 @@ def get_repo(request: Request) -> Repository:
 def get_queue(request: Request) -> JobQueue:
     return request.app.state.job_queue
 
+
+def get_job_events(request: Request) -> JobEventBus:
+    return request.app.state.job_events
+
+
+async def require_project(request: Request, project_id: str) -> ProjectRow:
+    """Load ``project_id`` or 404, memoized on ``request.state`` for the request."""
+    cached: ProjectRow | None = getattr(request.state, "project", None)
+    if cached is not None and cached["id"] == project_id:
+        return cached
+    project = await asyncio.to_thread(get_repo(request).get_project, project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"project_id '{project_id}' was not found")
+    request.state.project = project
+    return project
+
+
+@cache
+def json_body(model: type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """Dependency that validates the raw body with pydantic-core's JSON parser.
+
+    Skips the stdlib ``json.loads`` + dict validation pass FastAPI does for
+    plain body parameters; errors keep the usual ``body``-prefixed locations.
+    """
+
+    async def parse(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in exc.errors(include_url=False)
+                ]
+            ) from exc
+
+    return parse
+
+
+@cache
+def project_from_body(model: type[BaseModel]) -> Callable[..., Awaitable[ProjectRow]]:
+    """Dependency resolving ``model.project_id`` through :func:`require_project`.
+
+    ``json_body`` is cached per model, so FastAPI's per-request dependency cache
+    shares the parsed payload with the endpoint instead of reading it twice.
+    """
+
+    async def resolve(request: Request, payload: BaseModel = Depends(json_body(model))) -> ProjectRow:
+        return await require_project(request, payload.project_id)
+
+    return resolve
+
+
+def json_body_openapi(model: type[BaseModel]) -> dict[str, Any]:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
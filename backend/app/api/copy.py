@@ -1,28 +1,30 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, Request
 
+from app.db.models import ProjectRow
 from app.schemas import CopyGenerateRequest
 
-from .common import get_queue, get_repo, ok
+from .common import get_queue, json_body, json_body_openapi, ok, project_from_body
 
 router = APIRouter(prefix="/api/v1", tags=["copy"])
 
 
-@router.post("/copy/generate")
-async def queue_copy_generation(request: Request, payload: CopyGenerateRequest) -> dict:
-    repo = get_repo(request)
+@router.post(
+    "/copy/generate",
+    openapi_extra=json_body_openapi(CopyGenerateRequest),
+)
+async def queue_copy_generation(
+    request: Request,
+    payload: CopyGenerateRequest = Depends(json_body(CopyGenerateRequest)),
+    project: ProjectRow = Depends(project_from_body(CopyGenerateRequest)),
+) -> dict:
     queue = get_queue(request)
 
-    project = repo.get_project(payload.project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{payload.project_id}' was not found")
-
-    job = repo.create_job(
+    job = await queue.submit(
         project_id=payload.project_id,
         job_type="copy_generate",
         params=payload.model_dump(),
     )
-    await queue.enqueue(job["id"])
     return ok({"job_id": job["id"], "status": job["status"]})
 
@@ -1,40 +1,45 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.db.models import ProjectRow
 from app.schemas import ImageGenerateRequest, ImageInpaintRequest, ImagePromptImproveRequest
 from app.services.prompt_enhancer import PromptEnhancer
 
-from .common import get_queue, get_repo, ok
+from .common import get_queue, get_repo, json_body, json_body_openapi, ok, project_from_body
 
 router = APIRouter(prefix="/api/v1", tags=["images"])
 
 
-@router.post("/images/generate")
-async def queue_image_generation(request: Request, payload: ImageGenerateRequest) -> dict:
-    repo = get_repo(request)
+@router.post(
+    "/images/generate",
+    openapi_extra=json_body_openapi(ImageGenerateRequest),
+)
+async def queue_image_generation(
+    request: Request,
+    payload: ImageGenerateRequest = Depends(json_body(ImageGenerateRequest)),
+    project: ProjectRow = Depends(project_from_body(ImageGenerateRequest)),
+) -> dict:
     queue = get_queue(request)
 
-    project = repo.get_project(payload.project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{payload.project_id}' was not found")
-
-    job = repo.create_job(
+    job = await queue.submit(
         project_id=payload.project_id,
         job_type="image_generate",
         params=payload.model_dump(),
     )
-    await queue.enqueue(job["id"])
     return ok({"job_id": job["id"], "status": job["status"]})
 
 
-@router.post("/images/improve-prompt")
-async def improve_image_prompt(request: Request, payload: ImagePromptImproveRequest) -> dict:
-    repo = get_repo(request)
-    project = repo.get_project(payload.project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{payload.project_id}' was not found")
-
+@router.post(
+    "/images/improve-prompt",
+    openapi_extra=json_body_openapi(ImagePromptImproveRequest),
+)
+async def improve_image_prompt(
+    payload: ImagePromptImproveRequest = Depends(json_body(ImagePromptImproveRequest)),
+    project: ProjectRow = Depends(project_from_body(ImagePromptImproveRequest)),
+) -> dict:
     enhancer = PromptEnhancer()
     result = enhancer.improve(
         project=project,
@@ -45,27 +50,29 @@ async def improve_image_prompt(request: Request, payload: ImagePromptImproveRequ
     return ok(result)
 
 
-@router.post("/images/inpaint")
-async def queue_image_inpaint(request: Request, payload: ImageInpaintRequest) -> dict:
+@router.post(
+    "/images/inpaint",
+    openapi_extra=json_body_openapi(ImageInpaintRequest),
+)
+async def queue_image_inpaint(
+    request: Request,
+    payload: ImageInpaintRequest = Depends(json_body(ImageInpaintRequest)),
+    project: ProjectRow = Depends(project_from_body(ImageInpaintRequest)),
+) -> dict:
     repo = get_repo(request)
     queue = get_queue(request)
 
-    project = repo.get_project(payload.project_id)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"project_id '{payload.project_id}' was not found")
-
-    image_asset = repo.get_asset(payload.image_asset_id)
+    image_asset = await asyncio.to_thread(repo.get_asset, payload.image_asset_id)
     if image_asset is None:
         raise HTTPException(status_code=404, detail=f"image_asset_id '{payload.image_asset_id}' was not found")
 
-    mask_asset = repo.get_asset(payload.mask_asset_id)
+    mask_asset = await asyncio.to_thread(repo.get_asset, payload.mask_asset_id)
     if mask_asset is None:
         raise HTTPException(status_code=404, detail=f"mask_asset_id '{payload.mask_asset_id}' was not found")
 
-    job = repo.create_job(
+    job = await queue.submit(
         project_id=payload.project_id,
         job_type="image_inpaint",
         params=payload.model_dump(),
     )
-    await queue.enqueue(job["id"])
     return ok({"job_id": job["id"], "status": job["status"]})
@@ -1,31 +1,138 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
-from .common import get_repo, ok
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.schemas import JobStatusBulkRequest
+
+from .common import get_job_events, get_repo, json_body, json_body_openapi, ok
 
 router = APIRouter(prefix="/api/v1", tags=["jobs"])
 
+TERMINAL_STATUSES = frozenset({"done", "error", "cancelled"})
+EVENTS_KEEPALIVE_SEC = 15.0
+WAIT_MAX_TIMEOUT_SEC = 120.0
+
+
+def _sse(event: str, data: dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
 
 @router.get("/jobs/{job_id}")
-async def get_job(request: Request, job_id: str) -> dict:
+async def get_job(
+    request: Request,
+    job_id: str,
+    wait: Literal["terminal"] | None = None,
+    timeout: float = Query(30.0, ge=0, le=WAIT_MAX_TIMEOUT_SEC),
+) -> dict:
+    """Return the job and its assets.
+
+    With ``wait=terminal`` the request long-polls: it returns as soon as the job
+    reaches done/error/cancelled, or with the current row after ``timeout`` seconds.
+    """
+    repo = get_repo(request)
+    if wait is None:
+        job, assets = await asyncio.to_thread(repo.get_job_with_assets, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"job_id '{job_id}' was not found")
+        return ok({"job": job, "assets": assets})
+
+    bus = get_job_events(request)
+    updates = bus.subscribe(job_id)
+    try:
+        job, assets = await asyncio.to_thread(repo.get_job_with_assets, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"job_id '{job_id}' was not found")
+        if job["status"] in TERMINAL_STATUSES:
+            return ok({"job": job, "assets": assets})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        current = job
+        while current["status"] not in TERMINAL_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                current = await asyncio.wait_for(updates.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+    finally:
+        bus.unsubscribe(job_id, updates)
+    job, assets = await asyncio.to_thread(repo.get_job_with_assets, job_id)
+    return ok({"job": job, "assets": assets})
+
+
+@router.post(
+    "/jobs/status/bulk",
+    openapi_extra=json_body_openapi(JobStatusBulkRequest),
+)
+async def get_jobs_status_bulk(
+    request: Request,
+    payload: JobStatusBulkRequest = Depends(json_body(JobStatusBulkRequest)),
+) -> dict:
+    """Return the current rows of several jobs in one round-trip; assets are not included."""
     repo = get_repo(request)
-    job = repo.get_job(job_id)
+    jobs = await asyncio.to_thread(repo.get_jobs_by_ids, list(payload.job_ids))
+    found = {job["id"] for job in jobs}
+    missing = [job_id for job_id in dict.fromkeys(payload.job_ids) if job_id not in found]
+    return ok({"jobs": jobs, "missing": missing})
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(request: Request, job_id: str) -> StreamingResponse:
+    """Stream job updates as server-sent events instead of polling ``GET /jobs/{job_id}``.
+
+    The first ``job`` event is the current job plus its assets; later ones carry
+    the updated job only, until a terminal status re-sends the final assets.
+    """
+    repo = get_repo(request)
+    bus = get_job_events(request)
+    # Subscribe before the snapshot read so no update can slip in between.
+    updates = bus.subscribe(job_id)
+    job, assets = await asyncio.to_thread(repo.get_job_with_assets, job_id)
     if job is None:
+        bus.unsubscribe(job_id, updates)
         raise HTTPException(status_code=404, detail=f"job_id '{job_id}' was not found")
 
-    assets = repo.list_assets(job_id=job_id)
-    return ok({"job": job, "assets": assets})
+    async def stream() -> AsyncIterator[bytes]:
+        try:
+            yield _sse("job", {"job": job, "assets": assets})
+            current = job
+            while current["status"] not in TERMINAL_STATUSES:
+                try:
+                    current = await asyncio.wait_for(updates.get(), EVENTS_KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keepalive\n\n"
+                    continue
+                if current["status"] in TERMINAL_STATUSES:
+                    _, final_assets = await asyncio.to_thread(repo.get_job_with_assets, job_id)
+                    yield _sse("job", {"job": current, "assets": final_assets})
+                else:
+                    yield _sse("job", {"job": current})
+        finally:
+            bus.unsubscribe(job_id, updates)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/jobs/{job_id}/cancel")
 async def cancel_job(request: Request, job_id: str) -> dict:
     repo = get_repo(request)
-    job = repo.get_job(job_id)
+    job = await asyncio.to_thread(repo.get_job, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail=f"job_id '{job_id}' was not found")
-    if job["status"] in {"done", "error", "cancelled"}:
+    if job["status"] in TERMINAL_STATUSES:
         return ok({"job": job, "cancelled": False})
-    updated = repo.cancel_job(job_id)
+    updated = await asyncio.to_thread(repo.cancel_job, job_id)
     return ok({"job": updated, "cancelled": True})
-
@@ -1,13 +1,44 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+import hashlib
+import time
+import weakref
+from typing import Any
 
-from .common import ok
+import orjson
+from fastapi import APIRouter, Request, Response
+
+from app.services.model_manager import ModelManager
+
+from .common import etag_matches, ok
 
 router = APIRouter(prefix="/api/v1", tags=["system"])
 
+CAPABILITIES_TTL_SEC = 30.0
+
+# Capabilities only change when GPUs or model folders change, so probe at most
+# once per TTL per ModelManager and let clients revalidate with If-None-Match.
+_cap_cache: weakref.WeakKeyDictionary[ModelManager, tuple[float, str, dict[str, Any]]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _cached_capabilities(model_manager: ModelManager) -> tuple[str, dict[str, Any]]:
+    now = time.monotonic()
+    cached = _cap_cache.get(model_manager)
+    if cached is not None and now < cached[0]:
+        return cached[1], cached[2]
+    data = model_manager.system_capabilities()
+    etag = f'"{hashlib.blake2b(orjson.dumps(data), digest_size=8).hexdigest()}"'
+    _cap_cache[model_manager] = (now + CAPABILITIES_TTL_SEC, etag, data)
+    return etag, data
+
 
 @router.get("/system/capabilities")
-async def get_system_capabilities(request: Request) -> dict:
+async def get_system_capabilities(request: Request, response: Response):
     model_manager = request.app.state.model_manager
-    return ok(model_manager.system_capabilities())
+    etag, data = _cached_capabilities(model_manager)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return ok(data)
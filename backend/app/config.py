@@ -15,6 +15,9 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+DEFAULT_CORS_ORIGINS = ("http://127.0.0.1:5173", "http://localhost:5173")
+
+
 @dataclass(frozen=True)
 class Settings:
     model_path: Path
@@ -24,6 +27,7 @@ class Settings:
     exports_dir: Path
     max_concurrent_jobs: int
     default_language: str
+    upload_chunk_bytes: int = 1 << 20
 
 
 def get_settings() -> Settings:
@@ -42,10 +46,18 @@ def get_settings() -> Settings:
         exports_dir=Path(os.getenv("CLIPPER_EXPORTS_DIR", str(data_dir / "exports"))),
         max_concurrent_jobs=max(1, max_jobs),
         default_language=os.getenv("CLIPPER_DEFAULT_LANGUAGE", "en"),
+        upload_chunk_bytes=max(64 * 1024, _env_int("CLIPPER_UPLOAD_CHUNK", 1 << 20)),
     )
     return settings
 
 
+def get_cors_origins() -> list[str]:
+    raw = os.getenv("CLIPPER_CORS_ORIGINS")
+    if raw is None:
+        return list(DEFAULT_CORS_ORIGINS)
+    return [origin.strip() for origin in raw.split(",") if origin.strip()]
+
+
 def ensure_dirs(settings: Settings) -> None:
     settings.model_path.mkdir(parents=True, exist_ok=True)
     (settings.model_path / ".cache").mkdir(parents=True, exist_ok=True)
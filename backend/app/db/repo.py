@@ -1,41 +1,260 @@
 from __future__ import annotations
 
-import json
+import os
 import sqlite3
 import threading
+import time
 import uuid
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+import orjson
 
 from .models import AssetKind, AssetRow, JobRow, JobStatus, JobType, ProjectRow
 
 
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA busy_timeout=5000;
+"""
+
+_SQL_INSERT_PROJECT = """
+INSERT INTO projects (
+    id, name, brand_name, product, audience, offer, tone,
+    platform_targets_json, created_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_PROJECT = "SELECT * FROM projects WHERE id = ?"
+_SQL_LIST_PROJECTS = "SELECT * FROM projects ORDER BY created_at DESC"
+
+_SQL_INSERT_JOB = """
+INSERT INTO jobs (
+    id, project_id, type, status, progress_pct, stage,
+    params_json, result_json, error_text, created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_JOB = "SELECT * FROM jobs WHERE id = ?"
+_SQL_GET_JOB_WITH_ASSETS = """
+SELECT
+    j.*,
+    a.id AS asset_id,
+    a.project_id AS asset_project_id,
+    a.job_id AS asset_job_id,
+    a.kind AS asset_kind,
+    a.path AS asset_path,
+    a.meta_json AS asset_meta_json,
+    a.created_at AS asset_created_at
+FROM jobs AS j
+LEFT JOIN assets AS a ON a.job_id = j.id
+WHERE j.id = ?
+ORDER BY a.created_at DESC
+"""
+# The IN list must match idx_jobs_active's WHERE clause for SQLite to use it.
+_SQL_LIST_ACTIVE_JOBS = """
+SELECT * FROM jobs
+WHERE status IN ('queued', 'running')
+ORDER BY created_at, id
+LIMIT ?
+"""
+_SQL_LIST_ACTIVE_JOBS_AFTER = """
+SELECT * FROM jobs
+WHERE status IN ('queued', 'running') AND (created_at, id) > (?, ?)
+ORDER BY created_at, id
+LIMIT ?
+"""
+_SQL_GET_JOBS_BY_IDS = "SELECT * FROM jobs WHERE id IN ({placeholders})"
+_SQL_LIST_JOBS = "SELECT * FROM jobs ORDER BY created_at DESC"
+_SQL_LIST_JOBS_BY_PROJECT = "SELECT * FROM jobs WHERE project_id = ? ORDER BY created_at DESC"
+
+_SQL_INSERT_ASSET = """
+INSERT INTO assets (id, project_id, job_id, kind, path, meta_json, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_ASSET = "SELECT * FROM assets WHERE id = ?"
+_SQL_GET_ASSET_BY_HASH = """
+SELECT * FROM assets
+WHERE project_id = ? AND kind = ? AND json_extract(meta_json, '$.sha256') = ?
+ORDER BY created_at
+LIMIT 1
+"""
+_SQL_LIST_ASSETS_ALL = "SELECT * FROM assets ORDER BY created_at DESC"
+_SQL_LIST_ASSETS_P = "SELECT * FROM assets WHERE project_id = ? ORDER BY created_at DESC"
+_SQL_LIST_ASSETS_J = "SELECT * FROM assets WHERE job_id = ? ORDER BY created_at DESC"
+_SQL_LIST_ASSETS_PJ = (
+    "SELECT * FROM assets WHERE project_id = ? AND job_id = ? ORDER BY created_at DESC"
+)
+
+
+_ROW_CACHE_SIZE = 4096
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_ID_POOL_BATCH = 256
+
+_T = TypeVar("_T")
+
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+_loads = orjson.loads
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") so only the fractional part is formatted per call.
+_ts_cache: tuple[int, str] = (-1, "")
+
+
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    global _ts_cache
+    sec, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
+
+
+def _clone(value: Any) -> Any:
+    # Rows hold only JSON-decoded values, so this is a cheaper deepcopy.
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+class _RowCache(Generic[_T]):
+    """Small thread-safe LRU of rows keyed by id.
+
+    Rows are cloned going in and coming out, so a caller mutating ``meta`` or
+    ``params`` never reaches the cached copy.
+    """
+
+    def __init__(self, maxsize: int = _ROW_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, _T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _T | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+        return _clone(item)
+
+    def put(self, key: str, item: _T) -> None:
+        with self._lock:
+            self._store(key, item)
+
+    def put_if_newer(self, key: str, item: _T, version_field: str) -> None:
+        with self._lock:
+            current = self._items.get(key)
+            if current is None or current[version_field] <= item[version_field]:  # type: ignore[index]
+                self._store(key, item)
+
+    def add(self, key: str, item: _T) -> None:
+        """Populate from a read without clobbering a newer row written concurrently."""
+        with self._lock:
+            if key not in self._items:
+                self._store(key, item)
+
+    def _store(self, key: str, item: _T) -> None:
+        self._items[key] = _clone(item)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
 
 
 class Repository:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path | str):
+        # ``db_path`` may also be a ``file:`` URI, e.g. a shared-cache in-memory DB in tests.
         self.db_path = db_path
-        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._all_conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._projects: _RowCache[ProjectRow] = _RowCache()
+        self._jobs: _RowCache[JobRow] = _RowCache()
+        self._assets: _RowCache[AssetRow] = _RowCache()
+        self._id_pool: deque[str] = deque()
+        self._id_pool_lock = threading.Lock()
+        self._job_listeners: list[Callable[[JobRow], None]] = []
+
+    def add_job_listener(self, listener: Callable[[JobRow], None]) -> None:
+        """Call ``listener`` with the fresh row after every successful ``update_job``."""
+        self._job_listeners.append(listener)
+
+    def _next_id(self) -> str:
+        while True:
+            try:
+                return self._id_pool.popleft()
+            except IndexError:
+                pass
+            # One urandom read yields a batch of v4 UUIDs instead of a syscall per id.
+            with self._id_pool_lock:
+                if not self._id_pool:
+                    buf = os.urandom(16 * _ID_POOL_BATCH)
+                    self._id_pool.extend(
+                        str(uuid.UUID(bytes=buf[i : i + 16], version=4))
+                        for i in range(0, len(buf), 16)
+                    )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # One long-lived autocommit connection per thread keeps sqlite's
+            # statement cache warm and skips connect/close on every call.
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                uri=str(self.db_path).startswith("file:"),
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_PRAGMAS)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+        return conn
 
     @contextmanager
     def _conn(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        yield self._connection()
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
         try:
             yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._conns_lock:
+            conns, self._all_conns = self._all_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def init_db(self) -> None:
-        with self._lock, self._conn() as conn:
+        with self._conn() as conn:
             conn.executescript(
                 """
-                PRAGMA journal_mode=WAL;
                 CREATE TABLE IF NOT EXISTS projects (
                     id TEXT PRIMARY KEY,
                     name TEXT NOT NULL,
@@ -62,7 +281,11 @@ class Repository:
                     FOREIGN KEY(project_id) REFERENCES projects(id)
                 );
                 CREATE INDEX IF NOT EXISTS idx_jobs_project ON jobs(project_id);
-                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+                DROP INDEX IF EXISTS idx_jobs_status;
+                CREATE INDEX IF NOT EXISTS idx_jobs_active
+                    ON jobs(created_at) WHERE status IN ('queued', 'running');
+                CREATE INDEX IF NOT EXISTS idx_jobs_project_created
+                    ON jobs(project_id, created_at DESC);
                 CREATE TABLE IF NOT EXISTS assets (
                     id TEXT PRIMARY KEY,
                     project_id TEXT NOT NULL,
@@ -76,6 +299,12 @@ class Repository:
                 );
                 CREATE INDEX IF NOT EXISTS idx_assets_project ON assets(project_id);
                 CREATE INDEX IF NOT EXISTS idx_assets_job ON assets(job_id);
+                CREATE INDEX IF NOT EXISTS idx_assets_project_created
+                    ON assets(project_id, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_assets_job_created
+                    ON assets(job_id, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_assets_sha256
+                    ON assets(project_id, kind, json_extract(meta_json, '$.sha256'));
                 """
             )
 
@@ -91,7 +320,7 @@ class Repository:
         platform_targets: list[str],
     ) -> ProjectRow:
         row = {
-            "id": str(uuid.uuid4()),
+            "id": self._next_id(),
             "name": name,
             "brand_name": brand_name,
             "product": product,
@@ -101,14 +330,9 @@ class Repository:
             "platform_targets": platform_targets,
             "created_at": _now_iso(),
         }
-        with self._lock, self._conn() as conn:
+        with self._tx() as conn:
             conn.execute(
-                """
-                INSERT INTO projects (
-                    id, name, brand_name, product, audience, offer, tone,
-                    platform_targets_json, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_PROJECT,
                 (
                     row["id"],
                     row["name"],
@@ -117,32 +341,50 @@ class Repository:
                     row["audience"],
                     row["offer"],
                     row["tone"],
-                    json.dumps(row["platform_targets"]),
+                    _dumps(row["platform_targets"]),
                     row["created_at"],
                 ),
             )
+        self._projects.put(row["id"], row)
         return row
 
     def get_project(self, project_id: str) -> ProjectRow | None:
+        cached = self._projects.get(project_id)
+        if cached is not None:
+            return cached
         with self._conn() as conn:
-            row = conn.execute(
-                "SELECT * FROM projects WHERE id = ?",
-                (project_id,),
-            ).fetchone()
+            row = conn.execute(_SQL_GET_PROJECT, (project_id,)).fetchone()
         if row is None:
             return None
-        return self._to_project(row)
+        project = self._to_project(row)
+        self._projects.add(project_id, project)
+        return project
 
     def list_projects(self) -> list[ProjectRow]:
         with self._conn() as conn:
-            rows = conn.execute(
-                "SELECT * FROM projects ORDER BY created_at DESC"
-            ).fetchall()
+            rows = conn.execute(_SQL_LIST_PROJECTS).fetchall()
         return [self._to_project(row) for row in rows]
 
     def create_job(self, *, project_id: str, job_type: JobType, params: dict) -> JobRow:
-        row: JobRow = {
-            "id": str(uuid.uuid4()),
+        row = self.new_job_row(project_id=project_id, job_type=job_type, params=params)
+        with self._tx() as conn:
+            self._insert_job_rows(conn, [row])
+        self._jobs.put(row["id"], row)
+        return row
+
+    def create_jobs_bulk(self, rows: list[JobRow]) -> list[JobRow]:
+        if not rows:
+            return rows
+        with self._tx() as conn:
+            self._insert_job_rows(conn, rows)
+        for row in rows:
+            self._jobs.put(row["id"], row)
+        return rows
+
+    def new_job_row(self, *, project_id: str, job_type: JobType, params: dict) -> JobRow:
+        now = _now_iso()
+        return {
+            "id": self._next_id(),
             "project_id": project_id,
             "type": job_type,
             "status": "queued",
@@ -151,17 +393,15 @@ class Repository:
             "params": params,
             "result": None,
             "error_text": None,
-            "created_at": _now_iso(),
-            "updated_at": _now_iso(),
+            "created_at": now,
+            "updated_at": now,
         }
-        with self._lock, self._conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO jobs (
-                    id, project_id, type, status, progress_pct, stage,
-                    params_json, result_json, error_text, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+
+    @staticmethod
+    def _insert_job_rows(conn: sqlite3.Connection, rows: list[JobRow]) -> None:
+        conn.executemany(
+            _SQL_INSERT_JOB,
+            [
                 (
                     row["id"],
                     row["project_id"],
@@ -169,33 +409,85 @@ class Repository:
                     row["status"],
                     row["progress_pct"],
                     row["stage"],
-                    json.dumps(row["params"]),
+                    _dumps(row["params"]),
                     None,
                     row["error_text"],
                     row["created_at"],
                     row["updated_at"],
-                ),
-            )
-        return row
+                )
+                for row in rows
+            ],
+        )
 
     def get_job(self, job_id: str) -> JobRow | None:
+        cached = self._jobs.get(job_id)
+        if cached is not None:
+            return cached
         with self._conn() as conn:
-            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            row = conn.execute(_SQL_GET_JOB, (job_id,)).fetchone()
         if row is None:
             return None
-        return self._to_job(row)
+        job = self._to_job(row)
+        self._jobs.add(job_id, job)
+        return job
+
+    def get_job_with_assets(self, job_id: str) -> tuple[JobRow | None, list[AssetRow]]:
+        with self._conn() as conn:
+            rows = conn.execute(_SQL_GET_JOB_WITH_ASSETS, (job_id,)).fetchall()
+        if not rows:
+            return None, []
+        job = self._to_job(rows[0])
+        self._jobs.add(job_id, job)
+        assets: list[AssetRow] = [
+            {
+                "id": row["asset_id"],
+                "project_id": row["asset_project_id"],
+                "job_id": row["asset_job_id"],
+                "kind": row["asset_kind"],
+                "path": row["asset_path"],
+                "meta": _loads(row["asset_meta_json"]),
+                "created_at": row["asset_created_at"],
+            }
+            for row in rows
+            if row["asset_id"] is not None
+        ]
+        return job, assets
+
+    def get_jobs_by_ids(self, job_ids: list[str]) -> list[JobRow]:
+        """Fetch several jobs in one query, in request order; unknown ids are skipped."""
+        unique = list(dict.fromkeys(job_ids))
+        if not unique:
+            return []
+        sql = _SQL_GET_JOBS_BY_IDS.format(placeholders=", ".join("?" * len(unique)))
+        with self._conn() as conn:
+            rows = conn.execute(sql, unique).fetchall()
+        found: dict[str, JobRow] = {}
+        for row in rows:
+            job = self._to_job(row)
+            self._jobs.add(job["id"], job)
+            found[job["id"]] = job
+        return [found[job_id] for job_id in unique if job_id in found]
 
     def list_jobs(self, project_id: str | None = None) -> list[JobRow]:
         with self._conn() as conn:
             if project_id:
-                rows = conn.execute(
-                    "SELECT * FROM jobs WHERE project_id = ? ORDER BY created_at DESC",
-                    (project_id,),
-                ).fetchall()
+                rows = conn.execute(_SQL_LIST_JOBS_BY_PROJECT, (project_id,)).fetchall()
+            else:
+                rows = conn.execute(_SQL_LIST_JOBS).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def list_active_jobs(
+        self, limit: int = 100, after: tuple[str, str] | None = None
+    ) -> list[JobRow]:
+        """Queued and running jobs, oldest first.
+
+        Pass the last row's ``(created_at, id)`` as ``after`` to fetch the next page.
+        """
+        with self._conn() as conn:
+            if after is None:
+                rows = conn.execute(_SQL_LIST_ACTIVE_JOBS, (limit,)).fetchall()
             else:
-                rows = conn.execute(
-                    "SELECT * FROM jobs ORDER BY created_at DESC"
-                ).fetchall()
+                rows = conn.execute(_SQL_LIST_ACTIVE_JOBS_AFTER, (*after, limit)).fetchall()
         return [self._to_job(row) for row in rows]
 
     def update_job(
@@ -208,14 +500,7 @@ class Repository:
         result: dict | None = None,
         error_text: str | None = None,
     ) -> JobRow | None:
-        with self._lock, self._conn() as conn:
-            current = conn.execute(
-                "SELECT * FROM jobs WHERE id = ?",
-                (job_id,),
-            ).fetchone()
-            if current is None:
-                return None
-
+        with self._tx() as conn:
             updates: list[str] = []
             values: list[Any] = []
             if status is not None:
@@ -229,7 +514,7 @@ class Repository:
                 values.append(stage)
             if result is not None:
                 updates.append("result_json = ?")
-                values.append(json.dumps(result))
+                values.append(_dumps(result))
             if error_text is not None:
                 updates.append("error_text = ?")
                 values.append(error_text)
@@ -238,15 +523,23 @@ class Repository:
             values.append(_now_iso())
             values.append(job_id)
 
-            conn.execute(
-                f"UPDATE jobs SET {', '.join(updates)} WHERE id = ?",
-                tuple(values),
-            )
-            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            sql = f"UPDATE jobs SET {', '.join(updates)} WHERE id = ?"
+            if _HAS_RETURNING:
+                rows = conn.execute(f"{sql} RETURNING *", tuple(values)).fetchall()
+                row = rows[0] if rows else None
+            else:
+                conn.execute(sql, tuple(values))
+                row = conn.execute(_SQL_GET_JOB, (job_id,)).fetchone()
 
         if row is None:
             return None
-        return self._to_job(row)
+        job = self._to_job(row)
+        # updated_at is stamped inside the write transaction, so it orders
+        # concurrent writers even when their cache puts land out of order.
+        self._jobs.put_if_newer(job_id, job, "updated_at")
+        for listener in self._job_listeners:
+            listener(job)
+        return job
 
     def cancel_job(self, job_id: str) -> JobRow | None:
         return self.update_job(job_id, status="cancelled", stage="cancelled")
@@ -260,8 +553,32 @@ class Repository:
         path: str,
         meta: dict,
     ) -> AssetRow:
-        row: AssetRow = {
-            "id": str(uuid.uuid4()),
+        row = self.new_asset_row(project_id=project_id, job_id=job_id, kind=kind, path=path, meta=meta)
+        with self._tx() as conn:
+            self._insert_asset_rows(conn, [row])
+        self._assets.put(row["id"], row)
+        return row
+
+    def create_assets_bulk(self, rows: list[AssetRow]) -> list[AssetRow]:
+        if not rows:
+            return rows
+        with self._tx() as conn:
+            self._insert_asset_rows(conn, rows)
+        for row in rows:
+            self._assets.put(row["id"], row)
+        return rows
+
+    def new_asset_row(
+        self,
+        *,
+        project_id: str,
+        job_id: str | None,
+        kind: AssetKind,
+        path: str,
+        meta: dict,
+    ) -> AssetRow:
+        return {
+            "id": self._next_id(),
             "project_id": project_id,
             "job_id": job_id,
             "kind": kind,
@@ -269,30 +586,40 @@ class Repository:
             "meta": meta,
             "created_at": _now_iso(),
         }
-        with self._lock, self._conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO assets (id, project_id, job_id, kind, path, meta_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+
+    @staticmethod
+    def _insert_asset_rows(conn: sqlite3.Connection, rows: list[AssetRow]) -> None:
+        conn.executemany(
+            _SQL_INSERT_ASSET,
+            [
                 (
                     row["id"],
                     row["project_id"],
                     row["job_id"],
                     row["kind"],
                     row["path"],
-                    json.dumps(row["meta"]),
+                    _dumps(row["meta"]),
                     row["created_at"],
-                ),
-            )
-        return row
+                )
+                for row in rows
+            ],
+        )
 
     def get_asset(self, asset_id: str) -> AssetRow | None:
+        cached = self._assets.get(asset_id)
+        if cached is not None:
+            return cached
         with self._conn() as conn:
-            row = conn.execute(
-                "SELECT * FROM assets WHERE id = ?",
-                (asset_id,),
-            ).fetchone()
+            row = conn.execute(_SQL_GET_ASSET, (asset_id,)).fetchone()
+        if row is None:
+            return None
+        asset = self._to_asset(row)
+        self._assets.add(asset_id, asset)
+        return asset
+
+    def get_asset_by_hash(self, *, project_id: str, kind: str, sha256: str) -> AssetRow | None:
+        with self._conn() as conn:
+            row = conn.execute(_SQL_GET_ASSET_BY_HASH, (project_id, kind, sha256)).fetchone()
         if row is None:
             return None
         return self._to_asset(row)
@@ -300,21 +627,17 @@ class Repository:
     def list_assets(
         self, *, project_id: str | None = None, job_id: str | None = None
     ) -> list[AssetRow]:
-        query = "SELECT * FROM assets"
-        values: list[Any] = []
-        clauses: list[str] = []
-        if project_id:
-            clauses.append("project_id = ?")
-            values.append(project_id)
-        if job_id:
-            clauses.append("job_id = ?")
-            values.append(job_id)
-        if clauses:
-            query += f" WHERE {' AND '.join(clauses)}"
-        query += " ORDER BY created_at DESC"
+        if project_id and job_id:
+            query, values = _SQL_LIST_ASSETS_PJ, (project_id, job_id)
+        elif project_id:
+            query, values = _SQL_LIST_ASSETS_P, (project_id,)
+        elif job_id:
+            query, values = _SQL_LIST_ASSETS_J, (job_id,)
+        else:
+            query, values = _SQL_LIST_ASSETS_ALL, ()
 
         with self._conn() as conn:
-            rows = conn.execute(query, tuple(values)).fetchall()
+            rows = conn.execute(query, values).fetchall()
         return [self._to_asset(row) for row in rows]
 
     @staticmethod
@@ -327,7 +650,7 @@ class Repository:
             "audience": row["audience"],
             "offer": row["offer"],
             "tone": row["tone"],
-            "platform_targets": json.loads(row["platform_targets_json"]),
+            "platform_targets": _loads(row["platform_targets_json"]),
             "created_at": row["created_at"],
         }
 
@@ -341,8 +664,8 @@ class Repository:
             "status": row["status"],
             "progress_pct": row["progress_pct"],
             "stage": row["stage"],
-            "params": json.loads(row["params_json"]),
-            "result": json.loads(result_json) if result_json else None,
+            "params": _loads(row["params_json"]),
+            "result": _loads(result_json) if result_json else None,
             "error_text": row["error_text"],
             "created_at": row["created_at"],
             "updated_at": row["updated_at"],
@@ -356,7 +679,7 @@ class Repository:
             "job_id": row["job_id"],
             "kind": row["kind"],
             "path": row["path"],
-            "meta": json.loads(row["meta_json"]),
+            "meta": _loads(row["meta_json"]),
             "created_at": row["created_at"],
         }
 
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.types import Receive, Scope, Send
 
 from app.api import (
     assets_router,
@@ -17,20 +23,34 @@ from app.api import (
     system_router,
     videos_router,
 )
-from app.config import ensure_dirs, get_settings
+from app.config import ensure_dirs, get_cors_origins, get_settings
 from app.db.repo import Repository
+from app.services.job_events import JobEventBus
 from app.services.job_queue import JobQueue
 from app.services.model_manager import ModelManager
 from app.services.orchestrator import GenerationOrchestrator
 
+# Worker threads beyond the job slots: two startup warmups plus SQLite and file I/O.
+EXTRA_EXECUTOR_WORKERS = 6
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     settings = get_settings()
     ensure_dirs(settings)
+    # asyncio.to_thread defaults to cpu_count()+4 threads; generation is GIL- and
+    # GPU-bound, so size the pool to the job slots that can actually run at once.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=settings.max_concurrent_jobs + EXTRA_EXECUTOR_WORKERS,
+            thread_name_prefix="clipper-worker",
+        )
+    )
 
     repo = Repository(settings.db_path)
     repo.init_db()
+    job_events = JobEventBus()
+    repo.add_job_listener(job_events.publish)
 
     model_manager = ModelManager(settings)
     orchestrator = GenerationOrchestrator(repo, settings, model_manager)
@@ -39,25 +59,62 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     for job_type, handler in orchestrator.handlers().items():
         queue.register_handler(job_type, handler)
     await queue.start()
+    # Load the copy LLM and inpaint pipeline in the background so startup isn't
+    # blocked on the GGUF mmap or sharded safetensors reads.
+    copy_warmup = asyncio.create_task(asyncio.to_thread(orchestrator.copy_gen.warmup))
+    inpaint_warmup = asyncio.create_task(asyncio.to_thread(orchestrator.inpaint.warmup))
 
     app.state.settings = settings
     app.state.repo = repo
     app.state.model_manager = model_manager
     app.state.job_queue = queue
+    app.state.job_events = job_events
 
     try:
         yield
     finally:
+        copy_warmup.cancel()
         await queue.stop()
+        # Cancelling can't stop a load already in its thread, so let it land
+        # before evicting rather than leave a pipeline resident after shutdown.
+        await asyncio.gather(inpaint_warmup, return_exceptions=True)
+        orchestrator.models.evict_all()
+        orchestrator.t2v.clear_video_pipeline_cache()
+        repo.close()
+
+
+_ASSET_FILE_PATH = re.compile(r"^/api/v1/assets/[^/]+$")
+
 
+class ApiGZipMiddleware(GZipMiddleware):
+    """Gzip JSON API responses but leave asset downloads alone.
 
-app = FastAPI(title="Clipper Local AI Ad Generator", version="0.1.0", lifespan=lifespan)
+    Assets are already-compressed media served via zero-copy sends, which the
+    stock middleware would either waste CPU on or not know how to forward.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] in {"GET", "HEAD"}:
+            if _ASSET_FILE_PATH.match(scope["path"]):
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+app = FastAPI(
+    title="Clipper Local AI Ad Generator",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
+app.add_middleware(ApiGZipMiddleware, minimum_size=1024)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
+    allow_origins=get_cors_origins(),
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=600,
 )
 
 app.include_router(projects_router)
@@ -89,12 +146,12 @@ async def http_exception_handler(_request, exc: HTTPException):
                 "details": {"status_code": exc.status_code},
             },
         }
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    return ORJSONResponse(status_code=exc.status_code, content=payload)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "ok": False,
@@ -102,7 +159,7 @@ async def validation_exception_handler(_request, exc: RequestValidationError):
             "error": {
                 "code": "validation_error",
                 "message": "Request validation failed.",
-                "details": {"errors": exc.errors()},
+                "details": {"errors": jsonable_encoder(exc.errors())},
             },
         },
     )
@@ -110,7 +167,7 @@ async def validation_exception_handler(_request, exc: RequestValidationError):
 
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_request, exc: Exception):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "ok": False,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 RenderMode = Literal["draft", "hq"]
 PlatformTarget = Literal["9:16", "4:5", "1:1"]
@@ -21,7 +21,13 @@ class ApiEnvelope(BaseModel):
     error: ApiError | None = None
 
 
-class ProjectCreateRequest(BaseModel):
+class RequestModel(BaseModel):
+    # Request bodies are never mutated after validation; frozen skips the
+    # validate-on-assignment plumbing and extra="forbid" rejects typos early.
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class ProjectCreateRequest(RequestModel):
     name: str = Field(min_length=2, max_length=120)
     brand_name: str = Field(min_length=1, max_length=120)
     product: str = Field(min_length=1, max_length=200)
@@ -31,7 +37,7 @@ class ProjectCreateRequest(BaseModel):
     platform_targets: list[PlatformTarget] = Field(default_factory=lambda: ["9:16"])
 
 
-class CopyGenerateRequest(BaseModel):
+class CopyGenerateRequest(RequestModel):
     project_id: str
     goal: str = Field(min_length=2, max_length=160)
     cta: str = Field(min_length=1, max_length=80)
@@ -39,7 +45,7 @@ class CopyGenerateRequest(BaseModel):
     mode: RenderMode = "draft"
 
 
-class ImageGenerateRequest(BaseModel):
+class ImageGenerateRequest(RequestModel):
     project_id: str
     prompt: str = Field(min_length=2, max_length=400)
     negative_prompt: str = Field(default="", max_length=400)
@@ -48,14 +54,14 @@ class ImageGenerateRequest(BaseModel):
     seed: int | None = None
 
 
-class ImagePromptImproveRequest(BaseModel):
+class ImagePromptImproveRequest(RequestModel):
     project_id: str
     prompt: str = Field(default="", max_length=400)
     platform: PlatformTarget = "9:16"
     mode: RenderMode = "draft"
 
 
-class ImageInpaintRequest(BaseModel):
+class ImageInpaintRequest(RequestModel):
     project_id: str
     image_asset_id: str
     mask_asset_id: str
@@ -64,7 +70,7 @@ class ImageInpaintRequest(BaseModel):
     strength: float = Field(default=0.6, ge=0.05, le=1.0)
 
 
-class VideoStoryboardRequest(BaseModel):
+class VideoStoryboardRequest(RequestModel):
     project_id: str
     duration_sec: int = Field(default=15, ge=5, le=60)
     platform: PlatformTarget = "9:16"
@@ -74,12 +80,21 @@ class VideoStoryboardRequest(BaseModel):
     mode: RenderMode = "draft"
 
 
-class VideoT2VRequest(BaseModel):
+class VideoT2VRequest(RequestModel):
     project_id: str
     prompt: str = Field(min_length=2, max_length=400)
     duration_sec: int = Field(default=8, ge=4, le=20)
     platform: PlatformTarget = "9:16"
     mode: RenderMode = "draft"
+    # Step-skipping budget for the video denoiser; 0 runs every step.
+    cache_threshold: float | None = Field(default=None, ge=0.0, le=1.0)
+    # Frames are streamed straight to the encoder unless they're asked for.
+    keep_frames: bool = False
+
+
+class JobStatusBulkRequest(RequestModel):
+    # Bounded so the IN (...) list stays well under SQLite's variable limit.
+    job_ids: list[str] = Field(min_length=1, max_length=200)
 
 
 class AssetUploadResponse(BaseModel):
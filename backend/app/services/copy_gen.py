@@ -1,38 +1,37 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import random
-from dataclasses import dataclass
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+LLAMA_N_CTX = 2048
+LLAMA_MAX_THREADS = 16
+# Fastest acceptable quantizations first when several GGUF files are present.
+GGUF_QUANT_PRIORITY = ("q4_k_m", "q5_k_m", "q4_0", "q8_0")
 
-@dataclass
-class CopyVariant:
-    hook: str
-    headline: str
-    primary_text: str
-    cta: str
-
-    def to_dict(self) -> dict[str, str]:
-        return {
-            "hook": self.hook,
-            "headline": self.headline,
-            "primary_text": self.primary_text,
-            "cta": self.cta,
-        }
+# One resident Llama per (model file, context size) for the whole process, so
+# every CopyGenerator (and every request) reuses the mmap'd weights and KV cache.
+_llama_cache: dict[tuple[str, int], Any] = {}
+_llama_lock = threading.Lock()
 
 
 class CopyGenerator:
+    _OPENERS = (
+        "Stop scrolling",
+        "This is your sign",
+        "Built for people who hate wasting time",
+        "Small change, big result",
+        "If you're serious about results",
+    )
+
     def __init__(self, model_root: Path | None = None) -> None:
-        self._openers = [
-            "Stop scrolling",
-            "This is your sign",
-            "Built for people who hate wasting time",
-            "Small change, big result",
-            "If you're serious about results",
-        ]
         self.model_root = model_root
         self._llama = None
+        self._gguf_model: tuple[int, Path | None] | None = None
 
     def generate(
         self,
@@ -53,43 +52,67 @@ class CopyGenerator:
             if llama_result:
                 return llama_result
 
-        seed = hash(
-            (
-                project["id"],
-                project["brand_name"],
-                project["product"],
-                goal,
-                cta,
-                count,
-                mode,
-            )
+        variants = self._template_variants(
+            project["id"],
+            project["brand_name"],
+            project["product"],
+            project["audience"],
+            project["offer"],
+            project["tone"],
+            goal,
+            cta,
+            count,
+            mode,
+        )
+        return [dict(variant) for variant in variants]
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _template_variants(
+        project_id: str,
+        brand_name: str,
+        product: str,
+        audience: str,
+        offer: str,
+        tone: str,
+        goal: str,
+        cta: str,
+        count: int,
+        mode: str,
+    ) -> tuple[dict[str, str], ...]:
+        # A pure function of its inputs, so repeat requests are served from the
+        # LRU; callers get copies so the cached dicts are never mutated.
+        # blake2b instead of hash(): str hashing is salted per process, so the
+        # same request would otherwise yield different copy on every worker.
+        seed_key = "\x1f".join((project_id, brand_name, product, goal, cta, str(count), mode))
+        seed = int.from_bytes(
+            hashlib.blake2b(seed_key.encode("utf-8"), digest_size=8).digest(), "little"
         )
         rng = random.Random(seed)
-        variants: list[CopyVariant] = []
+        openers = [rng.choice(CopyGenerator._OPENERS) for _ in range(count)]
+
+        # Everything except the opener and urgency is loop-invariant.
+        headline = f"{product} for {audience}"
+        if mode == "hq":
+            headline = f"{headline} | {brand_name} {goal}"
+        pitch = (
+            f"{brand_name} helps {audience} "
+            f"unlock {goal} with a {tone} approach. "
+            f"Use {offer} and start"
+        )
 
-        for idx in range(count):
-            opener = rng.choice(self._openers)
+        variants: list[dict[str, str]] = []
+        for idx, opener in enumerate(openers):
             urgency = "today" if idx % 2 == 0 else "this week"
-            tone = project["tone"]
-            headline = f"{project['product']} for {project['audience']}"
-            if mode == "hq":
-                headline = f"{headline} | {project['brand_name']} {goal}"
-
-            primary = (
-                f"{opener}: {project['brand_name']} helps {project['audience']} "
-                f"unlock {goal} with a {tone} approach. "
-                f"Use {project['offer']} and start {urgency}."
-            )
             variants.append(
-                CopyVariant(
-                    hook=f"{opener}. {goal}.",
-                    headline=headline,
-                    primary_text=primary,
-                    cta=cta,
-                )
+                {
+                    "hook": f"{opener}. {goal}.",
+                    "headline": headline,
+                    "primary_text": f"{opener}: {pitch} {urgency}.",
+                    "cta": cta,
+                }
             )
-
-        return [variant.to_dict() for variant in variants]
+        return tuple(variants)
 
     def _try_generate_with_llama(
         self, *, project: dict[str, Any], goal: str, cta: str, count: int
@@ -146,25 +169,61 @@ class CopyGenerator:
         if self.model_root is None:
             return None
         text_dir = self.model_root / "text"
-        if not text_dir.exists():
+        try:
+            mtime_ns = text_dir.stat().st_mtime_ns
+        except OSError:
             return None
-        models = sorted(text_dir.glob("*.gguf"))
-        return models[0] if models else None
+        # Adding or removing a .gguf bumps the directory mtime, so one stat suffices.
+        cached = self._gguf_model
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        models = sorted(text_dir.glob("*.gguf"), key=self._gguf_rank)
+        found = models[0] if models else None
+        self._gguf_model = (mtime_ns, found)
+        return found
+
+    @staticmethod
+    def _gguf_rank(path: Path) -> tuple[int, str]:
+        name = path.name.lower()
+        for rank, quant in enumerate(GGUF_QUANT_PRIORITY):
+            if quant in name:
+                return rank, name
+        return len(GGUF_QUANT_PRIORITY), name
+
+    def warmup(self) -> bool:
+        """Load the GGUF model ahead of the first hq request; True if one is resident."""
+        model_path = self._discover_gguf_model()
+        if model_path is None:
+            return False
+        return self._get_llama(model_path) is not None
 
     def _get_llama(self, model_path: Path):
         if self._llama is not None:
             return self._llama
-        try:
-            from llama_cpp import Llama  # type: ignore
-        except Exception:  # noqa: BLE001
-            return None
-        try:
-            self._llama = Llama(
-                model_path=str(model_path),
-                n_ctx=2048,
-                n_threads=4,
-                verbose=False,
-            )
-        except Exception:  # noqa: BLE001
-            return None
-        return self._llama
+        key = (str(model_path), LLAMA_N_CTX)
+        with _llama_lock:
+            llama = _llama_cache.get(key)
+            if llama is None:
+                try:
+                    from llama_cpp import Llama  # type: ignore
+                except Exception:  # noqa: BLE001
+                    return None
+                try:
+                    n_threads = min(LLAMA_MAX_THREADS, os.cpu_count() or 4)
+                    llama = Llama(
+                        model_path=str(model_path),
+                        n_ctx=LLAMA_N_CTX,
+                        n_threads=n_threads,
+                        n_threads_batch=n_threads,
+                        n_batch=2048,
+                        n_ubatch=512,
+                        flash_attn=True,
+                        use_mmap=True,
+                        use_mlock=False,
+                        verbose=False,
+                    )
+                except Exception:  # noqa: BLE001
+                    return None
+                _llama_cache[key] = llama
+        self._llama = llama
+        return llama
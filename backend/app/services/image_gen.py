@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import hashlib
-import random
+import importlib.util
+import os
+import shutil
 import textwrap
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import numpy as np
+import orjson
 from PIL import Image, ImageDraw, ImageFont
 
-from .model_manager import ModelManager
+from .model_manager import ModelIndexCache, ModelManager
+from .model_registry import ModelRegistry
 
 IMAGE_MODEL_DIRS: dict[str, tuple[str, str]] = {
     "image_fast_sdxl_turbo": ("image", "sdxl-turbo"),
@@ -18,6 +31,7 @@ IMAGE_MODEL_DIRS: dict[str, tuple[str, str]] = {
 
 DRAFT_MODEL_ORDER = ["image_fast_sdxl_turbo", "legacy_sd_turbo", "image_hq_sdxl_base"]
 HQ_MODEL_ORDER = ["image_hq_sdxl_base", "image_fast_sdxl_turbo", "legacy_sd_turbo"]
+SDXL_MODEL_KEYS = frozenset({"image_fast_sdxl_turbo", "image_hq_sdxl_base"})
 
 RESOLUTION_BUCKETS: dict[str, dict[str, tuple[int, int]]] = {
     "draft": {
@@ -31,12 +45,123 @@ RESOLUTION_BUCKETS: dict[str, dict[str, tuple[int, int]]] = {
         "1:1": (1024, 1024),
     },
 }
+# Flattened once so the per-request lookup is a single frozen-dict hit.
+_BUCKETS: Mapping[tuple[str, str], tuple[int, int]] = MappingProxyType(
+    {
+        (mode, platform): size
+        for mode, sizes in RESOLUTION_BUCKETS.items()
+        for platform, size in sizes.items()
+    }
+)
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    scheduler: str
+    steps: int
+    guidance_scale: float
+
+
+# Resolved once per model key instead of re-deriving on every generate().
+DEFAULT_PROFILE = GenerationProfile(scheduler="default", steps=20, guidance_scale=5.5)
+MODEL_PROFILES: dict[str, GenerationProfile] = {
+    "image_hq_sdxl_base": GenerationProfile(scheduler="dpmpp_2m_karras", steps=30, guidance_scale=6.5),
+    "image_fast_sdxl_turbo": GenerationProfile(scheduler="default", steps=4, guidance_scale=0.0),
+    "legacy_sd_turbo": GenerationProfile(scheduler="default", steps=4, guidance_scale=0.0),
+}
+
+# textwrap.fill builds a fresh TextWrapper per call; the overlay reuses one,
+# and the embedded default font is parsed once rather than per image.
+_OVERLAY_WRAPPER = textwrap.TextWrapper(width=40)
+_OVERLAY_FONT = ImageFont.load_default()
+
+RESULT_CACHE_SIZE = 256
+BATCH_WINDOW_SEC = 0.05
+MAX_BATCH_SIZE = 4
+
+
+@dataclass
+class _BatchSlot:
+    prompt: str
+    negative_prompt: str
+    seed: int
+    done: threading.Event = field(default_factory=threading.Event)
+    image: Any = None
+    error: BaseException | None = None
+
+
+class _DiffusersBatcher:
+    """Coalesce concurrent same-shape generations into one list-input pipeline call.
+
+    The first caller for a key leads: it waits one window for followers, then
+    runs the whole batch while followers block on their slot.
+    """
+
+    def __init__(self, window_sec: float = BATCH_WINDOW_SEC, max_batch: int = MAX_BATCH_SIZE):
+        self.window_sec = window_sec
+        self.max_batch = max(1, max_batch)
+        self._lock = threading.Lock()
+        self._open: dict[Hashable, list[_BatchSlot]] = {}
+
+    def run(
+        self,
+        key: Hashable,
+        slot: _BatchSlot,
+        execute: Callable[[list[_BatchSlot]], list[Any]],
+    ) -> Any:
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = [slot]
+                self._open[key] = batch
+            else:
+                batch.append(slot)
+            if len(batch) >= self.max_batch:
+                del self._open[key]
+
+        if not leader:
+            slot.done.wait()
+        else:
+            time.sleep(self.window_sec)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            try:
+                for member, image in zip(batch, execute(batch)):
+                    member.image = image
+            except BaseException as exc:  # noqa: BLE001
+                for member in batch:
+                    member.error = exc
+            finally:
+                for member in batch:
+                    member.done.set()
+
+        if slot.error is not None:
+            raise slot.error
+        return slot.image
 
 
 class ImageGenerator:
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: ModelManager, registry: ModelRegistry | None = None):
         self.model_manager = model_manager
-        self._pipelines: dict[str, tuple[Any, str]] = {}
+        self.registry = registry if registry is not None else ModelRegistry()
+        self._offload_modes: dict[str, str] = {}
+        self._quantization: dict[str, str] = {}
+        self._backends: dict[str, str] = {}
+        self._model_dirs = ModelIndexCache()
+        # DeepCache helpers must outlive the call that enabled them.
+        self._deepcache: dict[str, Any] = {}
+        self._deepcache_installed: bool | None = None
+        self._worker_state = threading.local()
+        self._results: OrderedDict[str, tuple[Path, dict]] = OrderedDict()
+        self._results_lock = threading.Lock()
+        # Content-addressed copies of finished renders, so identical scenes and
+        # re-runs skip diffusion across jobs and restarts.
+        self._result_dir = model_manager.settings.data_dir / "image_cache"
+        # Only worth a batching window when several jobs can generate at once.
+        max_batch = min(MAX_BATCH_SIZE, model_manager.settings.max_concurrent_jobs)
+        self._batcher = _DiffusersBatcher(max_batch=max_batch) if max_batch > 1 else None
 
     @staticmethod
     def candidate_model_keys(mode: str) -> list[str]:
@@ -44,19 +169,25 @@ class ImageGenerator:
 
     @staticmethod
     def bucket_dimensions(mode: str, platform: str) -> tuple[int, int]:
-        bucket = RESOLUTION_BUCKETS["hq" if mode == "hq" else "draft"]
-        return bucket.get(platform, bucket["9:16"])
+        size = _BUCKETS.get((mode, platform))
+        if size is None:
+            # Unknown modes render as draft, unknown platforms as 9:16.
+            bucket = RESOLUTION_BUCKETS["hq" if mode == "hq" else "draft"]
+            size = bucket.get(platform, bucket["9:16"])
+        return size
 
     @staticmethod
-    def attempt_plan(width: int, height: int, steps: int) -> list[tuple[int, int, int]]:
+    @lru_cache(maxsize=16)
+    def attempt_plan(width: int, height: int, steps: int) -> tuple[tuple[int, int, int], ...]:
+        # Buckets and step counts are enumerated, so this saturates after a few calls.
         lower_width = ImageGenerator._round_to_64(max(512, int(width * 0.8)))
         lower_height = ImageGenerator._round_to_64(max(512, int(height * 0.8)))
         reduced_steps = max(1, int(steps * 0.7))
-        return [
+        return (
             (width, height, steps),
             (lower_width, lower_height, steps),
             (lower_width, lower_height, reduced_steps),
-        ]
+        )
 
     def generate(
         self,
@@ -70,98 +201,307 @@ class ImageGenerator:
     ) -> dict:
         requested_width, requested_height = self.model_manager.platform_size(platform)
         resolved_seed = seed if seed is not None else self._seed_from_prompt(prompt)
-        rng = random.Random(resolved_seed)
-
         model_key = self._resolve_model_key(mode)
-        diffusers_meta, diffusers_error = self._try_generate_with_diffusers(
+        result_key = self._result_key(
             model_key=model_key,
             prompt=prompt,
             negative_prompt=negative_prompt,
-            output_path=output_path,
+            platform=platform,
+            mode=mode,
             seed=resolved_seed,
+        )
+        reused = self._reuse_result(result_key, output_path)
+        if reused is not None:
+            return reused
+        diffusers_metas, diffusers_error = self._try_generate_with_diffusers(
+            model_key=model_key,
+            slots=[_BatchSlot(prompt=prompt, negative_prompt=negative_prompt, seed=resolved_seed)],
+            output_paths=[output_path],
             platform=platform,
             mode=mode,
             requested_width=requested_width,
             requested_height=requested_height,
         )
-        if diffusers_meta is not None:
-            return diffusers_meta
+        if diffusers_metas is not None:
+            self._remember_result(result_key, output_path, diffusers_metas[0])
+            return diffusers_metas[0]
+        return self._generate_placeholder(
+            model_key=model_key,
+            prompt=prompt,
+            negative_prompt=negative_prompt,
+            platform=platform,
+            mode=mode,
+            output_path=output_path,
+            seed=resolved_seed,
+            reason=diffusers_error,
+        )
 
+    def generate_many(
+        self,
+        *,
+        prompts: list[str],
+        negative_prompt: str,
+        platform: str,
+        mode: str,
+        output_paths: list[Path],
+        seeds: list[int | None] | None = None,
+    ) -> list[dict]:
+        """Render several prompts at one platform/mode, sharing pipeline calls.
+
+        Uncached prompts go through the pipeline up to ``MAX_BATCH_SIZE`` at a
+        time, so the text encoders and each UNet step run once per batch.
+        Otherwise behaves like calling :meth:`generate` per prompt.
+        """
+        requested_width, requested_height = self.model_manager.platform_size(platform)
+        model_key = self._resolve_model_key(mode)
+        resolved_seeds = [
+            seed if seed is not None else self._seed_from_prompt(prompt)
+            for prompt, seed in zip(prompts, seeds or [None] * len(prompts))
+        ]
+        results: list[dict | None] = [None] * len(prompts)
+        pending: list[tuple[int, str | None, _BatchSlot]] = []
+        for idx, (prompt, output_path, seed) in enumerate(zip(prompts, output_paths, resolved_seeds)):
+            result_key = self._result_key(
+                model_key=model_key,
+                prompt=prompt,
+                negative_prompt=negative_prompt,
+                platform=platform,
+                mode=mode,
+                seed=seed,
+            )
+            results[idx] = self._reuse_result(result_key, output_path)
+            if results[idx] is None:
+                slot = _BatchSlot(prompt=prompt, negative_prompt=negative_prompt, seed=seed)
+                pending.append((idx, result_key, slot))
+
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start : start + MAX_BATCH_SIZE]
+            metas, error = self._try_generate_with_diffusers(
+                model_key=model_key,
+                slots=[slot for _, _, slot in chunk],
+                output_paths=[output_paths[idx] for idx, _, _ in chunk],
+                platform=platform,
+                mode=mode,
+                requested_width=requested_width,
+                requested_height=requested_height,
+            )
+            for pos, (idx, result_key, slot) in enumerate(chunk):
+                if metas is not None:
+                    self._remember_result(result_key, output_paths[idx], metas[pos])
+                    results[idx] = metas[pos]
+                    continue
+                results[idx] = self._generate_placeholder(
+                    model_key=model_key,
+                    prompt=slot.prompt,
+                    negative_prompt=negative_prompt,
+                    platform=platform,
+                    mode=mode,
+                    output_path=output_paths[idx],
+                    seed=slot.seed,
+                    reason=error,
+                )
+        return [result for result in results if result is not None]
+
+    def _generate_placeholder(
+        self,
+        *,
+        model_key: str | None,
+        prompt: str,
+        negative_prompt: str,
+        platform: str,
+        mode: str,
+        output_path: Path,
+        seed: int,
+        reason: str | None,
+    ) -> dict:
         if self.model_manager.strict_real_image_enabled():
-            reason = diffusers_error or "real image pipeline unavailable"
             raise RuntimeError(
-                f"Real image generation failed ({reason}). "
+                f"Real image generation failed ({reason or 'real image pipeline unavailable'}). "
                 "Placeholder image disabled in strict mode."
             )
 
+        requested_width, requested_height = self.model_manager.platform_size(platform)
         width, height = self.bucket_dimensions(mode, platform)
-        image = Image.new("RGB", (width, height), color=self._color(rng))
+        profile = self.profile_for_model(model_key)
+        image = Image.fromarray(self._placeholder_canvas(width, height, seed))
         draw = ImageDraw.Draw(image)
 
-        # Lightweight deterministic placeholder if no real model is available.
-        for _ in range(12):
-            x1 = rng.randint(0, max(1, width - 100))
-            y1 = rng.randint(0, max(1, height - 100))
-            x2 = min(width, x1 + rng.randint(80, width // 2))
-            y2 = min(height, y1 + rng.randint(80, height // 2))
-            draw.rectangle(
-                [x1, y1, x2, y2],
-                fill=self._color(rng),
-                outline=(255, 255, 255),
-                width=2,
-            )
-
-        font = ImageFont.load_default()
         header = "HQ AD" if mode == "hq" else "DRAFT AD"
         text = f"{header}\nPrompt: {prompt}\nAvoid: {negative_prompt or 'n/a'}"
         wrapped = "\n".join(
-            textwrap.fill(line, width=40) for line in text.splitlines() if line.strip()
+            _OVERLAY_WRAPPER.fill(line) for line in text.splitlines() if line.strip()
         )
         draw.multiline_text(
             (24, 24),
             wrapped,
             fill=(255, 255, 255),
-            font=font,
+            font=_OVERLAY_FONT,
             spacing=6,
             stroke_width=1,
             stroke_fill=(0, 0, 0),
         )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        image.save(output_path, format="PNG")
+        # Unlink first: the old file may be a hardlink into the result cache.
+        output_path.unlink(missing_ok=True)
+        image.save(output_path, format="PNG", compress_level=1)
         return {
             "engine": "pillow_fallback",
             "warning": "placeholder_output_only",
-            "reason": diffusers_error or "real_model_not_available",
+            "reason": reason or "real_model_not_available",
             "platform": platform,
             "mode": mode,
-            "seed": resolved_seed,
+            "seed": seed,
             "width": width,
             "height": height,
             "requested_width": requested_width,
             "requested_height": requested_height,
             "model_key": model_key or "unavailable",
-            "scheduler": self._scheduler_name(model_key),
-            "steps": self._steps_for_model(model_key),
-            "guidance_scale": self._guidance_scale_for_model(model_key),
+            "scheduler": profile.scheduler,
+            "steps": profile.steps,
+            "guidance_scale": profile.guidance_scale,
             "retry_count": 0,
             "oom_recovered": False,
             "device": "cpu",
         }
 
-    def _try_generate_with_diffusers(
+    def _result_key(
         self,
         *,
         model_key: str | None,
         prompt: str,
         negative_prompt: str,
-        output_path: Path,
+        platform: str,
+        mode: str,
         seed: int,
+    ) -> str | None:
+        entry = self._model_dir_entry(model_key) if model_key is not None else None
+        if entry is None or entry[1] is None:
+            return None
+        # The folder mtime is part of the key so swapping weights invalidates hits;
+        # so are the settings that change what the pipeline renders.
+        mtime_ns = entry[0]
+        raw = "\x1f".join(
+            (
+                model_key,
+                str(mtime_ns),
+                *self._render_settings(),
+                prompt,
+                negative_prompt,
+                platform,
+                mode,
+                str(seed),
+            )
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _render_settings(self) -> tuple[str, str, str]:
+        if self._deepcache_installed is None:
+            self._deepcache_installed = importlib.util.find_spec("DeepCache") is not None
+        return (
+            f"quantize={self.model_manager.quantize_mode()}",
+            f"backend={self.model_manager.inference_backend()}",
+            f"deepcache={int(self._deepcache_installed)}",
+        )
+
+    def _reuse_result(self, key: str | None, output_path: Path) -> dict | None:
+        """Materialize a previous identical generation at ``output_path``, if any.
+
+        Same model, prompt and seed give the same image, so the denoise loop is
+        skipped and the earlier PNG is hardlinked (or copied) into place.
+        """
+        if key is None:
+            return None
+        with self._results_lock:
+            hit = self._results.get(key)
+            if hit is not None:
+                self._results.move_to_end(key)
+        if hit is None:
+            hit = self._load_stored_result(key)
+        if hit is None:
+            return None
+        source, meta = hit
+        if source != output_path:
+            try:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.unlink(missing_ok=True)
+                try:
+                    os.link(source, output_path)
+                except OSError:
+                    shutil.copyfile(source, output_path)
+            except OSError:
+                with self._results_lock:
+                    self._results.pop(key, None)
+                return None
+        return {**meta, "cache_hit": True}
+
+    def _remember_result(self, key: str | None, output_path: Path, meta: dict) -> None:
+        # OOM retries render smaller or with fewer steps; never serve those as the
+        # full-size result for this key.
+        if key is None or meta.get("retry_count", 0) > 0:
+            return
+        source = self._store_result(key, output_path, meta) or output_path
+        with self._results_lock:
+            self._results[key] = (source, meta)
+            self._results.move_to_end(key)
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
+    def _store_result(self, key: str, output_path: Path, meta: dict) -> Path | None:
+        """Hardlink a finished render into the on-disk cache; returns the cached path."""
+        cached = self._result_dir / f"{key}.png"
+        try:
+            self._result_dir.mkdir(parents=True, exist_ok=True)
+            if not cached.exists():
+                try:
+                    os.link(output_path, cached)
+                except OSError:
+                    shutil.copyfile(output_path, cached)
+            cached.with_suffix(".json").write_bytes(orjson.dumps(meta))
+        except (OSError, TypeError):
+            return None
+        self._evict_stored_results()
+        return cached
+
+    def _load_stored_result(self, key: str) -> tuple[Path, dict] | None:
+        cached = self._result_dir / f"{key}.png"
+        try:
+            meta = orjson.loads(cached.with_suffix(".json").read_bytes())
+            # The mtime doubles as the LRU clock; atime is often disabled.
+            os.utime(cached)
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        with self._results_lock:
+            self._results[key] = (cached, meta)
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return cached, meta
+
+    def _evict_stored_results(self) -> None:
+        try:
+            with os.scandir(self._result_dir) as entries:
+                pngs = [entry for entry in entries if entry.name.endswith(".png")]
+            if len(pngs) <= RESULT_CACHE_SIZE:
+                return
+            pngs.sort(key=lambda entry: entry.stat().st_mtime_ns)
+            for entry in pngs[: len(pngs) - RESULT_CACHE_SIZE]:
+                path = Path(entry.path)
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _try_generate_with_diffusers(
+        self,
+        *,
+        model_key: str | None,
+        slots: list[_BatchSlot],
+        output_paths: list[Path],
         platform: str,
         mode: str,
         requested_width: int,
         requested_height: int,
-    ) -> tuple[dict | None, str | None]:
+    ) -> tuple[list[dict] | None, str | None]:
         if model_key is None:
             return None, "model_dir_not_found"
         model_dir = self._model_dir(model_key)
@@ -173,44 +513,63 @@ class ImageGenerator:
             return None, load_error or "pipeline_load_failed"
 
         width, height = self.bucket_dimensions(mode, platform)
-        steps = self._steps_for_model(model_key)
-        guidance_scale = self._guidance_scale_for_model(model_key)
-        attempts = self.attempt_plan(width, height, steps)
+        profile = self.profile_for_model(model_key)
+        guidance_scale = profile.guidance_scale
+        attempts = self.attempt_plan(width, height, profile.steps)
 
         saw_oom = False
         for retry_idx, (gen_width, gen_height, gen_steps) in enumerate(attempts):
             try:
-                generator = torch.Generator(device=device).manual_seed(seed)
-                result = pipeline(
-                    prompt=prompt,
-                    negative_prompt=negative_prompt or None,
-                    width=gen_width,
-                    height=gen_height,
-                    num_inference_steps=gen_steps,
-                    guidance_scale=guidance_scale,
-                    generator=generator,
-                )
-                image = result.images[0]
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                image.save(output_path, format="PNG")
-                return {
-                    "engine": "diffusers",
-                    "platform": platform,
-                    "mode": mode,
-                    "seed": seed,
-                    "width": image.width,
-                    "height": image.height,
-                    "requested_width": requested_width,
-                    "requested_height": requested_height,
-                    "model_dir": str(model_dir),
-                    "model_key": model_key,
-                    "scheduler": self._scheduler_name(model_key),
-                    "steps": gen_steps,
-                    "guidance_scale": guidance_scale,
-                    "retry_count": retry_idx,
-                    "oom_recovered": saw_oom and retry_idx > 0,
-                    "device": device,
-                }, None
+
+                def execute(slots: list[_BatchSlot]) -> list[Any]:
+                    return self._run_pipeline(
+                        pipeline,
+                        torch=torch,
+                        device=device,
+                        slots=slots,
+                        width=gen_width,
+                        height=gen_height,
+                        steps=gen_steps,
+                        guidance_scale=guidance_scale,
+                    )
+
+                # A lone request may share a window with other jobs; explicit
+                # batches are already full, and OOM retries run at reduced cost.
+                if self._batcher is not None and retry_idx == 0 and len(slots) == 1:
+                    key = (model_key, gen_width, gen_height, gen_steps, guidance_scale)
+                    images = [self._batcher.run(key, slots[0], execute)]
+                else:
+                    images = execute(slots)
+                metas: list[dict] = []
+                for slot, image, output_path in zip(slots, images, output_paths):
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    output_path.unlink(missing_ok=True)
+                    image.save(output_path, format="PNG", compress_level=1)
+                    metas.append(
+                        {
+                            "engine": "diffusers",
+                            "platform": platform,
+                            "mode": mode,
+                            "seed": slot.seed,
+                            "width": image.width,
+                            "height": image.height,
+                            "requested_width": requested_width,
+                            "requested_height": requested_height,
+                            "model_dir": str(model_dir),
+                            "model_key": model_key,
+                            "scheduler": profile.scheduler,
+                            "steps": gen_steps,
+                            "guidance_scale": guidance_scale,
+                            "retry_count": retry_idx,
+                            "oom_recovered": saw_oom and retry_idx > 0,
+                            "device": device,
+                            "offload": self._offload_modes.get(model_key, "none"),
+                            "deepcache": self._deepcache.get(model_key) is not None,
+                            "quantization": self._quantization.get(model_key, "none"),
+                            "backend": self._backends.get(model_key, "torch"),
+                        }
+                    )
+                return metas, None
             except Exception as exc:  # noqa: BLE001
                 message = str(exc)
                 if device == "cuda" and self._is_oom_error(message):
@@ -222,6 +581,43 @@ class ImageGenerator:
                 return None, message
         return None, "generation_failed"
 
+    def _seeded_generators(self, *, torch: Any, device: str, seeds: list[int]) -> list[Any]:
+        # Each worker thread keeps its own generators and only reseeds them,
+        # instead of allocating a fresh Philox state per call.
+        pool: dict[str, list[Any]] = self._worker_state.__dict__.setdefault("generators", {})
+        generators = pool.setdefault(device, [])
+        while len(generators) < len(seeds):
+            generators.append(torch.Generator(device=device))
+        return [generator.manual_seed(seed) for generator, seed in zip(generators, seeds)]
+
+    def _run_pipeline(
+        self,
+        pipeline: Any,
+        *,
+        torch: Any,
+        device: str,
+        slots: list[_BatchSlot],
+        width: int,
+        height: int,
+        steps: int,
+        guidance_scale: float,
+    ) -> list[Any]:
+        generators = self._seeded_generators(
+            torch=torch, device=device, seeds=[slot.seed for slot in slots]
+        )
+        negatives = [slot.negative_prompt for slot in slots]
+        with torch.inference_mode():
+            result = pipeline(
+                prompt=[slot.prompt for slot in slots],
+                negative_prompt=negatives if any(negatives) else None,
+                width=width,
+                height=height,
+                num_inference_steps=steps,
+                guidance_scale=guidance_scale,
+                generator=generators if len(generators) > 1 else generators[0],
+            )
+        return list(result.images)
+
     def _resolve_model_key(self, mode: str) -> str | None:
         availability = self.model_manager.image_model_availability()
         for key in self.candidate_model_keys(mode):
@@ -230,18 +626,14 @@ class ImageGenerator:
         return None
 
     def _model_dir(self, model_key: str) -> Path | None:
+        entry = self._model_dir_entry(model_key)
+        return entry[1] if entry is not None else None
+
+    def _model_dir_entry(self, model_key: str) -> tuple[int, Path | None] | None:
         folder = IMAGE_MODEL_DIRS.get(model_key)
         if folder is None:
             return None
-        path = self.model_manager.settings.model_path / folder[0] / folder[1]
-        if not path.exists():
-            return None
-        if (path / "model_index.json").exists():
-            return path
-        for candidate in path.rglob("model_index.json"):
-            if candidate.is_file():
-                return candidate.parent
-        return None
+        return self._model_dirs.lookup(self.model_manager.settings.model_path / folder[0] / folder[1])
 
     def _get_diffusers_pipeline(
         self, model_key: str, model_dir: Path
@@ -253,25 +645,187 @@ class ImageGenerator:
             return None, "cpu", None, f"pipeline_import_failed: {exc}"
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        cached = self._pipelines.get(model_key)
-        if cached is not None and cached[1] == device:
-            return cached[0], device, torch, None
 
-        self._configure_torch(torch=torch, device=device)
-        torch_dtype = torch.float16 if device == "cuda" else torch.float32
-        try:
-            pipe = AutoPipelineForText2Image.from_pretrained(
-                str(model_dir),
-                torch_dtype=torch_dtype,
-                local_files_only=True,
+        def load() -> Any:
+            self._configure_torch(torch=torch, device=device)
+            if (
+                device == "cuda"
+                and model_key in SDXL_MODEL_KEYS
+                and self.model_manager.inference_backend() == "ort_cuda"
+            ):
+                ort_pipe = self._load_ort_pipeline(model_dir)
+                if ort_pipe is not None:
+                    self._configure_scheduler(pipe=ort_pipe, model_key=model_key)
+                    self._backends[model_key] = "ort_cuda"
+                    return ort_pipe
+
+            pipe = self._load_pretrained(
+                AutoPipelineForText2Image, model_dir=model_dir, torch=torch, device=device
             )
-            pipe.to(device)
+            quantization = "none"
+            if model_key == "image_hq_sdxl_base" and self.model_manager.quantize_mode() == "int8":
+                quantization = self._quantize_int8(pipe)
+            self._quantization[model_key] = quantization
+            # Quantize before placement so the VRAM fit check sees int8 weights.
+            offload = self._place_pipeline(pipe=pipe, torch=torch, device=device)
             self._configure_pipeline_memory(pipe=pipe, device=device)
+            if device == "cuda":
+                self._use_channels_last(pipe=pipe, torch=torch)
             self._configure_scheduler(pipe=pipe, model_key=model_key)
-            self._pipelines[model_key] = (pipe, device)
-            return pipe, device, torch, None
+            self._deepcache[model_key] = self._enable_deepcache(pipe=pipe, model_key=model_key)
+            if offload == "none" and device == "cuda" and self.model_manager.torch_compile_enabled():
+                self._compile_unet(pipe=pipe, torch=torch)
+            self._backends[model_key] = "torch"
+            self._offload_modes[model_key] = offload
+            return pipe
+
+        try:
+            pipe = self.registry.get_or_load(
+                model_key,
+                device,
+                load,
+                # DeepCache helpers hold the pipeline too.
+                on_evict=lambda: self._deepcache.pop(model_key, None),
+            )
         except Exception as exc:  # noqa: BLE001
             return None, device, torch, f"pipeline_load_failed: {exc}"
+        return pipe, device, torch, None
+
+    @staticmethod
+    def _load_pretrained(pipeline_cls: Any, *, model_dir: Path, torch: Any, device: str) -> Any:
+        if device != "cuda":
+            return pipeline_cls.from_pretrained(
+                str(model_dir), torch_dtype=torch.float32, local_files_only=True
+            )
+        # Prefer the half-size fp16 weight files; many local folders only ship full ones.
+        try:
+            return pipeline_cls.from_pretrained(
+                str(model_dir),
+                torch_dtype=torch.float16,
+                variant="fp16",
+                use_safetensors=True,
+                local_files_only=True,
+            )
+        except Exception:  # noqa: BLE001
+            return pipeline_cls.from_pretrained(
+                str(model_dir), torch_dtype=torch.float16, local_files_only=True
+            )
+
+    @staticmethod
+    def _load_ort_pipeline(model_dir: Path) -> Any | None:
+        """Load ``model_dir`` as an ONNX Runtime SDXL pipeline on the CUDA EP, if available."""
+        try:
+            import onnxruntime as ort  # type: ignore
+            from optimum.onnxruntime import ORTStableDiffusionXLPipeline  # type: ignore
+        except Exception:  # noqa: BLE001
+            return None
+        if "CUDAExecutionProvider" not in ort.get_available_providers():
+            return None
+        try:
+            session_options = ort.SessionOptions()
+            session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            # Plain diffusers folders are exported once; an ONNX folder loads as-is.
+            return ORTStableDiffusionXLPipeline.from_pretrained(
+                str(model_dir),
+                export=not (model_dir / "unet" / "model.onnx").exists(),
+                provider="CUDAExecutionProvider",
+                session_options=session_options,
+                local_files_only=True,
+            )
+        except Exception:  # noqa: BLE001
+            return None
+
+    @staticmethod
+    def _quantize_int8(pipe: Any) -> str:
+        """Quantize UNet + text encoder weights to int8 with optimum-quanto, if installed."""
+        try:
+            from optimum.quanto import freeze, qint8, quantize  # type: ignore
+        except Exception:  # noqa: BLE001
+            return "none"
+        try:
+            for name in ("unet", "text_encoder", "text_encoder_2"):
+                module = getattr(pipe, name, None)
+                if module is None:
+                    continue
+                quantize(module, weights=qint8)
+                freeze(module)
+            return "int8"
+        except Exception:  # noqa: BLE001
+            return "none"
+
+    @staticmethod
+    def _place_pipeline(*, pipe: Any, torch: Any, device: str) -> str:
+        """Move ``pipe`` to ``device``, falling back to accelerate offload when VRAM is short.
+
+        Returns the strategy used: ``none``, ``model`` or ``sequential``.
+        """
+        if device != "cuda":
+            pipe.to(device)
+            return "none"
+        try:
+            free_bytes = int(torch.cuda.mem_get_info()[0])
+        except Exception:  # noqa: BLE001
+            pipe.to(device)
+            return "none"
+
+        def param_bytes(module: Any) -> int:
+            params = getattr(module, "parameters", None)
+            if not callable(params):
+                return 0
+            return sum(p.numel() * p.element_size() for p in params())
+
+        components = getattr(pipe, "components", {}) or {}
+        total_bytes = sum(param_bytes(module) for module in components.values())
+        unet_bytes = param_bytes(getattr(pipe, "unet", None))
+        # Leave ~30% headroom for activations and keep 15% of free VRAM spare.
+        budget = free_bytes * 0.85
+        if total_bytes * 1.3 <= budget:
+            pipe.to(device)
+            return "none"
+        strategy, fn_name = (
+            ("model", "enable_model_cpu_offload")
+            if unet_bytes * 1.3 <= budget
+            else ("sequential", "enable_sequential_cpu_offload")
+        )
+        fn = getattr(pipe, fn_name, None)
+        if callable(fn):
+            try:
+                fn()
+                return strategy
+            except Exception:  # noqa: BLE001
+                pass
+        pipe.to(device)
+        return "none"
+
+    @staticmethod
+    def _use_channels_last(*, pipe: Any, torch: Any) -> None:
+        # NHWC lets cuDNN pick tensor-core conv kernels for the UNet and VAE.
+        for name in ("unet", "vae"):
+            module = getattr(pipe, name, None)
+            if module is None:
+                continue
+            try:
+                module.to(memory_format=torch.channels_last)
+            except Exception:  # noqa: BLE001
+                pass
+
+    @staticmethod
+    def _compile_unet(*, pipe: Any, torch: Any) -> None:
+        unet = getattr(pipe, "unet", None)
+        compile_fn = getattr(torch, "compile", None)
+        if unet is None or not callable(compile_fn):
+            return
+        # Compilation is lazy: without triton, Inductor would only fail on the
+        # first denoise call, so stay eager instead.
+        if importlib.util.find_spec("triton") is None:
+            return
+        try:
+            # reduce-overhead captures a CUDA graph per input shape and replays it
+            # on later steps; dynamic=False keeps one static graph per resolution
+            # bucket, and attempt_plan downsizes simply record their own graph.
+            pipe.unet = compile_fn(unet, mode="reduce-overhead", fullgraph=False, dynamic=False)
+        except Exception:  # noqa: BLE001
+            pass
 
     @staticmethod
     def _configure_torch(*, torch: Any, device: str) -> None:
@@ -285,17 +839,34 @@ class ImageGenerator:
             torch.set_float32_matmul_precision("high")
         except Exception:  # noqa: BLE001
             pass
+        try:
+            # Shapes come from a few fixed buckets, so autotuned kernels get reused.
+            torch.backends.cudnn.benchmark = True
+        except Exception:  # noqa: BLE001
+            pass
+
+    @staticmethod
+    def _bf16_supported(torch: Any) -> bool:
+        try:
+            return bool(torch.cuda.is_bf16_supported())
+        except Exception:  # noqa: BLE001
+            return False
 
     @staticmethod
     def _configure_pipeline_memory(*, pipe: Any, device: str) -> None:
-        for fn_name in ("enable_attention_slicing", "enable_vae_slicing", "enable_vae_tiling"):
+        # Attention slicing serializes attention and only pays off on CPU; CUDA
+        # gets fused SDPA kernels (or xformers on torch < 2) instead.
+        fn_names = ["enable_vae_slicing", "enable_vae_tiling"]
+        if device != "cuda":
+            fn_names.insert(0, "enable_attention_slicing")
+        for fn_name in fn_names:
             fn = getattr(pipe, fn_name, None)
             if callable(fn):
                 try:
                     fn()
                 except Exception:  # noqa: BLE001
                     pass
-        if device == "cuda":
+        if device == "cuda" and not ImageGenerator._enable_sdpa(pipe):
             fn = getattr(pipe, "enable_xformers_memory_efficient_attention", None)
             if callable(fn):
                 try:
@@ -303,6 +874,35 @@ class ImageGenerator:
                 except Exception:  # noqa: BLE001
                     pass
 
+    @staticmethod
+    def _enable_sdpa(pipe: Any) -> bool:
+        unet = getattr(pipe, "unet", None)
+        if unet is None or not hasattr(unet, "set_attn_processor"):
+            return False
+        try:
+            from diffusers.models.attention_processor import AttnProcessor2_0  # type: ignore
+
+            unet.set_attn_processor(AttnProcessor2_0())
+            return True
+        except Exception:  # noqa: BLE001
+            return False
+
+    @staticmethod
+    def _enable_deepcache(*, pipe: Any, model_key: str) -> Any | None:
+        # Only the 30-step HQ path has enough adjacent steps to reuse features;
+        # turbo models finish in 4 steps.
+        if model_key != "image_hq_sdxl_base":
+            return None
+        try:
+            from DeepCache import DeepCacheSDHelper  # type: ignore
+
+            helper = DeepCacheSDHelper(pipe=pipe)
+            helper.set_params(cache_interval=3, cache_branch_id=0)
+            helper.enable()
+            return helper
+        except Exception:  # noqa: BLE001
+            return None
+
     @staticmethod
     def _configure_scheduler(*, pipe: Any, model_key: str) -> None:
         if model_key != "image_hq_sdxl_base":
@@ -319,26 +919,10 @@ class ImageGenerator:
             pass
 
     @staticmethod
-    def _scheduler_name(model_key: str | None) -> str:
-        if model_key == "image_hq_sdxl_base":
-            return "dpmpp_2m_karras"
-        return "default"
-
-    @staticmethod
-    def _steps_for_model(model_key: str | None) -> int:
-        if model_key == "image_hq_sdxl_base":
-            return 30
-        if model_key in {"image_fast_sdxl_turbo", "legacy_sd_turbo"}:
-            return 4
-        return 20
-
-    @staticmethod
-    def _guidance_scale_for_model(model_key: str | None) -> float:
-        if model_key == "image_hq_sdxl_base":
-            return 6.5
-        if model_key in {"image_fast_sdxl_turbo", "legacy_sd_turbo"}:
-            return 0.0
-        return 5.5
+    def profile_for_model(model_key: str | None) -> GenerationProfile:
+        if model_key is None:
+            return DEFAULT_PROFILE
+        return MODEL_PROFILES.get(model_key, DEFAULT_PROFILE)
 
     @staticmethod
     def _is_oom_error(message: str) -> bool:
@@ -351,12 +935,32 @@ class ImageGenerator:
 
     @staticmethod
     def _seed_from_prompt(prompt: str) -> int:
-        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
-        return int(digest[:8], 16)
+        # Seeds only need well-spread 32-bit values, not a cryptographic digest.
+        return zlib.crc32(prompt.encode("utf-8"))
 
     @staticmethod
-    def _color(rng: random.Random) -> tuple[int, int, int]:
-        return (rng.randint(20, 220), rng.randint(20, 220), rng.randint(20, 220))
+    def _placeholder_canvas(width: int, height: int, seed: int, count: int = 12) -> np.ndarray:
+        """Lightweight deterministic placeholder: outlined rectangles on a flat base."""
+        rng = np.random.default_rng(seed)
+        # All coordinates, sizes and colours come from a handful of batched draws.
+        x1 = rng.integers(0, max(1, width - 100), size=count, endpoint=True)
+        y1 = rng.integers(0, max(1, height - 100), size=count, endpoint=True)
+        x2 = np.minimum(width, x1 + rng.integers(80, max(80, width // 2), size=count, endpoint=True))
+        y2 = np.minimum(height, y1 + rng.integers(80, max(80, height // 2), size=count, endpoint=True))
+        colors = rng.integers(20, 220, size=(count + 1, 3), endpoint=True, dtype=np.uint8)
+
+        canvas = np.full((height, width, 3), colors[0], dtype=np.uint8)
+        for (left, top, right, bottom), color in zip(
+            np.stack([x1, y1, x2, y2], axis=1).tolist(), colors[1:]
+        ):
+            # Fill once, then paint only the 2px outline strips instead of
+            # writing the whole rectangle twice.
+            canvas[top:bottom, left:right] = color
+            canvas[top : top + 2, left:right] = 255
+            canvas[max(top, bottom - 2) : bottom, left:right] = 255
+            canvas[top:bottom, left : left + 2] = 255
+            canvas[top:bottom, max(left, right - 2) : right] = 255
+        return canvas
 
     @staticmethod
     def _round_to_64(value: int) -> int:
@@ -1,38 +1,64 @@
 from __future__ import annotations
 
 import hashlib
+import importlib.util
 import os
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
+from .image_gen import GenerationProfile, ImageGenerator
+from .model_manager import ModelIndexCache
+from .model_registry import ModelRegistry
+
 INPAINT_MODEL_DIRS: dict[str, tuple[str, str]] = {
     "inpaint_hq_sdxl": ("inpaint", "sdxl-inpaint"),
     "legacy_sd_inpaint": ("inpaint", "sd-inpaint"),
 }
 
+# Rough peak activation cost per output pixel at half precision with CFG,
+# SDPA attention and tiled VAE decode; weights are already resident when measured.
+ACTIVATION_BYTES_PER_PIXEL: dict[str, int] = {
+    "inpaint_hq_sdxl": 3072,
+    "legacy_sd_inpaint": 1536,
+}
+
+DEFAULT_INPAINT_PROFILE = GenerationProfile(scheduler="default", steps=20, guidance_scale=5.0)
+INPAINT_PROFILES: dict[str, GenerationProfile] = {
+    "inpaint_hq_sdxl": GenerationProfile(scheduler="dpmpp_2m_karras", steps=30, guidance_scale=6.5),
+    "legacy_sd_inpaint": DEFAULT_INPAINT_PROFILE,
+}
+
 DRAFT_INPAINT_ORDER = ["legacy_sd_inpaint", "inpaint_hq_sdxl"]
 HQ_INPAINT_ORDER = ["inpaint_hq_sdxl", "legacy_sd_inpaint"]
 
-RESOLUTION_BUCKETS: dict[str, dict[str, tuple[int, int]]] = {
-    "draft": {
-        "9:16": (640, 1136),
-        "4:5": (768, 960),
-        "1:1": (768, 768),
-    },
-    "hq": {
-        "9:16": (768, 1344),
-        "4:5": (896, 1152),
-        "1:1": (1024, 1024),
-    },
-}
+# The embedded default font is parsed once rather than per fallback edit.
+_OVERLAY_FONT = ImageFont.load_default()
+
+
+@lru_cache(maxsize=4096)
+def _prompt_digest(prompt: str) -> bytes:
+    # Shared by the torch seed and the fallback tint; retries reuse the digest.
+    return hashlib.sha256(prompt.encode("utf-8")).digest()
 
 
 class InpaintService:
-    def __init__(self, model_root: Path):
+    def __init__(
+        self,
+        model_root: Path,
+        registry: ModelRegistry | None = None,
+        torch_compile_enabled: Callable[[], bool] | None = None,
+    ):
         self.model_root = model_root
-        self._pipelines: dict[str, tuple[Any, str]] = {}
+        # Shared with ImageGenerator so both services evict against the same VRAM budget.
+        self.registry = registry if registry is not None else ModelRegistry()
+        # ModelManager.torch_compile_enabled, so CLIPPER_TORCH_COMPILE has one parser.
+        self._torch_compile_enabled = torch_compile_enabled or (lambda: False)
+        self._model_dirs = ModelIndexCache()
 
     def apply(
         self,
@@ -44,9 +70,14 @@ class InpaintService:
         strength: float,
         output_path: Path,
     ) -> dict:
+        # Decoded once; the real and fallback branches share these buffers.
+        # Masks are near-binary, so nearest-neighbour resizes skip the filter math;
+        # the fallback blurs the mask afterwards and the pipeline binarizes it anyway.
+        base = Image.open(image_path).convert("RGB")
+        mask = Image.open(mask_path).convert("L").resize(base.size, resample=Image.Resampling.NEAREST)
         real, real_error = self._try_diffusers_inpaint(
-            image_path=image_path,
-            mask_path=mask_path,
+            base=base,
+            mask=mask,
             edit_prompt=edit_prompt,
             mode=mode,
             strength=strength,
@@ -61,31 +92,47 @@ class InpaintService:
                 "Placeholder inpaint disabled in strict mode."
             )
 
-        base = Image.open(image_path).convert("RGB")
-        mask = Image.open(mask_path).convert("L").resize(base.size)
-        mask = mask.filter(ImageFilter.GaussianBlur(radius=2))
-
-        color = self._prompt_color(edit_prompt)
-        tint = Image.new("RGB", base.size, color=color)
-        alpha = max(0.05, min(1.0, strength))
-        masked_overlay = Image.blend(base, tint, alpha=alpha)
-        result = Image.composite(masked_overlay, base, mask)
+        mask_arr = np.asarray(mask)
+        if not np.count_nonzero(mask_arr):
+            # Nothing selected: no blur, no composite.
+            result = base
+            non_zero = 0
+        else:
+            # blend-then-composite folded into one pass: base + alpha * m * (tint - base).
+            color = np.asarray(self._prompt_color(edit_prompt), dtype=np.float32)
+            alpha = max(0.05, min(1.0, strength))
+            base_arr = np.asarray(base, dtype=np.float32)
+            if (mask_arr == 255).all():
+                # A fully opaque mask blurs to itself, so the tint is uniform.
+                weight: float | np.ndarray = alpha
+                non_zero = mask_arr.size
+            else:
+                mask_arr = self._blurred_mask(mask, radius=2)
+                weight = mask_arr.astype(np.float32)[..., None] * (alpha / 255.0)
+                non_zero = int(np.count_nonzero(mask_arr))
+            # In place on one scratch buffer instead of a temporary per operator.
+            blended = np.subtract(color, base_arr)
+            blended *= weight
+            blended += base_arr
+            blended += 0.5
+            np.clip(blended, 0, 255, out=blended)
+            result = Image.fromarray(blended.astype(np.uint8))
 
         draw = ImageDraw.Draw(result)
         draw.text(
             (20, result.height - 30),
             f"edit: {edit_prompt[:48]}",
             fill=(255, 255, 255),
-            font=ImageFont.load_default(),
+            font=_OVERLAY_FONT,
             stroke_width=1,
             stroke_fill=(0, 0, 0),
         )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        result.save(output_path, format="PNG")
+        result.save(output_path, format="PNG", compress_level=1)
 
-        non_zero = sum(1 for px in mask.getdata() if px > 0)
         model_key = self._resolve_model_key(mode)
+        profile = self._profile_for_model(model_key)
         return {
             "engine": "pillow_fallback",
             "warning": "placeholder_output_only",
@@ -95,19 +142,35 @@ class InpaintService:
             "size": {"width": result.width, "height": result.height},
             "reason": real_error or "real_model_not_available",
             "model_key": model_key or "unavailable",
-            "scheduler": self._scheduler_name(model_key),
-            "steps": self._steps_for_model(model_key),
-            "guidance_scale": self._guidance_scale_for_model(model_key),
+            "scheduler": profile.scheduler,
+            "steps": profile.steps,
+            "guidance_scale": profile.guidance_scale,
             "retry_count": 0,
             "oom_recovered": False,
             "device": "cpu",
         }
 
+    def warmup(self) -> bool:
+        """Load the HQ inpaint pipeline ahead of the first edit; True if one is resident.
+
+        CUDA only: an fp32 SDXL load on CPU costs ~10 GB of RAM for an editor that
+        may never be opened. Skipped when the registry keeps a single CUDA pipeline,
+        since the first image job would evict it after waiting for the load.
+        """
+        if not self._gpu_available() or self.registry.capacity.get("cuda", 1) < 2:
+            return False
+        model_key = self._resolve_model_key("hq")
+        model_dir = self._model_dir(model_key) if model_key is not None else None
+        if model_key is None or model_dir is None:
+            return False
+        pipeline, _device, _torch, _error = self._get_pipeline(model_key, model_dir)
+        return pipeline is not None
+
     def _try_diffusers_inpaint(
         self,
         *,
-        image_path: Path,
-        mask_path: Path,
+        base: Image.Image,
+        mask: Image.Image,
         edit_prompt: str,
         mode: str,
         strength: float,
@@ -124,30 +187,47 @@ class InpaintService:
         if pipeline is None or torch is None:
             return None, load_error or "pipeline_load_failed"
 
-        base = Image.open(image_path).convert("RGB")
-        mask = Image.open(mask_path).convert("L").resize(base.size)
         platform = self._platform_from_size(base.width, base.height)
         width, height = self._bucket_dimensions(mode, platform)
-        base = base.resize((width, height), resample=Image.Resampling.LANCZOS)
-        mask = mask.resize((width, height), resample=Image.Resampling.LANCZOS)
 
         safe_strength = max(0.05, min(1.0, float(strength)))
-        steps = self._steps_for_model(model_key)
-        guidance_scale = self._guidance_scale_for_model(model_key)
-        attempts = self._attempt_plan(width=width, height=height, steps=steps)
+        profile = self._profile_for_model(model_key)
+        guidance_scale = profile.guidance_scale
+        attempts = self._attempt_plan(width, height, profile.steps)
+
+        seed = int.from_bytes(_prompt_digest(edit_prompt)[:4], "big")
+        # One host-to-device upload; attempts resize on the GPU from these tensors.
+        base_t = self._to_tensor(torch=torch, image=base, device=device)
+        mask_t = self._to_tensor(torch=torch, image=mask, device=device)
+
+        # Start at the largest attempt that fits in free VRAM rather than paying
+        # for a doomed full-size forward; the OOM ladder remains as a safety net.
+        first = 0
+        if device == "cuda":
+            first = self._first_fitting_attempt(
+                attempts,
+                free_bytes=self._free_vram_bytes(torch),
+                bytes_per_pixel=ACTIVATION_BYTES_PER_PIXEL.get(model_key, 3072),
+            )
 
         saw_oom = False
-        for retry_idx, (gen_width, gen_height, gen_steps) in enumerate(attempts):
+        for retry_idx, (gen_width, gen_height, gen_steps) in enumerate(attempts[first:], start=first):
             try:
-                sized_base = base.resize((gen_width, gen_height), resample=Image.Resampling.LANCZOS)
-                sized_mask = mask.resize((gen_width, gen_height), resample=Image.Resampling.LANCZOS)
-                generator = torch.Generator(device=device).manual_seed(
-                    int(hashlib.sha256(edit_prompt.encode("utf-8")).hexdigest()[:8], 16)
+                # Each attempt resizes straight from the decoded inputs: one pass,
+                # none when the size already matches, and no compounding on retries.
+                sized_base = self._resize_tensor(
+                    torch=torch, tensor=base_t, width=gen_width, height=gen_height, mode="bicubic"
                 )
+                sized_mask = self._resize_tensor(
+                    torch=torch, tensor=mask_t, width=gen_width, height=gen_height, mode="nearest"
+                )
+                generator = torch.Generator(device=device).manual_seed(seed)
                 out = pipeline(
                     prompt=edit_prompt,
                     image=sized_base,
                     mask_image=sized_mask,
+                    width=gen_width,
+                    height=gen_height,
                     strength=safe_strength,
                     num_inference_steps=gen_steps,
                     guidance_scale=guidance_scale,
@@ -155,8 +235,8 @@ class InpaintService:
                 )
                 image = out.images[0]
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-                image.save(output_path, format="PNG")
-                non_zero = sum(1 for px in sized_mask.getdata() if px > 0)
+                image.save(output_path, format="PNG", compress_level=1)
+                non_zero = int(torch.count_nonzero(sized_mask))
                 return {
                     "engine": "diffusers_inpaint",
                     "mode": mode,
@@ -166,7 +246,7 @@ class InpaintService:
                     "device": device,
                     "model_dir": str(model_dir),
                     "model_key": model_key,
-                    "scheduler": self._scheduler_name(model_key),
+                    "scheduler": profile.scheduler,
                     "steps": gen_steps,
                     "guidance_scale": guidance_scale,
                     "retry_count": retry_idx,
@@ -183,6 +263,25 @@ class InpaintService:
                 return None, message
         return None, "generation_failed"
 
+    @staticmethod
+    def _to_tensor(*, torch: Any, image: Image.Image, device: str) -> Any:
+        # (1, C, H, W) in [0, 1]; the pipeline's processors normalize tensors themselves.
+        arr = np.array(image)
+        if arr.ndim == 2:
+            arr = arr[..., None]
+        return torch.from_numpy(arr).to(device).permute(2, 0, 1).unsqueeze(0).float().div_(255.0)
+
+    @staticmethod
+    def _resize_tensor(*, torch: Any, tensor: Any, width: int, height: int, mode: str) -> Any:
+        if tuple(tensor.shape[-2:]) == (height, width):
+            return tensor
+        if mode == "nearest":
+            return torch.nn.functional.interpolate(tensor, size=(height, width), mode="nearest")
+        resized = torch.nn.functional.interpolate(
+            tensor, size=(height, width), mode=mode, align_corners=False, antialias=True
+        )
+        return resized.clamp_(0.0, 1.0)
+
     def _resolve_model_key(self, mode: str) -> str | None:
         candidates = HQ_INPAINT_ORDER if mode == "hq" else DRAFT_INPAINT_ORDER
         for model_key in candidates:
@@ -194,20 +293,11 @@ class InpaintService:
         folder = INPAINT_MODEL_DIRS.get(model_key)
         if folder is None:
             return None
-        path = self.model_root / folder[0] / folder[1]
-        if not path.exists():
-            return None
-        if (path / "model_index.json").exists():
-            return path
-        for candidate in path.rglob("model_index.json"):
-            if candidate.is_file():
-                return candidate.parent
-        return None
+        return self._model_dirs.find(self.model_root / folder[0] / folder[1])
 
     def _get_pipeline(
         self, model_key: str, model_dir: Path
     ) -> tuple[Any | None, str, Any | None, str | None]:
-        cached = self._pipelines.get(model_key)
         try:
             import torch  # type: ignore
             from diffusers import AutoPipelineForInpainting  # type: ignore
@@ -215,55 +305,53 @@ class InpaintService:
             return None, "cpu", None, f"pipeline_import_failed: {exc}"
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        if cached is not None and cached[1] == device:
-            return cached[0], device, torch, None
 
-        self._configure_torch(torch=torch, device=device)
-        torch_dtype = torch.float16 if device == "cuda" else torch.float32
-        try:
+        def load() -> Any:
+            ImageGenerator._configure_torch(torch=torch, device=device)
+            torch_dtype = torch.float32
+            if device == "cuda":
+                # bf16 runs as fast as fp16 on Ampere+ without the VAE overflowing to NaN.
+                torch_dtype = torch.bfloat16 if ImageGenerator._bf16_supported(torch) else torch.float16
             pipe = AutoPipelineForInpainting.from_pretrained(
                 str(model_dir),
                 torch_dtype=torch_dtype,
                 local_files_only=True,
             )
             pipe.to(device)
-            self._configure_pipeline_memory(pipe=pipe, device=device)
+            ImageGenerator._configure_pipeline_memory(pipe=pipe, device=device)
             self._configure_scheduler(pipe=pipe, model_key=model_key)
-            self._pipelines[model_key] = (pipe, device)
-            return pipe, device, torch, None
+            if device == "cuda":
+                self._optimize_unet(pipe=pipe, torch=torch, compile_unet=self._torch_compile_enabled())
+            return pipe
+
+        # Jobs and the startup warmup can race here; the registry loads each pipeline once.
+        try:
+            pipe = self.registry.get_or_load(model_key, device, load)
         except Exception as exc:  # noqa: BLE001
             return None, device, torch, f"pipeline_load_failed: {exc}"
+        return pipe, device, torch, None
 
     @staticmethod
-    def _configure_torch(*, torch: Any, device: str) -> None:
-        if device != "cuda":
+    def _optimize_unet(*, pipe: Any, torch: Any, compile_unet: bool) -> None:
+        unet = getattr(pipe, "unet", None)
+        if unet is None:
             return
         try:
-            torch.backends.cuda.matmul.allow_tf32 = True
+            unet.to(memory_format=torch.channels_last)
         except Exception:  # noqa: BLE001
             pass
+        compile_fn = getattr(torch, "compile", None)
+        if not compile_unet or not callable(compile_fn):
+            return
+        # Inductor needs triton but only fails on the first call; stay eager without it.
+        if importlib.util.find_spec("triton") is None:
+            return
         try:
-            torch.set_float32_matmul_precision("high")
+            # Compiled once here; the cached pipeline amortizes it across jobs.
+            pipe.unet = compile_fn(unet, mode="reduce-overhead", fullgraph=False, dynamic=False)
         except Exception:  # noqa: BLE001
             pass
 
-    @staticmethod
-    def _configure_pipeline_memory(*, pipe: Any, device: str) -> None:
-        for fn_name in ("enable_attention_slicing", "enable_vae_slicing", "enable_vae_tiling"):
-            fn = getattr(pipe, fn_name, None)
-            if callable(fn):
-                try:
-                    fn()
-                except Exception:  # noqa: BLE001
-                    pass
-        if device == "cuda":
-            fn = getattr(pipe, "enable_xformers_memory_efficient_attention", None)
-            if callable(fn):
-                try:
-                    fn()
-                except Exception:  # noqa: BLE001
-                    pass
-
     @staticmethod
     def _configure_scheduler(*, pipe: Any, model_key: str) -> None:
         if model_key != "inpaint_hq_sdxl":
@@ -284,48 +372,56 @@ class InpaintService:
         if width <= 0 or height <= 0:
             return "9:16"
         ratio = width / height
-        targets = {
-            "9:16": 9 / 16,
-            "4:5": 4 / 5,
-            "1:1": 1.0,
-        }
-        return min(targets.keys(), key=lambda key: abs(targets[key] - ratio))
+        # Unrolled nearest-ratio pick; ties resolve in the same order min() used.
+        d_story = abs(ratio - 0.5625)
+        d_feed = abs(ratio - 0.8)
+        d_square = abs(ratio - 1.0)
+        if d_story <= d_feed and d_story <= d_square:
+            return "9:16"
+        return "4:5" if d_feed <= d_square else "1:1"
 
     @staticmethod
     def _bucket_dimensions(mode: str, platform: str) -> tuple[int, int]:
-        bucket = RESOLUTION_BUCKETS["hq" if mode == "hq" else "draft"]
-        return bucket.get(platform, bucket["9:16"])
+        # Same buckets as text-to-image so edits keep the generated framing.
+        return ImageGenerator.bucket_dimensions(mode, platform)
 
     @staticmethod
-    def _attempt_plan(width: int, height: int, steps: int) -> list[tuple[int, int, int]]:
+    @lru_cache(maxsize=16)
+    def _attempt_plan(width: int, height: int, steps: int) -> tuple[tuple[int, int, int], ...]:
+        # Buckets and step counts are enumerated, so this saturates after a few calls.
         lower_width = InpaintService._round_to_64(max(512, int(width * 0.8)))
         lower_height = InpaintService._round_to_64(max(512, int(height * 0.8)))
         reduced_steps = max(1, int(steps * 0.7))
-        return [
+        return (
             (width, height, steps),
             (lower_width, lower_height, steps),
             (lower_width, lower_height, reduced_steps),
-        ]
+        )
 
     @staticmethod
-    def _steps_for_model(model_key: str | None) -> int:
-        if model_key == "inpaint_hq_sdxl":
-            return 30
-        if model_key == "legacy_sd_inpaint":
-            return 20
-        return 20
+    def _free_vram_bytes(torch: Any) -> int | None:
+        try:
+            return int(torch.cuda.mem_get_info()[0])
+        except Exception:  # noqa: BLE001
+            return None
 
     @staticmethod
-    def _guidance_scale_for_model(model_key: str | None) -> float:
-        if model_key == "inpaint_hq_sdxl":
-            return 6.5
-        return 5.0
+    def _first_fitting_attempt(
+        attempts: tuple[tuple[int, int, int], ...], *, free_bytes: int | None, bytes_per_pixel: int
+    ) -> int:
+        if free_bytes is None:
+            return 0
+        budget = free_bytes * 0.7
+        for idx, (width, height, _steps) in enumerate(attempts[:-1]):
+            if width * height * bytes_per_pixel <= budget:
+                return idx
+        return len(attempts) - 1
 
     @staticmethod
-    def _scheduler_name(model_key: str | None) -> str:
-        if model_key == "inpaint_hq_sdxl":
-            return "dpmpp_2m_karras"
-        return "default"
+    def _profile_for_model(model_key: str | None) -> GenerationProfile:
+        if model_key is None:
+            return DEFAULT_INPAINT_PROFILE
+        return INPAINT_PROFILES.get(model_key, DEFAULT_INPAINT_PROFILE)
 
     @staticmethod
     def _is_oom_error(message: str) -> bool:
@@ -351,10 +447,25 @@ class InpaintService:
         except Exception:  # noqa: BLE001
             return False
 
+    @staticmethod
+    def _blurred_mask(mask: Image.Image, radius: int) -> np.ndarray:
+        # Brush masks usually cover a small region: blur only its bounding box plus
+        # the kernel's reach, since everything further out stays zero either way.
+        out = np.zeros((mask.height, mask.width), dtype=np.uint8)
+        bbox = mask.getbbox()
+        if bbox is None:
+            return out
+        margin = 3 * radius + 2
+        left, top = max(0, bbox[0] - margin), max(0, bbox[1] - margin)
+        right, bottom = min(mask.width, bbox[2] + margin), min(mask.height, bbox[3] + margin)
+        region = mask.crop((left, top, right, bottom)).filter(ImageFilter.GaussianBlur(radius=radius))
+        out[top:bottom, left:right] = np.asarray(region)
+        return out
+
     @staticmethod
     def _prompt_color(prompt: str) -> tuple[int, int, int]:
-        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
-        return (int(digest[0:2], 16), int(digest[2:4], 16), int(digest[4:6], 16))
+        digest = _prompt_digest(prompt)
+        return (digest[0], digest[1], digest[2])
 
     @staticmethod
     def _round_to_64(value: int) -> int:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+from app.db.models import JobRow
+
+
+class JobEventBus:
+    """In-process fan-out of job row updates to per-job subscriber queues.
+
+    ``publish`` is safe to call from repository worker threads; delivery always
+    happens on the event loop the bus was created on.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self._loop = loop or asyncio.get_running_loop()
+        self._subscribers: defaultdict[str, set[asyncio.Queue[JobRow]]] = defaultdict(set)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue[JobRow]:
+        queue: asyncio.Queue[JobRow] = asyncio.Queue()
+        self._subscribers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue[JobRow]) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+
+    def publish(self, job: JobRow) -> None:
+        if job["id"] not in self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(job)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._dispatch, job)
+
+    def _dispatch(self, job: JobRow) -> None:
+        for queue in tuple(self._subscribers.get(job["id"], ())):
+            queue.put_nowait(job)
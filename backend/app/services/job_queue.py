@@ -4,6 +4,7 @@ import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
 
+from app.db.models import JobRow, JobType
 from app.db.repo import Repository
 
 JobHandler = Callable[
@@ -11,14 +12,91 @@ JobHandler = Callable[
     Awaitable[dict[str, Any] | None],
 ]
 
+PROGRESS_MIN_STEP_PCT = 2
+RECOVERY_PAGE_SIZE = 500
+
+
+class ProgressReporter:
+    """Write one job's progress from a single long-lived task.
+
+    ``post`` only records the newest (stage, pct) and wakes the writer, so a
+    handler's progress call costs no thread hop; ticks that arrive while a write
+    is in flight collapse into the latest one. Cancellation seen by the writer is
+    raised from the next ``post``.
+    """
+
+    def __init__(self, repo: Repository, job_id: str):
+        self.repo = repo
+        self.job_id = job_id
+        self.cancelled = False
+        self._closing = False
+        self._last: tuple[str, int] = ("", -PROGRESS_MIN_STEP_PCT)
+        self._latest: tuple[str, int] | None = None
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def post(self, stage: str, pct: int) -> None:
+        if self.cancelled:
+            raise RuntimeError("Job was cancelled.")
+        # Fine-grained ticks within one stage are coalesced into fewer writes.
+        if stage == self._last[0] and pct - self._last[1] < PROGRESS_MIN_STEP_PCT:
+            return
+        self._last = (stage, pct)
+        self._latest = self._last
+        self._wake.set()
+
+    async def close(self) -> None:
+        """Stop the writer once any in-flight write lands; pending ticks are dropped.
+
+        The writer is never cancelled mid-write, so a stale stage can't reach
+        SQLite after the job's terminal update. A cancel that landed after the
+        last write is picked up by one final status read, so ``cancelled`` is
+        current when this returns.
+        """
+        self._closing = True
+        self._latest = None
+        self._wake.set()
+        await self._task
+        if not self.cancelled:
+            current = await asyncio.to_thread(self.repo.get_job, self.job_id)
+            self.cancelled = current is not None and current["status"] == "cancelled"
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if self._closing:
+                return
+            update, self._latest = self._latest, None
+            if update is not None:
+                await self._write(*update)
+
+    async def _write(self, stage: str, pct: int) -> None:
+        current = await asyncio.to_thread(self.repo.get_job, self.job_id)
+        if current is None:
+            return
+        if current["status"] == "cancelled":
+            self.cancelled = True
+            return
+        await asyncio.to_thread(self.repo.update_job, self.job_id, stage=stage, progress_pct=pct)
+
 
 class JobQueue:
-    def __init__(self, repo: Repository, max_workers: int = 1):
+    def __init__(
+        self,
+        repo: Repository,
+        max_workers: int = 1,
+        batch_delay_sec: float = 0.01,
+    ):
         self.repo = repo
         self.max_workers = max(1, max_workers)
+        self.batch_delay_sec = max(0.0, batch_delay_sec)
         self._queue: asyncio.Queue[str] = asyncio.Queue()
+        # ``None`` is the stop sentinel: the batcher flushes everything before it.
+        self._pending: asyncio.Queue[tuple[JobRow, asyncio.Future[JobRow]] | None] = asyncio.Queue()
         self._handlers: dict[str, JobHandler] = {}
         self._workers: list[asyncio.Task[None]] = []
+        self._batcher: asyncio.Task[None] | None = None
         self._started = False
 
     def register_handler(self, job_type: str, handler: JobHandler) -> None:
@@ -28,10 +106,44 @@ class JobQueue:
         if self._started:
             return
         self._started = True
+        await self._recover_jobs()
         for i in range(self.max_workers):
             self._workers.append(asyncio.create_task(self._worker(i)))
+        self._batcher = asyncio.create_task(self._batch_inserts())
+
+    async def _recover_jobs(self) -> None:
+        """Pick up jobs a previous process left behind.
+
+        Queued jobs were only ever in that process's memory, so they are
+        requeued. Running ones lost their worker mid-render and fail, rather than
+        staying 'running' forever.
+        """
+        after: tuple[str, str] | None = None
+        while True:
+            page = await asyncio.to_thread(self.repo.list_active_jobs, RECOVERY_PAGE_SIZE, after)
+            for job in page:
+                if job["status"] == "queued":
+                    await self.enqueue(job["id"])
+                else:
+                    await asyncio.to_thread(
+                        self.repo.update_job,
+                        job["id"],
+                        status="error",
+                        stage="error",
+                        progress_pct=100,
+                        error_text="Interrupted by a server restart.",
+                    )
+            if len(page) < RECOVERY_PAGE_SIZE:
+                return
+            after = (page[-1]["created_at"], page[-1]["id"])
 
     async def stop(self) -> None:
+        # The batcher isn't cancelled: it inserts every submission already waiting,
+        # so no submit() is left hanging. Later submits insert directly.
+        batcher, self._batcher = self._batcher, None
+        if batcher is not None:
+            await self._pending.put(None)
+            await batcher
         for task in self._workers:
             task.cancel()
         for task in self._workers:
@@ -45,6 +157,48 @@ class JobQueue:
     async def enqueue(self, job_id: str) -> None:
         await self._queue.put(job_id)
 
+    async def submit(self, *, project_id: str, job_type: JobType, params: dict) -> JobRow:
+        """Create and enqueue a job, coalescing inserts that arrive within one batch window."""
+        row = self.repo.new_job_row(project_id=project_id, job_type=job_type, params=params)
+        if self._batcher is None:
+            await asyncio.to_thread(self.repo.create_jobs_bulk, [row])
+            await self.enqueue(row["id"])
+            return row
+        future: asyncio.Future[JobRow] = asyncio.get_running_loop().create_future()
+        await self._pending.put((row, future))
+        return await future
+
+    async def _batch_inserts(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            if self.batch_delay_sec:
+                await asyncio.sleep(self.batch_delay_sec)
+            while not self._pending.empty():
+                item = self._pending.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await asyncio.to_thread(self.repo.create_jobs_bulk, [row for row, _ in batch])
+            except Exception as exc:  # noqa: BLE001
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            # After stop() the workers are going away; the rows stay queued and
+            # are requeued by the next start().
+            for row, future in batch:
+                await self.enqueue(row["id"])
+                if not future.done():
+                    future.set_result(row)
+
     async def _worker(self, worker_idx: int) -> None:
         while True:
             job_id = await self._queue.get()
@@ -54,14 +208,17 @@ class JobQueue:
                 self._queue.task_done()
 
     async def _run_job(self, job_id: str, worker_idx: int) -> None:
-        job = self.repo.get_job(job_id)
+        # Repository calls hit SQLite; keep them off the event loop so one
+        # worker's writes never stall the others or the API.
+        job = await asyncio.to_thread(self.repo.get_job, job_id)
         if job is None:
             return
         if job["status"] == "cancelled":
             return
         handler = self._handlers.get(job["type"])
         if handler is None:
-            self.repo.update_job(
+            await asyncio.to_thread(
+                self.repo.update_job,
                 job_id,
                 status="error",
                 stage="error",
@@ -70,7 +227,8 @@ class JobQueue:
             )
             return
 
-        self.repo.update_job(
+        await asyncio.to_thread(
+            self.repo.update_job,
             job_id,
             status="running",
             stage=f"worker_{worker_idx}_starting",
@@ -78,17 +236,22 @@ class JobQueue:
             error_text="",
         )
 
+        reporter = ProgressReporter(self.repo, job_id)
+
         async def progress(stage: str, pct: int) -> None:
-            current = self.repo.get_job(job_id)
-            if current is None:
-                return
-            if current["status"] == "cancelled":
-                raise RuntimeError("Job was cancelled.")
-            self.repo.update_job(job_id, stage=stage, progress_pct=pct)
+            reporter.post(stage, pct)
 
         try:
-            result = await handler(job, progress)
-            self.repo.update_job(
+            try:
+                result = await handler(job, progress)
+            finally:
+                await reporter.close()
+            # Handlers often post nothing after their long step, so a cancel made
+            # during it is only seen here.
+            if reporter.cancelled:
+                raise RuntimeError("Job was cancelled.")
+            await asyncio.to_thread(
+                self.repo.update_job,
                 job_id,
                 status="done",
                 stage="completed",
@@ -97,11 +260,11 @@ class JobQueue:
                 error_text="",
             )
         except Exception as exc:  # noqa: BLE001
-            self.repo.update_job(
+            await asyncio.to_thread(
+                self.repo.update_job,
                 job_id,
                 status="error",
                 stage="failed",
                 progress_pct=100,
                 error_text=str(exc),
             )
-
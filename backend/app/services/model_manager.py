@@ -2,17 +2,89 @@ from __future__ import annotations
 
 import os
 import shutil
+import subprocess
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from app.config import Settings
 
-PLATFORM_SIZES: dict[str, tuple[int, int]] = {
-    "9:16": (1080, 1920),
-    "4:5": (1080, 1350),
-    "1:1": (1080, 1080),
-}
+PLATFORM_SIZES: Mapping[str, tuple[int, int]] = MappingProxyType(
+    {
+        "9:16": (1080, 1920),
+        "4:5": (1080, 1350),
+        "1:1": (1080, 1080),
+    }
+)
+
+# Render node ffmpeg's VAAPI encoder opens; the usual first GPU on Linux.
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# Hugging Face cache internals never hold a pipeline folder.
+_SKIPPED_MODEL_SUBDIRS = frozenset({"blobs", "refs", ".cache", ".git"})
+
+
+def find_model_index_dir(root: Path, max_depth: int = 3) -> Path | None:
+    """Return the shallowest folder under ``root`` holding a ``model_index.json``.
+
+    Walks directories breadth-first, at most ``max_depth`` levels down, instead
+    of an rglob that stats every weight shard in the tree. Three levels covers
+    ``models--org--name/snapshots/<hash>/`` cache layouts.
+    """
+    level = [root]
+    for _ in range(max_depth + 1):
+        children: list[Path] = []
+        for folder in level:
+            if (folder / "model_index.json").is_file():
+                return folder
+            try:
+                with os.scandir(folder) as entries:
+                    children.extend(
+                        sorted(
+                            Path(entry.path)
+                            for entry in entries
+                            if entry.is_dir() and entry.name not in _SKIPPED_MODEL_SUBDIRS
+                        )
+                    )
+            except OSError:
+                continue
+        if not children:
+            return None
+        level = children
+    return None
+
+
+class ModelIndexCache:
+    """``find_model_index_dir`` results per folder, rescanned only when its mtime changes.
+
+    Model folders are checked on every generate and capability call, so a lookup
+    costs one stat; the walk reruns only after something is added or removed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[int, Path | None]] = {}
+
+    def lookup(self, path: Path) -> tuple[int, Path | None] | None:
+        """Return ``(mtime_ns, model dir or None)`` for ``path``; None if it can't be stat'd."""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        cached = self._entries.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached
+        entry = (mtime_ns, find_model_index_dir(path))
+        self._entries[path] = entry
+        return entry
+
+    def find(self, path: Path) -> Path | None:
+        entry = self.lookup(path)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._entries.clear()
 
 
 @dataclass
@@ -25,6 +97,24 @@ class CapabilityReport:
 class ModelManager:
     def __init__(self, settings: Settings):
         self.settings = settings
+        self._model_index_cache = ModelIndexCache()
+        # The GPU doesn't change while the process runs; probe CUDA once.
+        self._gpu_info: dict[str, Any] | None = None
+        self._nvidia_smi: bool | None = None
+        self._ffmpeg_exe: str | None = None
+        self._video_encoder: str | None = None
+        # Strict flags are checked on every image submit; read the env once.
+        self._strict_real_image: bool | None = None
+        self._strict_real_inpaint: bool | None = None
+        # Read when the CUDA caching allocator starts, so set it before any probe or
+        # pipeline load touches the GPU. Growable segments stop fragmentation OOMs
+        # from forcing attempt_plan's smaller retries; an explicit value wins.
+        os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+        # Inductor's default cache lives in /tmp; keeping it with the app data lets
+        # CLIPPER_TORCH_COMPILE restarts reuse already-compiled UNet kernels.
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR", str(settings.data_dir / "torch_compile_cache")
+        )
 
     def platform_size(self, platform: str) -> tuple[int, int]:
         return PLATFORM_SIZES.get(platform, (1080, 1920))
@@ -37,17 +127,81 @@ class ModelManager:
         return raw.strip().lower() in {"1", "true", "yes", "on"}
 
     def ffmpeg_available(self) -> bool:
-        if shutil.which("ffmpeg") is not None:
-            return True
+        return self.ffmpeg_exe() is not None
+
+    def ffmpeg_exe(self) -> str | None:
+        """Path of the ffmpeg binary on PATH or bundled with imageio-ffmpeg, if any."""
+        if self._ffmpeg_exe is None:
+            self._ffmpeg_exe = self._find_ffmpeg() or ""
+        return self._ffmpeg_exe or None
+
+    def video_encoder(self) -> str:
+        """H.264 encoder for rendered videos: NVENC, QSV or VAAPI when usable, else libx264.
+
+        ``CLIPPER_VIDEO_ENCODER`` forces a choice. Otherwise each hardware encoder
+        ffmpeg lists is test-encoded once, since a build can ship NVENC without a
+        GPU to run it.
+        """
+        forced = os.getenv("CLIPPER_VIDEO_ENCODER", "").strip().lower()
+        if forced:
+            return forced
+        if self._video_encoder is None:
+            self._video_encoder = self._probe_video_encoder()
+        return self._video_encoder
+
+    def _probe_video_encoder(self) -> str:
+        exe = self.ffmpeg_exe()
+        if exe is None:
+            return "libx264"
+        try:
+            listed = subprocess.run(
+                [exe, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=10, check=False
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return "libx264"
+        candidates = []
+        if self.gpu_available() or self._nvidia_smi_available():
+            candidates.append("h264_nvenc")
+        candidates.append("h264_qsv")
+        if Path(VAAPI_DEVICE).exists():
+            candidates.append("h264_vaapi")
+        for encoder in candidates:
+            if f" {encoder} " not in listed:
+                continue
+            cmd = [exe, "-hide_banner", "-loglevel", "error"]
+            if encoder == "h264_vaapi":
+                cmd += ["-vaapi_device", VAAPI_DEVICE]
+            cmd += ["-f", "lavfi", "-i", "color=size=256x256:duration=0.1", "-frames:v", "1"]
+            if encoder == "h264_vaapi":
+                cmd += ["-vf", "format=nv12,hwupload"]
+            cmd += ["-c:v", encoder, "-f", "null", "-"]
+            try:
+                if subprocess.run(cmd, capture_output=True, timeout=15, check=False).returncode == 0:
+                    return encoder
+            except (OSError, subprocess.SubprocessError):
+                continue
+        return "libx264"
+
+    @staticmethod
+    def _find_ffmpeg() -> str | None:
+        found = shutil.which("ffmpeg")
+        if found is not None:
+            return found
         try:
             import imageio_ffmpeg  # type: ignore
 
             exe = imageio_ffmpeg.get_ffmpeg_exe()
-            return bool(exe and Path(exe).exists())
+            return exe if exe and Path(exe).exists() else None
         except Exception:  # noqa: BLE001
-            return False
+            return None
 
     def gpu_info(self) -> dict[str, Any]:
+        if self._gpu_info is None:
+            self._gpu_info = self._probe_gpu()
+        return dict(self._gpu_info)
+
+    @staticmethod
+    def _probe_gpu() -> dict[str, Any]:
         try:
             import torch  # type: ignore
         except Exception:  # noqa: BLE001
@@ -71,21 +225,35 @@ class ModelManager:
         return bool(self.gpu_info()["available"])
 
     def strict_real_image_enabled(self) -> bool:
-        return self._env_bool("CLIPPER_STRICT_REAL_IMAGE", default=self.gpu_available())
+        if self._strict_real_image is None:
+            self._strict_real_image = self._env_bool(
+                "CLIPPER_STRICT_REAL_IMAGE", default=self.gpu_available()
+            )
+        return self._strict_real_image
 
     def strict_real_inpaint_enabled(self) -> bool:
-        return self._env_bool("CLIPPER_STRICT_REAL_INPAINT", default=self.gpu_available())
+        if self._strict_real_inpaint is None:
+            self._strict_real_inpaint = self._env_bool(
+                "CLIPPER_STRICT_REAL_INPAINT", default=self.gpu_available()
+            )
+        return self._strict_real_inpaint
 
-    @staticmethod
-    def _has_model_index(path: Path) -> bool:
-        if not path.exists():
-            return False
-        if (path / "model_index.json").exists():
-            return True
-        for item in path.rglob("model_index.json"):
-            if item.is_file():
-                return True
-        return False
+    def quantize_mode(self) -> str:
+        # "int8" quantizes the HQ SDXL UNet/text encoders via optimum-quanto, and the
+        # video denoiser (dynamic int8 on CPU); "fp8" applies to video on Ada/Hopper.
+        return os.getenv("CLIPPER_QUANTIZE", "none").strip().lower()
+
+    def inference_backend(self) -> str:
+        # "ort_cuda" runs the SDXL image models through ONNX Runtime's CUDA EP.
+        return os.getenv("CLIPPER_BACKEND", "torch").strip().lower()
+
+    def torch_compile_enabled(self) -> bool:
+        # Off by default: the first compiled call is slow and needs triton.
+        return self._env_bool("CLIPPER_TORCH_COMPILE", default=False)
+
+    def _has_model_index(self, path: Path) -> bool:
+        # Every image generate() checks all five folders and t2v jobs check the video one.
+        return self._model_index_cache.find(path) is not None
 
     def image_model_availability(self) -> dict[str, bool]:
         image_root = self.settings.model_path / "image"
@@ -98,8 +266,8 @@ class ModelManager:
             "legacy_sd_inpaint": self._has_model_index(inpaint_root / "sd-inpaint"),
         }
 
-    def draft_image_model_default(self) -> str:
-        models = self.image_model_availability()
+    def draft_image_model_default(self, models: dict[str, bool] | None = None) -> str:
+        models = models if models is not None else self.image_model_availability()
         if models["image_fast_sdxl_turbo"]:
             return "image_fast_sdxl_turbo"
         if models["legacy_sd_turbo"]:
@@ -108,8 +276,8 @@ class ModelManager:
             return "image_hq_sdxl_base"
         return "unavailable"
 
-    def hq_image_model_default(self) -> str:
-        models = self.image_model_availability()
+    def hq_image_model_default(self, models: dict[str, bool] | None = None) -> str:
+        models = models if models is not None else self.image_model_availability()
         if models["image_hq_sdxl_base"]:
             return "image_hq_sdxl_base"
         if models["image_fast_sdxl_turbo"]:
@@ -118,22 +286,44 @@ class ModelManager:
             return "legacy_sd_turbo"
         return "unavailable"
 
-    def hq_inpaint_model_default(self) -> str:
-        models = self.image_model_availability()
+    def hq_inpaint_model_default(self, models: dict[str, bool] | None = None) -> str:
+        models = models if models is not None else self.image_model_availability()
         if models["inpaint_hq_sdxl"]:
             return "inpaint_hq_sdxl"
         if models["legacy_sd_inpaint"]:
             return "legacy_sd_inpaint"
         return "unavailable"
 
+    def reload_models(self) -> None:
+        """Forget cached model-folder checks, e.g. after a download into a nested folder."""
+        self._model_index_cache.clear()
+
+    def refresh(self) -> None:
+        """Forget every cached probe: model folders, the CUDA device, nvidia-smi, ffmpeg
+        and the strict-mode flags."""
+        self.reload_models()
+        self._gpu_info = None
+        self._nvidia_smi = None
+        self._ffmpeg_exe = None
+        self._video_encoder = None
+        self._strict_real_image = None
+        self._strict_real_inpaint = None
+
+    def _nvidia_smi_available(self) -> bool:
+        if self._nvidia_smi is None:
+            self._nvidia_smi = shutil.which("nvidia-smi") is not None
+        return self._nvidia_smi
+
     def system_capabilities(self) -> dict[str, Any]:
+        # One availability pass shared by the report and all three defaults.
+        models = self.image_model_availability()
         return {
             "gpu": self.gpu_info(),
-            "models": self.image_model_availability(),
+            "models": models,
             "defaults": {
-                "draft_model": self.draft_image_model_default(),
-                "hq_model": self.hq_image_model_default(),
-                "hq_inpaint_model": self.hq_inpaint_model_default(),
+                "draft_model": self.draft_image_model_default(models),
+                "hq_model": self.hq_image_model_default(models),
+                "hq_inpaint_model": self.hq_inpaint_model_default(models),
             },
             "strict": {
                 "real_image": self.strict_real_image_enabled(),
@@ -150,7 +340,7 @@ class ModelManager:
                 reason="forced_by_env",
             )
 
-        has_nvidia = self.gpu_available() or shutil.which("nvidia-smi") is not None
+        has_nvidia = self.gpu_available() or self._nvidia_smi_available()
         if not has_nvidia:
             cpu_allowed = os.getenv("CLIPPER_ALLOW_CPU_T2V", "0") == "1"
             if cpu_allowed and self.has_local_video_model():
@@ -171,12 +361,5 @@ class ModelManager:
         )
 
     def has_local_video_model(self) -> bool:
-        video_root = self.settings.model_path / "video"
-        if not video_root.exists():
-            return False
-        if (video_root / "model_index.json").exists():
-            return True
-        for item in video_root.rglob("model_index.json"):
-            if item.is_file():
-                return True
-        return False
+        # Same mtime-keyed cache as the image folders; refresh() forgets it.
+        return self._has_model_index(self.settings.model_path / "video")
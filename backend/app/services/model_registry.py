@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gc
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Loaded pipelines kept per device; three SDXL-class models don't fit in 12GB.
+DEFAULT_CAPACITY: dict[str, int] = {"cuda": 1, "cpu": 2}
+
+
+@dataclass
+class _Entry:
+    pipe: Any
+    on_evict: Callable[[], None] | None
+
+
+class ModelRegistry:
+    """Process-wide LRU of loaded diffusers pipelines, shared by the image services.
+
+    Capacity is per device, so loading an inpaint model on CUDA unloads an idle
+    text-to-image one (and vice versa) instead of both competing for VRAM.
+    """
+
+    def __init__(self, capacity: dict[str, int] | None = None):
+        self.capacity = dict(DEFAULT_CAPACITY if capacity is None else capacity)
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Loads are serialized so eviction always runs before the next model
+        # claims memory, and concurrent callers never load the same model twice.
+        self._load_lock = threading.Lock()
+
+    def get(self, model_key: str, device: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get((model_key, device))
+            if entry is None:
+                return None
+            self._entries.move_to_end((model_key, device))
+            return entry.pipe
+
+    def get_or_load(
+        self,
+        model_key: str,
+        device: str,
+        loader: Callable[[], Any],
+        *,
+        on_evict: Callable[[], None] | None = None,
+    ) -> Any:
+        """Return the cached pipeline, or evict as needed and cache ``loader()``'s result.
+
+        Exceptions from ``loader`` propagate and nothing is cached.
+        """
+        pipe = self.get(model_key, device)
+        if pipe is not None:
+            return pipe
+        with self._load_lock:
+            pipe = self.get(model_key, device)
+            if pipe is not None:
+                return pipe
+            self._evict(device=device, keep=self.capacity.get(device, 1) - 1)
+            pipe = loader()
+            with self._lock:
+                self._entries[(model_key, device)] = _Entry(pipe=pipe, on_evict=on_evict)
+            return pipe
+
+    def loaded_keys(self) -> list[str]:
+        with self._lock:
+            return [model_key for model_key, _device in self._entries]
+
+    def evict_all(self) -> None:
+        """Release every cached pipeline, e.g. on shutdown."""
+        self._evict(device=None, keep=0)
+
+    def _evict(self, *, device: str | None, keep: int) -> None:
+        # Evicted pipelines are dropped rather than moved to CPU: a worker still
+        # mid-call holds its own reference and releases it when it finishes.
+        evicted: list[_Entry] = []
+        with self._lock:
+            keys = [key for key in self._entries if device is None or key[1] == device]
+            for key in keys[: max(0, len(keys) - max(0, keep))]:
+                evicted.append(self._entries.pop(key))
+        if not evicted:
+            return
+        for entry in evicted:
+            if entry.on_evict is not None:
+                try:
+                    entry.on_evict()
+                except Exception:  # noqa: BLE001
+                    pass
+        evicted.clear()
+        gc.collect()
+        try:
+            import torch  # type: ignore
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+                torch.cuda.ipc_collect()
+        except Exception:  # noqa: BLE001
+            pass
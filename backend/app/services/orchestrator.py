@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import orjson
+
 from app.config import Settings
 from app.db.repo import Repository
 
@@ -13,6 +15,7 @@ from .copy_gen import CopyGenerator
 from .image_gen import ImageGenerator
 from .inpaint import InpaintService
 from .model_manager import ModelManager
+from .model_registry import ModelRegistry
 from .video_storyboard import StoryboardVideoService
 from .video_t2v import TextToVideoService
 
@@ -25,23 +28,31 @@ class GenerationOrchestrator:
         self.settings = settings
         self.model_manager = model_manager
         self.copy_gen = CopyGenerator(settings.model_path)
-        self.image_gen = ImageGenerator(model_manager)
-        self.inpaint = InpaintService(settings.model_path)
+        self.models = ModelRegistry()
+        self.image_gen = ImageGenerator(model_manager, self.models)
+        self.inpaint = InpaintService(
+            settings.model_path,
+            self.models,
+            torch_compile_enabled=model_manager.torch_compile_enabled,
+        )
         self.storyboard = StoryboardVideoService(self.image_gen, self.model_manager)
         self.t2v = TextToVideoService(self.model_manager, self.storyboard)
+        self._handlers = MappingProxyType(
+            {
+                "copy_generate": self.handle_copy_generate,
+                "image_generate": self.handle_image_generate,
+                "image_inpaint": self.handle_image_inpaint,
+                "video_storyboard": self.handle_video_storyboard,
+                "video_t2v": self.handle_video_t2v,
+            }
+        )
 
-    def handlers(self) -> dict[str, Callable[[dict[str, Any], ProgressFn], Awaitable[dict]]]:
-        return {
-            "copy_generate": self.handle_copy_generate,
-            "image_generate": self.handle_image_generate,
-            "image_inpaint": self.handle_image_inpaint,
-            "video_storyboard": self.handle_video_storyboard,
-            "video_t2v": self.handle_video_t2v,
-        }
+    def handlers(self) -> Mapping[str, Callable[[dict[str, Any], ProgressFn], Awaitable[dict]]]:
+        return self._handlers
 
     async def handle_copy_generate(self, job: dict[str, Any], progress: ProgressFn) -> dict:
         params = job["params"]
-        project = self._require_project(params["project_id"])
+        project, out_dir = await asyncio.to_thread(self._prepare_job, job)
         await progress("copy_generating", 20)
 
         variants = await asyncio.to_thread(
@@ -54,11 +65,10 @@ class GenerationOrchestrator:
         )
         await progress("copy_saving", 80)
 
-        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
-        out_dir.mkdir(parents=True, exist_ok=True)
         copy_path = out_dir / "copy_variants.json"
-        copy_path.write_text(json.dumps(variants, indent=2), encoding="utf-8")
-        asset = self.repo.create_asset(
+        await asyncio.to_thread(self._write_json, copy_path, variants)
+        asset = await asyncio.to_thread(
+            self.repo.create_asset,
             project_id=project["id"],
             job_id=job["id"],
             kind="copy",
@@ -69,10 +79,9 @@ class GenerationOrchestrator:
 
     async def handle_image_generate(self, job: dict[str, Any], progress: ProgressFn) -> dict:
         params = job["params"]
-        project = self._require_project(params["project_id"])
+        project, out_dir = await asyncio.to_thread(self._prepare_job, job)
         await progress("image_generating", 30)
 
-        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
         image_path = out_dir / "image.png"
         metadata = await asyncio.to_thread(
             self.image_gen.generate,
@@ -84,7 +93,8 @@ class GenerationOrchestrator:
             seed=params.get("seed"),
         )
         await progress("image_saving", 85)
-        asset = self.repo.create_asset(
+        asset = await asyncio.to_thread(
+            self.repo.create_asset,
             project_id=project["id"],
             job_id=job["id"],
             kind="image",
@@ -95,23 +105,12 @@ class GenerationOrchestrator:
 
     async def handle_image_inpaint(self, job: dict[str, Any], progress: ProgressFn) -> dict:
         params = job["params"]
-        project = self._require_project(params["project_id"])
-        image_asset = self.repo.get_asset(params["image_asset_id"])
-        mask_asset = self.repo.get_asset(params["mask_asset_id"])
-        if image_asset is None:
-            raise ValueError("image_asset_id was not found.")
-        if mask_asset is None:
-            raise ValueError("mask_asset_id was not found.")
-
+        project, out_dir = await asyncio.to_thread(self._prepare_job, job)
+        image_asset, mask_asset = await asyncio.to_thread(self._require_inpaint_sources, params)
         image_path = Path(image_asset["path"])
         mask_path = Path(mask_asset["path"])
-        if not image_path.exists():
-            raise FileNotFoundError(f"Base image missing: {image_path}")
-        if not mask_path.exists():
-            raise FileNotFoundError(f"Mask image missing: {mask_path}")
 
         await progress("inpaint_editing", 35)
-        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
         out_path = out_dir / "inpaint.png"
         metadata = await asyncio.to_thread(
             self.inpaint.apply,
@@ -123,7 +122,8 @@ class GenerationOrchestrator:
             output_path=out_path,
         )
         await progress("inpaint_saving", 85)
-        asset = self.repo.create_asset(
+        asset = await asyncio.to_thread(
+            self.repo.create_asset,
             project_id=project["id"],
             job_id=job["id"],
             kind="image",
@@ -138,8 +138,7 @@ class GenerationOrchestrator:
 
     async def handle_video_storyboard(self, job: dict[str, Any], progress: ProgressFn) -> dict:
         params = job["params"]
-        project = self._require_project(params["project_id"])
-        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
+        project, out_dir = await asyncio.to_thread(self._prepare_job, job)
 
         await progress("storyboard_planning", 15)
         result = await asyncio.to_thread(
@@ -150,54 +149,21 @@ class GenerationOrchestrator:
         )
         await progress("storyboard_assets", 80)
 
-        asset_ids: list[str] = []
-        for scene_path in result["scene_paths"]:
-            asset = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="image",
-                path=scene_path,
-                meta={"type": "story_scene"},
+        def row(kind: str, path: str, meta: dict) -> dict:
+            return self.repo.new_asset_row(
+                project_id=project["id"], job_id=job["id"], kind=kind, path=path, meta=meta
             )
-            asset_ids.append(asset["id"])
-
-        subtitle = self.repo.create_asset(
-            project_id=project["id"],
-            job_id=job["id"],
-            kind="subtitle",
-            path=result["subtitle_path"],
-            meta={"format": "srt"},
-        )
-        asset_ids.append(subtitle["id"])
-
-        manifest = self.repo.create_asset(
-            project_id=project["id"],
-            job_id=job["id"],
-            kind="meta",
-            path=result["manifest_path"],
-            meta={"format": "json"},
-        )
-        asset_ids.append(manifest["id"])
 
+        rows = [row("image", scene_path, {"type": "story_scene"}) for scene_path in result["scene_paths"]]
+        rows.append(row("subtitle", result["subtitle_path"], {"format": "srt"}))
+        rows.append(row("meta", result["manifest_path"], {"format": "json"}))
         if result["audio_path"]:
-            audio = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="audio",
-                path=result["audio_path"],
-                meta={"format": "wav"},
-            )
-            asset_ids.append(audio["id"])
-
+            rows.append(row("audio", result["audio_path"], {"format": "wav"}))
         if result["video_path"]:
-            video = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="video",
-                path=result["video_path"],
-                meta=result.get("metadata", {}),
-            )
-            asset_ids.append(video["id"])
+            rows.append(row("video", result["video_path"], result.get("metadata", {})))
+        # One transaction for every asset of the job instead of one per file.
+        created = await asyncio.to_thread(self.repo.create_assets_bulk, rows)
+        asset_ids = [asset["id"] for asset in created]
 
         return {
             "asset_ids": asset_ids,
@@ -207,8 +173,7 @@ class GenerationOrchestrator:
 
     async def handle_video_t2v(self, job: dict[str, Any], progress: ProgressFn) -> dict:
         params = job["params"]
-        project = self._require_project(params["project_id"])
-        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
+        project, out_dir = await asyncio.to_thread(self._prepare_job, job)
 
         await progress("t2v_capability_check", 10)
         result = await asyncio.to_thread(
@@ -219,45 +184,27 @@ class GenerationOrchestrator:
         )
         await progress("t2v_assets", 80)
 
-        asset_ids: list[str] = []
-        for scene_path in result.get("scene_paths", []):
-            scene = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="image",
-                path=scene_path,
-                meta={"type": "t2v_fallback_scene"},
+        def row(kind: str, path: str, meta: dict) -> dict:
+            return self.repo.new_asset_row(
+                project_id=project["id"], job_id=job["id"], kind=kind, path=path, meta=meta
             )
-            asset_ids.append(scene["id"])
 
+        t2v_meta = {
+            "t2v_mode": result.get("t2v_mode"),
+            "fallback_used": result.get("fallback_used", True),
+            "capability_reason": result.get("capability_reason"),
+        }
+        rows = [
+            row("image", scene_path, {"type": "t2v_fallback_scene"})
+            for scene_path in result.get("scene_paths", [])
+        ]
         if result.get("video_path"):
-            video = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="video",
-                path=result["video_path"],
-                meta={
-                    "t2v_mode": result.get("t2v_mode"),
-                    "fallback_used": result.get("fallback_used", True),
-                    "capability_reason": result.get("capability_reason"),
-                },
-            )
-            asset_ids.append(video["id"])
-
+            rows.append(row("video", result["video_path"], dict(t2v_meta)))
         manifest = result.get("manifest_path")
         if manifest:
-            meta_asset = self.repo.create_asset(
-                project_id=project["id"],
-                job_id=job["id"],
-                kind="meta",
-                path=manifest,
-                meta={
-                    "t2v_mode": result.get("t2v_mode"),
-                    "fallback_used": result.get("fallback_used", True),
-                    "capability_reason": result.get("capability_reason"),
-                },
-            )
-            asset_ids.append(meta_asset["id"])
+            rows.append(row("meta", manifest, dict(t2v_meta)))
+        created = await asyncio.to_thread(self.repo.create_assets_bulk, rows)
+        asset_ids = [asset["id"] for asset in created]
 
         return {
             "asset_ids": asset_ids,
@@ -266,11 +213,38 @@ class GenerationOrchestrator:
             "video_path": result.get("video_path"),
         }
 
+    def _prepare_job(self, job: dict[str, Any]) -> tuple[dict[str, Any], Path]:
+        """Look up the job's project and create its output folder in one worker hop."""
+        project = self._require_project(job["params"]["project_id"])
+        out_dir = self._job_dir(project_id=project["id"], job_id=job["id"])
+        out_dir.mkdir(parents=True, exist_ok=True)
+        return project, out_dir
+
+    def _require_inpaint_sources(self, params: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Look up the base image and mask assets and check both files exist."""
+        image_asset = self.repo.get_asset(params["image_asset_id"])
+        mask_asset = self.repo.get_asset(params["mask_asset_id"])
+        if image_asset is None:
+            raise ValueError("image_asset_id was not found.")
+        if mask_asset is None:
+            raise ValueError("mask_asset_id was not found.")
+        if not Path(image_asset["path"]).exists():
+            raise FileNotFoundError(f"Base image missing: {image_asset['path']}")
+        if not Path(mask_asset["path"]).exists():
+            raise FileNotFoundError(f"Mask image missing: {mask_asset['path']}")
+        return image_asset, mask_asset
+
     def _require_project(self, project_id: str) -> dict[str, Any]:
         project = self.repo.get_project(project_id)
         if project is None:
             raise ValueError(f"project_id '{project_id}' was not found.")
         return project
 
+    @staticmethod
+    def _write_json(path: Path, value: Any) -> None:
+        # Compact orjson: manifests are read by clients, not people.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(value))
+
     def _job_dir(self, *, project_id: str, job_id: str) -> Path:
         return self.settings.projects_dir / project_id / "jobs" / job_id
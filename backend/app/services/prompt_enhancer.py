@@ -3,6 +3,8 @@ from __future__ import annotations
 import re
 from typing import Any
 
+_WS = re.compile(r"\s+")
+
 
 class PromptEnhancer:
     _NEGATIVE_COMMON = [
@@ -23,6 +25,9 @@ class PromptEnhancer:
         "logo",
         "jpeg artifacts",
     ]
+    # The negative prompts only vary by mode; join them once.
+    _NEG_DRAFT = ", ".join(_NEGATIVE_COMMON)
+    _NEG_HQ = _NEG_DRAFT + ", oversaturated colors, harsh posterization, banding"
 
     def improve(
         self,
@@ -32,7 +37,8 @@ class PromptEnhancer:
         platform: str,
         mode: str,
     ) -> dict[str, Any]:
-        cleaned_prompt = self._clean(prompt)
+        # Whitespace runs are collapsed once, on the joined prompt below.
+        cleaned_prompt = prompt.strip()
         if not cleaned_prompt:
             cleaned_prompt = (
                 f"{project['product']} hero shot for {project['brand_name']} ad campaign"
@@ -67,10 +73,7 @@ class PromptEnhancer:
         improved_prompt = ", ".join(prompt_parts)
         improved_prompt = self._limit(improved_prompt, 400)
 
-        negative_prompt = ", ".join(self._NEGATIVE_COMMON)
-        if mode == "hq":
-            negative_prompt += ", oversaturated colors, harsh posterization, banding"
-        negative_prompt = self._limit(negative_prompt, 400)
+        negative_prompt = self._truncate(self._NEG_HQ if mode == "hq" else self._NEG_DRAFT, 400)
 
         return {
             "prompt": improved_prompt,
@@ -82,22 +85,27 @@ class PromptEnhancer:
             ],
         }
 
-    @staticmethod
-    def _composition(platform: str) -> str:
-        if platform == "9:16":
-            return "vertical 9:16 frame, centered subject, negative space near top for headline"
-        if platform == "4:5":
-            return "portrait 4:5 frame, centered subject, breathing room around product"
-        return "square 1:1 frame, balanced centered product composition"
+    _COMPOSITIONS = {
+        "9:16": "vertical 9:16 frame, centered subject, negative space near top for headline",
+        "4:5": "portrait 4:5 frame, centered subject, breathing room around product",
+    }
+    _DEFAULT_COMPOSITION = "square 1:1 frame, balanced centered product composition"
+
+    @classmethod
+    def _composition(cls, platform: str) -> str:
+        return cls._COMPOSITIONS.get(platform, cls._DEFAULT_COMPOSITION)
 
     @staticmethod
     def _clean(text: str) -> str:
-        compact = re.sub(r"\s+", " ", text).strip()
-        return compact
+        return _WS.sub(" ", text).strip()
+
+    @classmethod
+    def _limit(cls, text: str, max_len: int) -> str:
+        return cls._truncate(cls._clean(text), max_len)
 
     @staticmethod
-    def _limit(text: str, max_len: int) -> str:
-        compact = re.sub(r"\s+", " ", text).strip()
+    def _truncate(compact: str, max_len: int) -> str:
+        """``_limit`` for text that is already whitespace-clean."""
         if len(compact) <= max_len:
             return compact
         clipped = compact[:max_len].rstrip(",;: ")
@@ -1,12 +1,144 @@
 from __future__ import annotations
 
-import json
 import math
+import subprocess
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from .image_gen import ImageGenerator
-from .model_manager import ModelManager
+from .model_manager import VAAPI_DEVICE, ModelManager
+
+# A 60s HQ render finishes well inside this; a hung encoder shouldn't hold a job slot.
+_FFMPEG_TIMEOUT_SEC = 600
+# Output flags per H.264 encoder ModelManager.video_encoder() can pick.
+_ENCODER_ARGS: dict[str, list[str]] = {
+    "libx264": ["-preset", "veryfast", "-pix_fmt", "yuv420p", "-threads", "0"],
+    "h264_nvenc": ["-preset", "p4", "-tune", "hq", "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-preset", "veryfast", "-pix_fmt", "nv12"],
+    "h264_vaapi": ["-vf", "format=nv12,hwupload"],
+}
+
+
+def encode_image_sequence(
+    *,
+    ffmpeg_exe: str,
+    image_paths: list[Path],
+    seconds_per_image: float,
+    output_path: Path,
+    fps: int,
+    audio_path: Path | None = None,
+    stills: bool = True,
+    encoder: str = "libx264",
+) -> Path | None:
+    """Encode ``image_paths`` to H.264 with one ffmpeg call through the concat demuxer.
+
+    Frames never pass through Python, unlike moviepy's decode/re-encode loop.
+    A hardware ``encoder`` that fails is retried once with libx264. Returns
+    ``output_path``, or None when ffmpeg fails.
+    """
+    if not image_paths:
+        return None
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    list_path = output_path.with_suffix(".ffconcat")
+    lines = ["ffconcat version 1.0"]
+    for path in image_paths:
+        quoted = str(path.resolve()).replace("'", "'\\''")
+        lines.extend([f"file '{quoted}'", f"duration {seconds_per_image:.6f}"])
+    # The demuxer ignores the last entry's duration unless the file is repeated.
+    lines.append(lines[-2])
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    total_sec = seconds_per_image * len(image_paths)
+    try:
+        for codec in _codec_candidates(encoder):
+            cmd = [ffmpeg_exe, "-y", "-hide_banner", "-loglevel", "error", *_device_args(codec)]
+            cmd += ["-f", "concat", "-safe", "0", "-i", str(list_path)]
+            if audio_path is not None and audio_path.exists():
+                cmd += ["-i", str(audio_path), "-c:a", "aac"]
+            cmd += ["-c:v", codec, *_ENCODER_ARGS[codec]]
+            if stills and codec == "libx264":
+                # Held scenes need no motion search; this keeps libx264 cheap.
+                cmd += ["-tune", "stillimage"]
+            # -t rather than -shortest: like moviepy, a short voiceover doesn't cut the video.
+            cmd += ["-r", str(fps), "-t", f"{total_sec:.3f}", str(output_path)]
+            try:
+                completed = subprocess.run(cmd, capture_output=True, timeout=_FFMPEG_TIMEOUT_SEC, check=False)
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if completed.returncode == 0 and output_path.exists():
+                return output_path
+    finally:
+        list_path.unlink(missing_ok=True)
+    return None
+
+
+def encode_raw_frames(
+    *,
+    ffmpeg_exe: str,
+    frames: list[Any],
+    output_path: Path,
+    fps: int,
+    encoder: str = "libx264",
+) -> Path | None:
+    """Pipe in-memory PIL frames to ffmpeg as raw RGB, skipping any image files.
+
+    Same encoder handling and return value as :func:`encode_image_sequence`.
+    """
+    if not frames:
+        return None
+    rgb = [frame if frame.mode == "RGB" else frame.convert("RGB") for frame in frames]
+    width, height = rgb[0].size
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    for codec in _codec_candidates(encoder):
+        cmd = [ffmpeg_exe, "-y", "-hide_banner", "-loglevel", "error", *_device_args(codec)]
+        cmd += ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+        cmd += ["-c:v", codec, *_ENCODER_ARGS[codec], str(output_path)]
+        try:
+            proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            continue
+        try:
+            assert proc.stdin is not None
+            for frame in rgb:
+                proc.stdin.write(frame.tobytes())
+            proc.stdin.close()
+            returncode = proc.wait(timeout=_FFMPEG_TIMEOUT_SEC)
+        except (OSError, subprocess.SubprocessError):
+            proc.kill()
+            proc.wait()
+            continue
+        if returncode == 0 and output_path.exists():
+            return output_path
+    return None
+
+
+_TTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _tts_engine() -> Any | None:
+    """One pyttsx3 engine for the process; starting the native driver is slow."""
+    try:
+        import pyttsx3  # type: ignore
+
+        return pyttsx3.init()
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _codec_candidates(encoder: str) -> list[str]:
+    # A hardware encoder that fails falls back to libx264 once.
+    return list(dict.fromkeys([encoder if encoder in _ENCODER_ARGS else "libx264", "libx264"]))
+
+
+def _device_args(codec: str) -> list[str]:
+    return ["-vaapi_device", VAAPI_DEVICE] if codec == "h264_vaapi" else []
 
 
 class StoryboardVideoService:
@@ -32,18 +164,16 @@ class StoryboardVideoService:
         mode = params.get("mode", "draft")
 
         prompts = self._scene_prompts(project=project, style_prompt=style_prompt, count=scene_count)
-        scene_paths: list[Path] = []
-        for idx, prompt in enumerate(prompts):
-            scene_path = scene_dir / f"scene_{idx + 1:02d}.png"
-            self.image_generator.generate(
-                prompt=prompt,
-                negative_prompt="",
-                platform=platform,
-                mode=mode,
-                output_path=scene_path,
-                seed=idx + 11,
-            )
-            scene_paths.append(scene_path)
+        scene_paths = [scene_dir / f"scene_{idx + 1:02d}.png" for idx in range(len(prompts))]
+        # Scenes share platform and mode, so they render as batched pipeline calls.
+        self.image_generator.generate_many(
+            prompts=prompts,
+            negative_prompt="",
+            platform=platform,
+            mode=mode,
+            output_paths=scene_paths,
+            seeds=[idx + 11 for idx in range(len(prompts))],
+        )
 
         narration = self._build_script(project=project, scene_count=scene_count)
         narration_path = output_dir / "narration.txt"
@@ -72,8 +202,9 @@ class StoryboardVideoService:
             "video_rendered": video_path is not None,
         }
         manifest_path = output_dir / "storyboard_manifest.json"
-        manifest_path.write_text(
-            json.dumps(
+        # Compact JSON: the manifest is machine-read; narration and SRT stay human-readable.
+        manifest_path.write_bytes(
+            orjson.dumps(
                 {
                     "prompts": prompts,
                     "narration_path": str(narration_path),
@@ -81,10 +212,8 @@ class StoryboardVideoService:
                     "audio_path": str(audio_path) if audio_path else None,
                     "video_path": str(video_path) if video_path else None,
                     "metadata": metadata,
-                },
-                indent=2,
-            ),
-            encoding="utf-8",
+                }
+            )
         )
 
         return {
@@ -146,24 +275,55 @@ class StoryboardVideoService:
 
     @staticmethod
     def _try_generate_tts_wav(script: str, out_path: Path) -> Path | None:
-        try:
-            import pyttsx3  # type: ignore
-        except Exception:  # noqa: BLE001
-            return None
-
-        try:
-            engine = pyttsx3.init()
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            engine.save_to_file(script, str(out_path))
-            engine.runAndWait()
+        # The driver isn't reentrant, so concurrent jobs take turns on one engine.
+        with _TTS_LOCK:
+            engine = _tts_engine()
+            if engine is None:
+                return None
+            try:
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                engine.save_to_file(script, str(out_path))
+                engine.runAndWait()
+            except Exception:  # noqa: BLE001
+                # A wedged driver is rebuilt on the next call rather than reused.
+                _tts_engine.cache_clear()
+                return None
             if out_path.exists() and out_path.stat().st_size > 0:
                 return out_path
-        except Exception:  # noqa: BLE001
-            return None
         return None
 
-    @staticmethod
     def _try_render_video(
+        self,
+        *,
+        scene_paths: list[Path],
+        output_path: Path,
+        duration_sec: int,
+        audio_path: Path | None,
+    ) -> Path | None:
+        if not scene_paths:
+            return None
+        ffmpeg_exe = self.model_manager.ffmpeg_exe()
+        if ffmpeg_exe is not None:
+            rendered = encode_image_sequence(
+                ffmpeg_exe=ffmpeg_exe,
+                image_paths=scene_paths,
+                seconds_per_image=max(1, duration_sec / len(scene_paths)),
+                output_path=output_path,
+                fps=24,
+                audio_path=audio_path,
+                encoder=self.model_manager.video_encoder(),
+            )
+            if rendered is not None:
+                return rendered
+        return self._render_with_moviepy(
+            scene_paths=scene_paths,
+            output_path=output_path,
+            duration_sec=duration_sec,
+            audio_path=audio_path,
+        )
+
+    @staticmethod
+    def _render_with_moviepy(
         *,
         scene_paths: list[Path],
         output_path: Path,
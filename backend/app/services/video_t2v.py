@@ -1,16 +1,107 @@
 from __future__ import annotations
 
+import importlib.util
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from .model_manager import ModelManager
-from .video_storyboard import StoryboardVideoService
+from .image_gen import ImageGenerator
+from .model_manager import ModelManager, find_model_index_dir
+from .video_storyboard import StoryboardVideoService, encode_raw_frames
+
+# Accumulated relative input change under which a denoiser step is skipped.
+DEFAULT_CACHE_THRESHOLD = 0.15
+# At most 24 frames per clip; a few encoder threads is enough to saturate disk.
+FRAME_SAVE_WORKERS = min(8, os.cpu_count() or 1)
+# diffusers First Block Cache thresholds; draft trades more reuse for speed.
+FIRST_BLOCK_CACHE_THRESHOLDS: dict[str, float] = {"draft": 0.2, "hq": 0.05}
 
 
 class CapabilityError(RuntimeError):
     pass
 
 
+class _DenoiserStepCache:
+    """TeaCache-style step skipping wrapped around a video denoiser's ``forward``.
+
+    Each call compares the latent input with the one last fully computed, summing
+    the relative L1 change; while the sum stays under ``threshold`` the previous
+    output is returned instead of running the network. A new ``timestep`` starts a
+    new step, and calls within a step are told apart by their order, so pipelines
+    that call the denoiser separately for the conditional and unconditional
+    branches never reuse one branch's output for the other. The first and last
+    step of a run always execute. The state belongs to one run at a time; callers
+    serialize use of the pipeline around ``reset``.
+    """
+
+    def __init__(self, module: Any):
+        self._forward = module.forward
+        self.threshold = 0.0
+        self.num_steps = 0
+        self.skipped = 0
+        self._timestep: float | None = None
+        self._step = -1
+        self._call = 0
+        self._branches: list[dict[str, Any]] = []
+        module.forward = self
+
+    def reset(self, *, threshold: float, num_steps: int) -> None:
+        self.threshold = max(0.0, float(threshold))
+        self.num_steps = num_steps
+        self.skipped = 0
+        self._timestep = None
+        self._step = -1
+        self._call = 0
+        self._branches.clear()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        sample = kwargs.get("hidden_states", kwargs.get("sample"))
+        if sample is None and args:
+            sample = args[0]
+        timestep = self._timestep_value(kwargs.get("timestep", args[1] if len(args) > 1 else None))
+        if self.threshold <= 0 or sample is None or timestep is None:
+            return self._forward(*args, **kwargs)
+
+        if timestep != self._timestep:
+            self._timestep = timestep
+            self._step += 1
+            self._call = 0
+        index = self._call
+        self._call += 1
+        if index == len(self._branches):
+            self._branches.append({"accumulated": 0.0, "input": None, "output": None})
+        branch = self._branches[index]
+        previous = branch["input"]
+        if (
+            previous is not None
+            and 0 < self._step < self.num_steps - 1
+            and getattr(previous, "shape", None) == getattr(sample, "shape", None)
+        ):
+            try:
+                change = (sample - previous).abs().mean() / previous.abs().mean().clamp_min(1e-6)
+                branch["accumulated"] += float(change)
+            except Exception:  # noqa: BLE001
+                branch["accumulated"] = self.threshold
+            if branch["accumulated"] < self.threshold:
+                self.skipped += 1
+                return branch["output"]
+
+        output = self._forward(*args, **kwargs)
+        branch.update(accumulated=0.0, input=sample, output=output)
+        return output
+
+    @staticmethod
+    def _timestep_value(timestep: Any) -> float | None:
+        if timestep is None:
+            return None
+        try:
+            return float(timestep.reshape(-1)[0] if hasattr(timestep, "reshape") else timestep)
+        except Exception:  # noqa: BLE001
+            return None
+
+
 class TextToVideoService:
     def __init__(
         self,
@@ -19,8 +110,15 @@ class TextToVideoService:
     ):
         self.model_manager = model_manager
         self.storyboard_service = storyboard_service
-        self._video_pipeline = None
+        # Keyed by (model_dir, device, dtype) so warm workers skip from_pretrained.
+        self._video_pipelines: dict[tuple[str, str, str], Any] = {}
         self._video_device = "cpu"
+        self._video_offload = "none"
+        self._video_quantization = "none"
+        self._step_caches: dict[int, _DenoiserStepCache] = {}
+        # One run per cached pipeline at a time: its scheduler and step cache are shared.
+        self._run_locks: dict[int, threading.Lock] = {}
+        self._load_lock = threading.Lock()
 
     def generate_or_fallback(
         self,
@@ -70,84 +168,276 @@ class TextToVideoService:
         steps = 8 if mode == "draft" else 14
         num_frames = max(8, min(24, duration_sec * (2 if mode == "draft" else 3)))
 
-        try:
-            result = pipeline(
+        with self._run_locks.setdefault(id(pipeline), threading.Lock()):
+            frames, cache_mode, cache_threshold, skipped_steps = self._run_video_pipeline(
+                pipeline,
                 prompt=prompt,
-                num_inference_steps=steps,
+                mode=mode,
+                steps=steps,
                 num_frames=num_frames,
+                cache_threshold=params.get("cache_threshold"),
             )
-            frames = result.frames[0] if isinstance(result.frames, list) else result.frames
-            if not frames:
-                return None
-        except Exception:  # noqa: BLE001
+        if frames is None:
             return None
 
-        frames_dir = output_dir / "t2v_frames"
-        frames_dir.mkdir(parents=True, exist_ok=True)
+        fps = max(4, round(len(frames) / max(1, duration_sec)))
+        output_path = output_dir / "t2v.mp4"
+        ffmpeg_exe = self.model_manager.ffmpeg_exe()
+        video_path = None
+        if ffmpeg_exe is not None:
+            video_path = encode_raw_frames(
+                ffmpeg_exe=ffmpeg_exe,
+                frames=frames,
+                output_path=output_path,
+                fps=fps,
+                encoder=self.model_manager.video_encoder(),
+            )
+
         frame_paths: list[Path] = []
-        for idx, frame in enumerate(frames):
-            frame_path = frames_dir / f"frame_{idx:03d}.png"
-            frame.save(frame_path, format="PNG")
-            frame_paths.append(frame_path)
-
-        video_path = self._render_video_from_frames(
-            frame_paths=frame_paths,
-            output_path=output_dir / "t2v.mp4",
-            duration_sec=duration_sec,
-        )
+        if video_path is None or params.get("keep_frames"):
+            frames_dir = output_dir / "t2v_frames"
+            frames_dir.mkdir(parents=True, exist_ok=True)
+            frame_paths = [frames_dir / f"frame_{idx:03d}.jpg" for idx in range(len(frames))]
+            # Intermediate frames are re-encoded to H.264 right away, so JPEG is
+            # plenty; Pillow's encoder drops the GIL, so frames save in parallel.
+            with ThreadPoolExecutor(max_workers=min(FRAME_SAVE_WORKERS, len(frames))) as pool:
+                list(pool.map(self._save_frame, frames, frame_paths))
+        if video_path is None:
+            # ffmpeg already failed on the in-memory frames; only moviepy is left.
+            video_path = self._render_video_from_frames(
+                frame_paths=frame_paths,
+                output_path=output_path,
+                fps=fps,
+            )
         if video_path is None:
             return None
 
         return {
             "video_path": str(video_path),
             "frame_paths": [str(path) for path in frame_paths],
-            "frame_count": len(frame_paths),
+            "frame_count": len(frames),
             "device": self._video_device,
+            "offload": self._video_offload,
+            "quantization": self._video_quantization,
+            "cache": cache_mode,
+            "cache_threshold": cache_threshold,
+            "cached_steps": skipped_steps,
             "model_dir": str(model_dir),
         }
 
+    def _run_video_pipeline(
+        self,
+        pipeline: Any,
+        *,
+        prompt: str,
+        mode: str,
+        steps: int,
+        num_frames: int,
+        cache_threshold: float | None,
+    ) -> tuple[Any, str, float, int]:
+        """Set up step caching and run ``pipeline``; frames are None when the run failed."""
+        step_cache = self._step_caches.get(id(pipeline))
+        # First Block Cache when this diffusers has it; the input-delta cache otherwise.
+        fbc_threshold = (
+            FIRST_BLOCK_CACHE_THRESHOLDS.get(mode, FIRST_BLOCK_CACHE_THRESHOLDS["draft"])
+            if cache_threshold is None
+            else cache_threshold
+        )
+        if self._apply_first_block_cache(pipeline, threshold=fbc_threshold):
+            cache_mode, cache_threshold = ("first_block" if fbc_threshold > 0 else "none"), fbc_threshold
+            step_cache = None
+        elif step_cache is not None:
+            if cache_threshold is None:
+                cache_threshold = DEFAULT_CACHE_THRESHOLD
+            cache_mode = "step" if cache_threshold > 0 else "none"
+            step_cache.reset(threshold=cache_threshold, num_steps=steps)
+        else:
+            cache_mode, cache_threshold = "none", 0.0
+
+        try:
+            import torch  # type: ignore
+
+            # inference_mode also skips the version-counter bookkeeping no_grad keeps.
+            with torch.inference_mode():
+                result = pipeline(
+                    prompt=prompt,
+                    num_inference_steps=steps,
+                    num_frames=num_frames,
+                )
+            frames = result.frames[0] if isinstance(result.frames, list) else result.frames
+            if not frames:
+                frames = None
+        except Exception:  # noqa: BLE001
+            frames = None
+        finally:
+            skipped_steps = step_cache.skipped if step_cache is not None else 0
+            if step_cache is not None:
+                # Drop the cached latents between jobs.
+                step_cache.reset(threshold=0.0, num_steps=0)
+        return frames, cache_mode, cache_threshold, skipped_steps
+
     def _discover_video_model_dir(self) -> Path | None:
-        root = self.model_manager.settings.model_path / "video"
-        if not root.exists():
-            return None
-        if (root / "model_index.json").exists():
-            return root
-        for candidate in sorted(root.iterdir()):
-            if candidate.is_dir() and (candidate / "model_index.json").exists():
-                return candidate
-        return None
+        # Same walk as has_local_video_model, so capability and discovery agree.
+        return find_model_index_dir(self.model_manager.settings.model_path / "video")
 
     def _get_video_pipeline(self, model_dir: Path):
-        if self._video_pipeline is not None:
-            return self._video_pipeline
         try:
+            import torch  # type: ignore
             from diffusers import DiffusionPipeline  # type: ignore
         except Exception:  # noqa: BLE001
             return None
 
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        torch_dtype = torch.float32
+        if device == "cuda":
+            torch_dtype = torch.bfloat16 if ImageGenerator._bf16_supported(torch) else torch.float16
+        key = (str(model_dir), device, str(torch_dtype))
+        cached = self._video_pipelines.get(key)
+        if cached is not None:
+            return cached
+
+        # Jobs run through asyncio.to_thread, so two workers can race the first load.
+        with self._load_lock:
+            cached = self._video_pipelines.get(key)
+            if cached is not None:
+                return cached
+            try:
+                pipe = DiffusionPipeline.from_pretrained(
+                    str(model_dir),
+                    torch_dtype=torch_dtype,
+                    local_files_only=True,
+                )
+                # Model CPU offload when the weights don't fit next to the activations.
+                self._video_offload = ImageGenerator._place_pipeline(pipe=pipe, torch=torch, device=device)
+                self._video_quantization = "none"
+                if self._video_offload == "none":
+                    # Offload hooks move weights per call, which quantized modules don't survive.
+                    self._video_quantization = self._quantize_denoiser(
+                        pipe, torch=torch, device=device, mode=self.model_manager.quantize_mode()
+                    )
+                if (
+                    device == "cuda"
+                    and self._video_offload == "none"
+                    and self.model_manager.torch_compile_enabled()
+                ):
+                    self._compile_denoiser(pipe, torch=torch)
+                pipe.set_progress_bar_config(disable=True)
+            except Exception:  # noqa: BLE001
+                return None
+            denoiser = getattr(pipe, "transformer", None) or getattr(pipe, "unet", None)
+            if denoiser is not None:
+                try:
+                    self._step_caches[id(pipe)] = _DenoiserStepCache(denoiser)
+                except Exception:  # noqa: BLE001
+                    pass
+            self._video_device = device
+            self._video_pipelines[key] = pipe
+            return pipe
+
+    def clear_video_pipeline_cache(self) -> None:
+        """Drop every cached video pipeline so its VRAM can be reclaimed."""
+        with self._load_lock:
+            self._video_pipelines.clear()
+            self._step_caches.clear()
+            self._run_locks.clear()
         try:
             import torch  # type: ignore
 
-            self._video_device = "cuda" if torch.cuda.is_available() else "cpu"
-            torch_dtype = torch.float16 if self._video_device == "cuda" else torch.float32
-            pipe = DiffusionPipeline.from_pretrained(
-                str(model_dir),
-                torch_dtype=torch_dtype,
-                local_files_only=True,
-            )
-            pipe.to(self._video_device)
-            pipe.set_progress_bar_config(disable=True)
-            self._video_pipeline = pipe
-            return self._video_pipeline
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
         except Exception:  # noqa: BLE001
-            return None
+            pass
+
+    @staticmethod
+    def _quantize_denoiser(pipe: Any, *, torch: Any, device: str, mode: str) -> str:
+        """Quantize the transformer/UNet per ``CLIPPER_QUANTIZE``; returns what was applied.
+
+        CPU gets dynamic int8 Linear layers (bandwidth-bound, so halving weight
+        bytes pays directly). On CUDA, "int8" uses optimum-quanto and "fp8" uses
+        torchao's float8 kernels, which need compute capability 8.9+.
+        """
+        denoiser = getattr(pipe, "transformer", None) or getattr(pipe, "unet", None)
+        if denoiser is None or mode not in {"int8", "fp8"}:
+            return "none"
+        try:
+            if device == "cpu":
+                torch.ao.quantization.quantize_dynamic(
+                    denoiser, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+                return "int8_dynamic"
+            if mode == "fp8":
+                if torch.cuda.get_device_capability() < (8, 9):
+                    return "none"
+                from torchao.quantization import (  # type: ignore
+                    float8_dynamic_activation_float8_weight,
+                    quantize_,
+                )
+
+                quantize_(denoiser, float8_dynamic_activation_float8_weight())
+                return "fp8"
+            from optimum.quanto import freeze, qint8, quantize  # type: ignore
+
+            quantize(denoiser, weights=qint8)
+            freeze(denoiser)
+            return "int8"
+        except Exception:  # noqa: BLE001
+            return "none"
+
+    @staticmethod
+    def _compile_denoiser(pipe: Any, *, torch: Any) -> None:
+        # Same policy as ImageGenerator._compile_unet: skip without triton, one
+        # static CUDA graph per frame count/resolution instead of dynamic shapes.
+        name = "transformer" if getattr(pipe, "transformer", None) is not None else "unet"
+        denoiser = getattr(pipe, name, None)
+        compile_fn = getattr(torch, "compile", None)
+        if denoiser is None or not callable(compile_fn) or importlib.util.find_spec("triton") is None:
+            return
+        try:
+            setattr(pipe, name, compile_fn(denoiser, mode="reduce-overhead", fullgraph=False, dynamic=False))
+        except Exception:  # noqa: BLE001
+            pass
+
+    @staticmethod
+    def _save_frame(frame: Any, path: Path) -> None:
+        if frame.mode not in {"RGB", "L"}:
+            frame = frame.convert("RGB")
+        frame.save(path, format="JPEG", quality=92)
+
+    @staticmethod
+    def _apply_first_block_cache(pipe: Any, *, threshold: float) -> bool:
+        """(Re)configure diffusers' First Block Cache on ``pipe.transformer``.
+
+        Returns False when the model or the installed diffusers lacks cache hooks.
+        The pipeline is shared across jobs, so the hook is swapped per call to
+        follow the requested mode.
+        """
+        transformer = getattr(pipe, "transformer", None)
+        # Swapping hooks under torch.compile forces a recompile every job; the
+        # step cache wraps the compiled module from outside instead.
+        if hasattr(transformer, "_orig_mod"):
+            return False
+        enable_cache = getattr(transformer, "enable_cache", None)
+        if not callable(enable_cache):
+            return False
+        try:
+            from diffusers.hooks import FirstBlockCacheConfig  # type: ignore
+        except Exception:  # noqa: BLE001
+            return False
+        try:
+            if getattr(transformer, "is_cache_enabled", False):
+                transformer.disable_cache()
+            if threshold > 0:
+                enable_cache(FirstBlockCacheConfig(threshold=threshold))
+            return True
+        except Exception:  # noqa: BLE001
+            return False
 
     @staticmethod
     def _render_video_from_frames(
         *,
         frame_paths: list[Path],
         output_path: Path,
-        duration_sec: int,
+        fps: int,
     ) -> Path | None:
         if not frame_paths:
             return None
@@ -156,7 +446,6 @@ class TextToVideoService:
         except Exception:  # noqa: BLE001
             return None
 
-        fps = max(4, round(len(frame_paths) / max(1, duration_sec)))
         output_path.parent.mkdir(parents=True, exist_ok=True)
         try:
             clip = ImageSequenceClip([str(path) for path in frame_paths], fps=fps)
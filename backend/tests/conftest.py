@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import os
+import uuid
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import Settings
+from app.db.models import ProjectRow
+from app.db.repo import Repository
+from app.services.copy_gen import CopyGenerator
+from app.services.prompt_enhancer import PromptEnhancer
 
-@pytest.fixture()
-def client(tmp_path: Path) -> TestClient:
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory: pytest.TempPathFactory) -> TestClient:
+    # One app boot (DB init, repo wiring, model probes) for the whole session;
+    # API tests create their own projects, so they don't need a fresh database.
+    tmp_path = tmp_path_factory.mktemp("clipper")
     os.environ["CLIPPER_DATA_DIR"] = str(tmp_path / "data")
     os.environ["CLIPPER_DB_PATH"] = str(tmp_path / "data" / "app.db")
     os.environ["CLIPPER_PROJECTS_DIR"] = str(tmp_path / "data" / "projects")
@@ -21,3 +32,67 @@ def client(tmp_path: Path) -> TestClient:
     with TestClient(app) as test_client:
         yield test_client
 
+
+@pytest.fixture(scope="session")
+def copy_gen() -> CopyGenerator:
+    # Without a model root it never loads llama.cpp, so one instance is safe to share.
+    return CopyGenerator()
+
+
+@pytest.fixture(scope="session")
+def prompt_enhancer() -> PromptEnhancer:
+    return PromptEnhancer()
+
+
+@pytest.fixture()
+def repo() -> Iterator[Repository]:
+    # A uniquely named in-memory DB per test: no files or fsyncs, and nothing to
+    # roll back. Shared-cache memory DBs fail fast on lock contention instead of
+    # honouring busy_timeout, so tests that write from many threads keep tmp_path.
+    memory_repo = Repository(f"file:clipper-{uuid.uuid4().hex}?mode=memory&cache=shared")
+    memory_repo.init_db()
+    yield memory_repo
+    memory_repo.close()
+
+
+@pytest.fixture()
+def disk_repo(tmp_path: Path) -> Iterator[Repository]:
+    file_repo = Repository(tmp_path / "app.db")
+    file_repo.init_db()
+    yield file_repo
+    file_repo.close()
+
+
+def _create_project(repo: Repository) -> ProjectRow:
+    return repo.create_project(
+        name="p",
+        brand_name="b",
+        product="prod",
+        audience="aud",
+        offer="off",
+        tone="tone",
+        platform_targets=["9:16"],
+    )
+
+
+@pytest.fixture()
+def project(repo: Repository) -> ProjectRow:
+    return _create_project(repo)
+
+
+@pytest.fixture()
+def disk_project(disk_repo: Repository) -> ProjectRow:
+    return _create_project(disk_repo)
+
+
+@pytest.fixture()
+def settings(tmp_path: Path) -> Settings:
+    return Settings(
+        model_path=tmp_path / "models",
+        data_dir=tmp_path / "data",
+        db_path=tmp_path / "data" / "app.db",
+        projects_dir=tmp_path / "data" / "projects",
+        exports_dir=tmp_path / "data" / "exports",
+        max_concurrent_jobs=1,
+        default_language="en",
+    )
@@ -1,21 +1,59 @@
 from __future__ import annotations
 
+import io
+import json
 import time
-from pathlib import Path
 
 from fastapi.testclient import TestClient
+from PIL import Image
 
 
-def _wait_for_job(client: TestClient, job_id: str, timeout_sec: int = 60) -> dict:
-    deadline = time.time() + timeout_sec
-    while time.time() < deadline:
-        response = client.get(f"/api/v1/jobs/{job_id}")
-        body = response.json()
-        status = body["data"]["job"]["status"]
-        if status in {"done", "error", "cancelled"}:
-            return body
-        time.sleep(0.4)
-    raise TimeoutError(f"job {job_id} did not finish in {timeout_sec}s")
+def _render_white_mask() -> bytes:
+    buf = io.BytesIO()
+    Image.new("L", (540, 540), color=255).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+_WHITE_MASK_PNG = _render_white_mask()
+
+
+def _create_project(client: TestClient, name: str) -> str:
+    response = client.post(
+        "/api/v1/projects",
+        json={
+            "name": name,
+            "brand_name": "Northline",
+            "product": "Smart Bottle",
+            "audience": "runners",
+            "offer": "10% off",
+            "tone": "calm",
+        },
+    )
+    return response.json()["data"]["project_id"]
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout_sec: float = 60) -> dict:
+    response = client.get(f"/api/v1/jobs/{job_id}", params={"wait": "terminal", "timeout": timeout_sec})
+    body = response.json()
+    if body["data"]["job"]["status"] not in {"done", "error", "cancelled"}:
+        raise TimeoutError(f"job {job_id} did not finish in {timeout_sec}s")
+    return body
+
+
+def _wait_for_jobs(client: TestClient, job_ids: list[str], timeout_sec: int = 60) -> dict[str, dict]:
+    """Bulk-fetch the jobs, long-polling one still-active job between fetches."""
+    deadline = time.monotonic() + timeout_sec
+    while True:
+        response = client.post("/api/v1/jobs/status/bulk", json={"job_ids": job_ids})
+        jobs = {job["id"]: job for job in response.json()["data"]["jobs"]}
+        pending = [job_id for job_id in job_ids if jobs[job_id]["status"] not in {"done", "error", "cancelled"}]
+        if not pending:
+            return jobs
+        # Each long-poll only gets what's left of the overall budget.
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"jobs {pending} did not finish in {timeout_sec}s")
+        _wait_for_job(client, pending[0], remaining)
 
 
 def test_contract_and_core_pipeline(client: TestClient) -> None:
@@ -70,8 +108,6 @@ def test_contract_and_core_pipeline(client: TestClient) -> None:
     )
     assert copy_job_resp.status_code == 200
     copy_job_id = copy_job_resp.json()["data"]["job_id"]
-    copy_result = _wait_for_job(client, copy_job_id)
-    assert copy_result["data"]["job"]["status"] == "done"
 
     image_job_resp = client.post(
         "/api/v1/images/generate",
@@ -85,26 +121,23 @@ def test_contract_and_core_pipeline(client: TestClient) -> None:
     )
     assert image_job_resp.status_code == 200
     image_job_id = image_job_resp.json()["data"]["job_id"]
-    image_result = _wait_for_job(client, image_job_id)
-    assert image_result["data"]["job"]["status"] == "done"
+
+    finished = _wait_for_jobs(client, [copy_job_id, image_job_id])
+    assert finished[copy_job_id]["status"] == "done"
+    assert finished[image_job_id]["status"] == "done"
+    image_result = client.get(f"/api/v1/jobs/{image_job_id}").json()
     image_asset_id = image_result["data"]["assets"][0]["id"]
     image_meta = image_result["data"]["assets"][0]["meta"]
     assert "model_key" in image_meta
     assert "scheduler" in image_meta
     assert "retry_count" in image_meta
 
-    # Create a simple white mask image and upload.
-    from PIL import Image
-
-    mask_file = Path(client.app.state.settings.projects_dir) / project_id / "test_mask.png"
-    mask_file.parent.mkdir(parents=True, exist_ok=True)
-    Image.new("L", (540, 540), color=255).save(mask_file, format="PNG")
-    with mask_file.open("rb") as fh:
-        mask_upload = client.post(
-            "/api/v1/assets/upload",
-            files={"file": ("mask.png", fh, "image/png")},
-            data={"project_id": project_id, "kind": "mask"},
-        )
+    # Upload a simple white mask image.
+    mask_upload = client.post(
+        "/api/v1/assets/upload",
+        files={"file": ("mask.png", _WHITE_MASK_PNG, "image/png")},
+        data={"project_id": project_id, "kind": "mask"},
+    )
     assert mask_upload.status_code == 200
     mask_asset_id = mask_upload.json()["data"]["asset_id"]
 
@@ -121,8 +154,6 @@ def test_contract_and_core_pipeline(client: TestClient) -> None:
     )
     assert inpaint_resp.status_code == 200
     inpaint_job_id = inpaint_resp.json()["data"]["job_id"]
-    inpaint_result = _wait_for_job(client, inpaint_job_id)
-    assert inpaint_result["data"]["job"]["status"] == "done"
 
     video_resp = client.post(
         "/api/v1/videos/generate-storyboard",
@@ -138,5 +169,180 @@ def test_contract_and_core_pipeline(client: TestClient) -> None:
     )
     assert video_resp.status_code == 200
     video_job_id = video_resp.json()["data"]["job_id"]
-    video_result = _wait_for_job(client, video_job_id, timeout_sec=120)
-    assert video_result["data"]["job"]["status"] in {"done", "error"}
+
+    # The storyboard doesn't depend on the inpaint result, so both are queued up front.
+    finished = _wait_for_jobs(client, [inpaint_job_id, video_job_id], timeout_sec=120)
+    assert finished[inpaint_job_id]["status"] == "done"
+    assert finished[video_job_id]["status"] in {"done", "error"}
+
+
+def test_capabilities_etag_revalidation(client: TestClient) -> None:
+    first = client.get("/api/v1/system/capabilities")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    cached = client.get("/api/v1/system/capabilities", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    for header in (f'"other", {etag}', f"W/{etag}", "*"):
+        assert client.get("/api/v1/system/capabilities", headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/api/v1/system/capabilities", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_upload_dedups_identical_content(client: TestClient) -> None:
+    project_id = _create_project(client, "Dedup")
+
+    upload_ids = []
+    for name in ("a.bin", "b.bin"):
+        resp = client.post(
+            "/api/v1/assets/upload",
+            files={"file": (name, b"same-bytes", "application/octet-stream")},
+            data={"project_id": project_id, "kind": "meta"},
+        )
+        assert resp.status_code == 200
+        upload_ids.append(resp.json()["data"]["asset_id"])
+    assert upload_ids[0] == upload_ids[1]
+
+    download = client.get(f"/api/v1/assets/{upload_ids[0]}")
+    assert download.status_code == 200
+    assert download.content == b"same-bytes"
+    assert download.headers["etag"].startswith('"')
+    assert download.headers["accept-ranges"] == "bytes"
+    revalidated = client.get(
+        f"/api/v1/assets/{upload_ids[0]}",
+        headers={"If-None-Match": download.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+    partial = client.get(
+        f"/api/v1/assets/{upload_ids[0]}",
+        headers={"Range": "bytes=2-5", "If-Range": download.headers["etag"]},
+    )
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == "bytes 2-5/10"
+    assert partial.content == b"me-b"
+
+
+def test_upload_never_overwrites_another_assets_file(client: TestClient) -> None:
+    project_id = _create_project(client, "Overwrite")
+
+    def upload(name: str, content: bytes) -> str:
+        resp = client.post(
+            "/api/v1/assets/upload",
+            files={"file": (name, content, "application/octet-stream")},
+            data={"project_id": project_id, "kind": "meta"},
+        )
+        assert resp.status_code == 200
+        return resp.json()["data"]["asset_id"]
+
+    first = upload("a.bin", b"bytes-x")
+    second = upload("b.bin", b"bytes-y")
+    assert upload("b.bin", b"bytes-x") == first
+    third = upload("a.bin", b"bytes-z")
+
+    second_file = client.get(f"/api/v1/assets/{second}")
+    assert second_file.status_code == 200
+    assert second_file.content == b"bytes-y"
+    first_file = client.get(f"/api/v1/assets/{first}")
+    third_file = client.get(f"/api/v1/assets/{third}")
+    assert first_file.content == b"bytes-x"
+    assert third_file.content == b"bytes-z"
+    assert first_file.headers["etag"] != third_file.headers["etag"]
+
+
+def test_jobs_status_bulk_reports_missing_ids(client: TestClient) -> None:
+    project_id = _create_project(client, "Bulk")
+    job_id = client.post(
+        "/api/v1/copy/generate",
+        json={"project_id": project_id, "goal": "Drive signups", "cta": "Join now"},
+    ).json()["data"]["job_id"]
+
+    resp = client.post("/api/v1/jobs/status/bulk", json={"job_ids": ["missing", job_id, job_id]})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert [job["id"] for job in data["jobs"]] == [job_id]
+    assert data["missing"] == ["missing"]
+    _wait_for_job(client, job_id)
+
+
+def test_queue_endpoints_reject_unknown_project(client: TestClient) -> None:
+    resp = client.post(
+        "/api/v1/copy/generate",
+        json={"project_id": "missing", "goal": "Drive signups", "cta": "Join now"},
+    )
+    assert resp.status_code == 404
+    assert resp.json()["error"]["message"] == "project_id 'missing' was not found"
+
+    invalid = client.post("/api/v1/copy/generate", json={"goal": "Drive signups", "cta": "Join now"})
+    assert invalid.status_code == 422
+
+    unknown_field = client.post(
+        "/api/v1/copy/generate",
+        json={"project_id": "missing", "goal": "Drive signups", "cta": "Join now", "bogus": 1},
+    )
+    assert unknown_field.status_code == 422
+
+
+def test_job_events_stream_until_terminal(client: TestClient) -> None:
+    project_id = _create_project(client, "Events")
+    job_id = client.post(
+        "/api/v1/copy/generate",
+        json={"project_id": project_id, "goal": "more daily hydration", "cta": "Shop now"},
+    ).json()["data"]["job_id"]
+
+    events = []
+    with client.stream("GET", f"/api/v1/jobs/{job_id}/events") as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        for line in resp.iter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+
+    assert "assets" in events[0]
+    assert events[-1]["job"]["status"] == "done"
+    assert events[-1]["assets"]
+
+    assert client.get("/api/v1/jobs/missing/events").status_code == 404
+
+
+def test_zero_copy_file_response_full_and_single_range(tmp_path) -> None:
+    import asyncio
+    import os
+
+    from app.api.assets import ZeroCopyFileResponse
+
+    path = tmp_path / "clip.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+
+    def serve(headers: list[tuple[bytes, bytes]]) -> list[dict]:
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": headers,
+            "extensions": {"http.response.zerocopysend": {}},
+        }
+        messages: list[dict] = []
+
+        async def receive() -> dict:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.zerocopysend":
+                os.lseek(message["file"], message.get("offset", 0), os.SEEK_SET)
+                count = message.get("count", path.stat().st_size)
+                message = {**message, "body": os.read(message["file"], count)}
+            messages.append(message)
+
+        asyncio.run(ZeroCopyFileResponse(path)(scope, receive, send))
+        return messages
+
+    start, sent = serve([])
+    assert start["status"] == 200
+    assert sent["type"] == "http.response.zerocopysend"
+    assert sent["body"] == path.read_bytes()
+
+    start, sent = serve([(b"range", b"bytes=10-19")])
+    assert start["status"] == 206
+    assert (b"content-range", b"bytes 10-19/1024") in start["headers"]
+    assert (sent["offset"], sent["count"]) == (10, 10)
+    assert sent["body"] == path.read_bytes()[10:20]
@@ -1,22 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
+from app.db.models import ProjectRow
 from app.db.repo import Repository
+from app.services import job_queue
+from app.services.job_queue import JobQueue, ProgressReporter
 
 
-def test_job_state_transitions(tmp_path: Path) -> None:
-    repo = Repository(tmp_path / "app.db")
-    repo.init_db()
-    project = repo.create_project(
-        name="p",
-        brand_name="b",
-        product="prod",
-        audience="aud",
-        offer="off",
-        tone="tone",
-        platform_targets=["9:16"],
-    )
+def test_job_state_transitions(repo: Repository, project: ProjectRow) -> None:
     job = repo.create_job(
         project_id=project["id"],
         job_type="copy_generate",
@@ -28,3 +21,188 @@ def test_job_state_transitions(tmp_path: Path) -> None:
     done = repo.update_job(job["id"], status="done", progress_pct=100, stage="completed")
     assert done and done["status"] == "done"
 
+
+def test_create_jobs_bulk_inserts_all_rows(repo: Repository, project: ProjectRow) -> None:
+    rows = [
+        repo.new_job_row(project_id=project["id"], job_type="copy_generate", params={"idx": idx})
+        for idx in range(3)
+    ]
+    repo.create_jobs_bulk(rows)
+    stored = repo.list_jobs(project_id=project["id"])
+    assert {job["id"] for job in stored} == {row["id"] for row in rows}
+    assert all(job["status"] == "queued" for job in stored)
+
+
+def test_create_assets_bulk_keeps_order(repo: Repository, project: ProjectRow) -> None:
+    job = repo.create_job(project_id=project["id"], job_type="video_storyboard", params={})
+    rows = [
+        repo.new_asset_row(project_id=project["id"], job_id=job["id"], kind=kind, path=f"/{kind}", meta={})
+        for kind in ("image", "subtitle", "meta")
+    ]
+    created = repo.create_assets_bulk(rows)
+    assert [asset["id"] for asset in created] == [row["id"] for row in rows]
+    _job, assets = repo.get_job_with_assets(job["id"])
+    assert {asset["id"] for asset in assets} == {row["id"] for row in rows}
+    assert repo.get_asset(rows[1]["id"])["kind"] == "subtitle"
+
+
+def test_cached_reads_follow_job_updates(repo: Repository, project: ProjectRow) -> None:
+    job = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+    assert repo.get_job(job["id"])["status"] == "queued"
+    repo.cancel_job(job["id"])
+    assert repo.get_job(job["id"])["status"] == "cancelled"
+    fetched = repo.get_project(project["id"])
+    fetched["name"] = "mutated"
+    assert repo.get_project(project["id"])["name"] == "p"
+    fetched["platform_targets"].append("1:1")
+    assert repo.get_project(project["id"])["platform_targets"] == ["9:16"]
+
+    job = repo.create_job(project_id=project["id"], job_type="copy_generate", params={"tags": ["a"]})
+    repo.get_job(job["id"])["params"]["tags"].append("b")
+    job["params"]["tags"].append("c")
+    assert repo.get_job(job["id"])["params"] == {"tags": ["a"]}
+    asset = repo.create_asset(project_id=project["id"], job_id=job["id"], kind="meta", path="/m", meta={"n": 1})
+    repo.get_asset(asset["id"])["meta"]["n"] = 2
+    assert repo.get_asset(asset["id"])["meta"] == {"n": 1}
+
+
+def test_get_job_with_assets_single_query(
+    repo: Repository, project: ProjectRow, tmp_path: Path
+) -> None:
+    job = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+    fetched, assets = repo.get_job_with_assets(job["id"])
+    assert fetched and fetched["id"] == job["id"]
+    assert assets == []
+
+    asset = repo.create_asset(
+        project_id=project["id"],
+        job_id=job["id"],
+        kind="copy",
+        path=str(tmp_path / "copy.json"),
+        meta={"count": 1},
+    )
+    _, assets = repo.get_job_with_assets(job["id"])
+    assert assets == [asset]
+    assert repo.get_job_with_assets("missing") == (None, [])
+
+
+def test_concurrent_create_job_without_python_lock(
+    disk_repo: Repository, disk_project: ProjectRow
+) -> None:
+    repo, project = disk_repo, disk_project
+
+    async def create_many() -> list:
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    repo.create_job,
+                    project_id=project["id"],
+                    job_type="copy_generate",
+                    params={"idx": idx},
+                )
+                for idx in range(100)
+            )
+        )
+
+    created = asyncio.run(create_many())
+    assert len(repo.list_jobs(project_id=project["id"])) == len(created) == 100
+
+
+def test_list_active_jobs_skips_finished(repo: Repository, project: ProjectRow) -> None:
+    queued = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+    finished = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+    repo.update_job(finished["id"], status="done", stage="completed")
+    assert [job["id"] for job in repo.list_active_jobs()] == [queued["id"]]
+
+
+def test_progress_reporter_writes_latest_and_surfaces_cancel(
+    disk_repo: Repository, disk_project: ProjectRow
+) -> None:
+    repo, project = disk_repo, disk_project
+    job = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+
+    async def run() -> None:
+        reporter = ProgressReporter(repo, job["id"])
+        reporter.post("rendering", 10)
+        reporter.post("rendering", 40)
+        while repo.get_job(job["id"])["progress_pct"] != 40:
+            await asyncio.sleep(0.01)
+
+        repo.cancel_job(job["id"])
+        reporter.post("saving", 80)
+        while not reporter.cancelled:
+            await asyncio.sleep(0.01)
+        try:
+            reporter.post("saving", 90)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("post after cancel should raise")
+        await reporter.close()
+
+    asyncio.run(run())
+    final = repo.get_job(job["id"])
+    assert final["status"] == "cancelled"
+    assert final["stage"] == "cancelled"
+
+
+def test_job_queue_cancel_during_handler_is_not_marked_done(
+    disk_repo: Repository, disk_project: ProjectRow
+) -> None:
+    repo, project = disk_repo, disk_project
+    job = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+
+    async def handler(job: dict, progress) -> dict:
+        await asyncio.to_thread(repo.cancel_job, job["id"])
+        await progress("saving", 85)
+        return {"asset_ids": []}
+
+    async def run() -> None:
+        queue = JobQueue(repo)
+        queue.register_handler("copy_generate", handler)
+        await queue._run_job(job["id"], 0)
+
+    asyncio.run(run())
+    final = repo.get_job(job["id"])
+    assert final["status"] == "error"
+    assert final["error_text"] == "Job was cancelled."
+
+
+def test_job_queue_recovers_every_active_job_on_start(
+    repo: Repository, project: ProjectRow, monkeypatch
+) -> None:
+    monkeypatch.setattr(job_queue, "RECOVERY_PAGE_SIZE", 2)
+    queued = [
+        repo.create_job(project_id=project["id"], job_type="copy_generate", params={})["id"]
+        for _ in range(3)
+    ]
+    orphan = repo.create_job(project_id=project["id"], job_type="copy_generate", params={})
+    repo.update_job(orphan["id"], status="running", stage="rendering")
+
+    async def recover() -> list[str]:
+        queue = JobQueue(repo)
+        await queue._recover_jobs()
+        return [queue._queue.get_nowait() for _ in range(queue._queue.qsize())]
+
+    assert sorted(asyncio.run(recover())) == sorted(queued)
+    interrupted = repo.get_job(orphan["id"])
+    assert interrupted["status"] == "error"
+    assert interrupted["error_text"] == "Interrupted by a server restart."
+
+
+def test_job_queue_stop_flushes_pending_submits(repo: Repository, project: ProjectRow) -> None:
+    async def run() -> list:
+        queue = JobQueue(repo, batch_delay_sec=0.2)
+        await queue.start()
+        submits = [
+            asyncio.create_task(
+                queue.submit(project_id=project["id"], job_type="copy_generate", params={"idx": idx})
+            )
+            for idx in range(2)
+        ]
+        await asyncio.sleep(0)
+        await queue.stop()
+        return await asyncio.wait_for(asyncio.gather(*submits), 1)
+
+    created = asyncio.run(run())
+    assert all(repo.get_job(job["id"]) is not None for job in created)
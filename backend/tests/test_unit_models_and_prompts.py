@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from app.config import Settings
 from app.services.copy_gen import CopyGenerator
-from app.services.image_gen import ImageGenerator
+from app.services.image_gen import ImageGenerator, _BatchSlot, _DiffusersBatcher
+from app.services.inpaint import InpaintService
 from app.services.model_manager import PLATFORM_SIZES
-from app.services.model_manager import ModelManager
+from app.services.model_manager import ModelIndexCache, ModelManager, find_model_index_dir
+from app.services.model_registry import ModelRegistry
 from app.services.prompt_enhancer import PromptEnhancer
 
 
-def test_platform_dimensions_mapping() -> None:
-    assert PLATFORM_SIZES["9:16"] == (1080, 1920)
-    assert PLATFORM_SIZES["4:5"] == (1080, 1350)
-    assert PLATFORM_SIZES["1:1"] == (1080, 1080)
+@pytest.mark.parametrize(
+    ("ratio", "expected"),
+    [("9:16", (1080, 1920)), ("4:5", (1080, 1350)), ("1:1", (1080, 1080))],
+)
+def test_platform_dimensions_mapping(ratio: str, expected: tuple[int, int]) -> None:
+    assert PLATFORM_SIZES[ratio] == expected
 
 
-def test_copy_generator_builds_requested_count() -> None:
-    generator = CopyGenerator()
+def test_copy_generator_builds_requested_count(copy_gen: CopyGenerator) -> None:
     project = {
         "id": "p1",
         "brand_name": "Nova",
@@ -26,7 +34,7 @@ def test_copy_generator_builds_requested_count() -> None:
         "offer": "20% launch deal",
         "tone": "bold",
     }
-    results = generator.generate(
+    results = copy_gen.generate(
         project=project,
         goal="better hydration",
         cta="Shop now",
@@ -37,8 +45,23 @@ def test_copy_generator_builds_requested_count() -> None:
     assert all("hook" in row and "headline" in row for row in results)
 
 
-def test_prompt_enhancer_generates_platform_specific_prompt() -> None:
-    enhancer = PromptEnhancer()
+def test_copy_generator_gguf_discovery_follows_directory_changes(tmp_path: Path) -> None:
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    generator = CopyGenerator(tmp_path)
+    assert generator._discover_gguf_model() is None
+
+    (text_dir / "b-model.gguf").write_bytes(b"")
+    assert generator._discover_gguf_model() == text_dir / "b-model.gguf"
+
+    (text_dir / "a-model.gguf").write_bytes(b"")
+    assert generator._discover_gguf_model() == text_dir / "a-model.gguf"
+
+    (text_dir / "z-model.Q4_K_M.gguf").write_bytes(b"")
+    assert generator._discover_gguf_model() == text_dir / "z-model.Q4_K_M.gguf"
+
+
+def test_prompt_enhancer_generates_platform_specific_prompt(prompt_enhancer: PromptEnhancer) -> None:
     project = {
         "id": "p1",
         "brand_name": "Nova",
@@ -47,7 +70,7 @@ def test_prompt_enhancer_generates_platform_specific_prompt() -> None:
         "offer": "20% launch deal",
         "tone": "bold",
     }
-    result = enhancer.improve(
+    result = prompt_enhancer.improve(
         project=project,
         prompt="cinematic bottle close-up with water drops",
         platform="9:16",
@@ -66,24 +89,311 @@ def test_image_generator_resolution_buckets() -> None:
     assert ImageGenerator.bucket_dimensions("hq", "1:1") == (1024, 1024)
 
 
-def test_image_generator_attempt_plan_retries_lower_cost() -> None:
-    attempts = ImageGenerator.attempt_plan(1024, 1024, 30)
-    assert attempts[0] == (1024, 1024, 30)
+@pytest.mark.parametrize(
+    ("width", "height", "steps"),
+    [(1024, 1024, 30), (640, 1136, 8), (768, 960, 4)],
+)
+def test_image_generator_attempt_plan_retries_lower_cost(width: int, height: int, steps: int) -> None:
+    attempts = ImageGenerator.attempt_plan(width, height, steps)
+    assert attempts[0] == (width, height, steps)
     assert attempts[1][0] < attempts[0][0]
     assert attempts[1][1] < attempts[0][1]
     assert attempts[2][2] < attempts[1][2]
 
 
-def test_model_manager_defaults_and_strict_env(tmp_path: Path, monkeypatch) -> None:
-    settings = Settings(
-        model_path=tmp_path / "models",
-        data_dir=tmp_path / "data",
-        db_path=tmp_path / "data" / "app.db",
-        projects_dir=tmp_path / "data" / "projects",
-        exports_dir=tmp_path / "data" / "exports",
-        max_concurrent_jobs=1,
-        default_language="en",
+class _FakeParam:
+    def __init__(self, nbytes: int):
+        self._nbytes = nbytes
+
+    def numel(self) -> int:
+        return self._nbytes
+
+    def element_size(self) -> int:
+        return 1
+
+
+class _FakePipe:
+    def __init__(self, unet_bytes: int, other_bytes: int):
+        self.unet = SimpleNamespace(parameters=lambda: [_FakeParam(unet_bytes)])
+        vae = SimpleNamespace(parameters=lambda: [_FakeParam(other_bytes)])
+        self.components = {"unet": self.unet, "vae": vae}
+        self.calls: list[str] = []
+
+    def to(self, device: str) -> None:
+        self.calls.append(f"to:{device}")
+
+    def enable_model_cpu_offload(self) -> None:
+        self.calls.append("model_offload")
+
+    def enable_sequential_cpu_offload(self) -> None:
+        self.calls.append("sequential_offload")
+
+
+def test_image_generator_offloads_when_vram_is_short() -> None:
+    def fake_torch(free: int) -> SimpleNamespace:
+        return SimpleNamespace(cuda=SimpleNamespace(mem_get_info=lambda: (free, free)))
+
+    roomy = _FakePipe(unet_bytes=100, other_bytes=100)
+    assert ImageGenerator._place_pipeline(pipe=roomy, torch=fake_torch(10_000), device="cuda") == "none"
+    assert roomy.calls == ["to:cuda"]
+
+    tight = _FakePipe(unet_bytes=100, other_bytes=400)
+    assert ImageGenerator._place_pipeline(pipe=tight, torch=fake_torch(300), device="cuda") == "model"
+    assert tight.calls == ["model_offload"]
+
+    tiny = _FakePipe(unet_bytes=1_000, other_bytes=1_000)
+    assert ImageGenerator._place_pipeline(pipe=tiny, torch=fake_torch(300), device="cuda") == "sequential"
+
+
+def test_image_generator_reuses_seeded_generators(settings: Settings) -> None:
+    created: list[object] = []
+
+    class FakeGenerator:
+        def __init__(self, device: str):
+            self.device = device
+            self.seed: int | None = None
+            created.append(self)
+
+        def manual_seed(self, seed: int) -> "FakeGenerator":
+            self.seed = seed
+            return self
+
+    fake_torch = SimpleNamespace(Generator=FakeGenerator)
+    generator = ImageGenerator(ModelManager(settings))
+    first = generator._seeded_generators(torch=fake_torch, device="cpu", seeds=[1, 2])
+    second = generator._seeded_generators(torch=fake_torch, device="cpu", seeds=[7])
+    assert len(created) == 2
+    assert second[0] is first[0]
+    assert second[0].seed == 7
+
+
+def test_image_generator_reuses_identical_results(tmp_path: Path, settings: Settings) -> None:
+    generator = ImageGenerator(ModelManager(settings))
+    source = tmp_path / "job1" / "image.png"
+    source.parent.mkdir()
+    source.write_bytes(b"png-bytes")
+    generator._remember_result("key", source, {"engine": "diffusers", "seed": 3})
+
+    target = tmp_path / "job2" / "image.png"
+    meta = generator._reuse_result("key", target)
+    assert meta == {"engine": "diffusers", "seed": 3, "cache_hit": True}
+    assert target.read_bytes() == b"png-bytes"
+    assert generator._reuse_result("other", target) is None
+
+    # A fresh generator (e.g. after a restart) still finds the stored render.
+    restarted = ImageGenerator(ModelManager(settings))
+    source.unlink()
+    later = tmp_path / "job3" / "image.png"
+    assert restarted._reuse_result("key", later) == {"engine": "diffusers", "seed": 3, "cache_hit": True}
+    assert later.read_bytes() == b"png-bytes"
+
+
+def test_image_generator_result_key_tracks_render_settings(
+    tmp_path: Path, settings: Settings, monkeypatch
+) -> None:
+    model_dir = settings.model_path / "image" / "sdxl-base"
+    model_dir.mkdir(parents=True)
+    (model_dir / "model_index.json").write_text("{}")
+    generator = ImageGenerator(ModelManager(settings))
+    key_args = dict(
+        model_key="image_hq_sdxl_base",
+        prompt="p",
+        negative_prompt="",
+        platform="1:1",
+        mode="hq",
+        seed=1,
+    )
+    monkeypatch.delenv("CLIPPER_QUANTIZE", raising=False)
+    monkeypatch.delenv("CLIPPER_BACKEND", raising=False)
+    baseline = generator._result_key(**key_args)
+    monkeypatch.setenv("CLIPPER_QUANTIZE", "int8")
+    quantized = generator._result_key(**key_args)
+    monkeypatch.setenv("CLIPPER_BACKEND", "ort_cuda")
+    assert len({baseline, quantized, generator._result_key(**key_args)}) == 3
+
+    # OOM-downsized renders are not served as the full-size result.
+    source = tmp_path / "retry.png"
+    source.write_bytes(b"small")
+    generator._remember_result(baseline, source, {"engine": "diffusers", "retry_count": 1})
+    assert generator._reuse_result(baseline, tmp_path / "out.png") is None
+
+
+def test_image_generator_generate_many_matches_generate(
+    tmp_path: Path, settings: Settings, monkeypatch
+) -> None:
+    monkeypatch.setenv("CLIPPER_STRICT_REAL_IMAGE", "0")
+    generator = ImageGenerator(ModelManager(settings))
+    paths = [tmp_path / f"scene_{idx}.png" for idx in range(3)]
+    metas = generator.generate_many(
+        prompts=["a", "b", "c"],
+        negative_prompt="",
+        platform="9:16",
+        mode="draft",
+        output_paths=paths,
+        seeds=[11, 12, None],
+    )
+    single = generator.generate(
+        prompt="c", negative_prompt="", platform="9:16", mode="draft", output_path=tmp_path / "c.png"
+    )
+    assert [meta["seed"] for meta in metas[:2]] == [11, 12]
+    assert metas[2] == single
+    assert all(path.exists() for path in paths)
+    assert (tmp_path / "c.png").read_bytes() == paths[2].read_bytes()
+
+
+def test_model_registry_evicts_least_recent_pipeline_per_device() -> None:
+    registry = ModelRegistry({"cpu": 2, "cuda": 1})
+    evicted: list[str] = []
+    for model_key in ("legacy_sd_turbo", "image_fast_sdxl_turbo"):
+        registry.get_or_load(model_key, "cpu", object, on_evict=lambda key=model_key: evicted.append(key))
+    registry.get_or_load("inpaint_hq_sdxl", "cuda", object)
+    assert registry.get("legacy_sd_turbo", "cpu") is not None
+
+    loads: list[str] = []
+    registry.get_or_load("image_hq_sdxl_base", "cpu", lambda: loads.append("hq") or object())
+    registry.get_or_load("image_hq_sdxl_base", "cpu", lambda: loads.append("hq") or object())
+    assert loads == ["hq"]
+    assert evicted == ["image_fast_sdxl_turbo"]
+    assert registry.loaded_keys() == ["inpaint_hq_sdxl", "legacy_sd_turbo", "image_hq_sdxl_base"]
+
+    registry.evict_all()
+    assert registry.loaded_keys() == []
+    assert evicted == ["image_fast_sdxl_turbo", "legacy_sd_turbo"]
+
+
+def test_inpaint_blurred_mask_matches_full_frame_blur() -> None:
+    import numpy as np
+    from PIL import Image, ImageFilter
+
+    for box in [(100, 100, 300, 250), (0, 0, 40, 512), (480, 480, 512, 512)]:
+        mask = Image.new("L", (512, 512), color=0)
+        mask.paste(255, box)
+        expected = np.asarray(mask.filter(ImageFilter.GaussianBlur(radius=2)))
+        assert np.array_equal(InpaintService._blurred_mask(mask, radius=2), expected)
+    assert not InpaintService._blurred_mask(Image.new("L", (64, 64), color=0), radius=2).any()
+
+
+def test_inpaint_fallback_edits_tiny_and_soft_masks(tmp_path: Path, monkeypatch) -> None:
+    import numpy as np
+    from PIL import Image
+
+    monkeypatch.setenv("CLIPPER_STRICT_REAL_INPAINT", "0")
+    service = InpaintService(tmp_path / "models")
+    base_path = tmp_path / "base.png"
+    Image.new("RGB", (256, 256), color=(10, 20, 30)).save(base_path)
+
+    def run(mask: Image.Image, name: str) -> tuple[dict, np.ndarray]:
+        mask_path = tmp_path / f"{name}_mask.png"
+        mask.save(mask_path)
+        out_path = tmp_path / f"{name}.png"
+        meta = service.apply(
+            image_path=base_path,
+            mask_path=mask_path,
+            edit_prompt="red",
+            mode="draft",
+            strength=1.0,
+            output_path=out_path,
+        )
+        return meta, np.asarray(Image.open(out_path).convert("RGB"))
+
+    stroke = Image.new("L", (256, 256), color=0)
+    stroke.paste(255, (100, 100, 102, 102))
+    meta, _ = run(stroke, "stroke")
+    assert meta["changed_pixels"] > 0
+
+    # A uniformly grey mask blends by its value instead of at full strength.
+    _, soft = run(Image.new("L", (256, 256), color=128), "soft")
+    _, full = run(Image.new("L", (256, 256), color=255), "full")
+    assert not np.array_equal(soft[:100], full[:100])
+
+
+def test_inpaint_warmup_skips_single_slot_cuda_registry(tmp_path: Path, monkeypatch) -> None:
+    service = InpaintService(tmp_path / "models")
+    monkeypatch.setattr(service, "_gpu_available", lambda: True)
+    monkeypatch.setattr(service, "_resolve_model_key", lambda mode: "inpaint_hq")
+    monkeypatch.setattr(service, "_model_dir", lambda model_key: tmp_path)
+    loads: list[str] = []
+
+    def fake_get_pipeline(model_key: str, model_dir: Path) -> tuple:
+        loads.append(model_key)
+        return object(), "cuda", None, None
+
+    monkeypatch.setattr(service, "_get_pipeline", fake_get_pipeline)
+    assert service.warmup() is False
+    service.registry.capacity["cuda"] = 2
+    assert service.warmup() is True
+    assert loads == ["inpaint_hq"]
+
+
+def test_inpaint_starts_at_largest_attempt_that_fits() -> None:
+    attempts = InpaintService._attempt_plan(width=1024, height=1024, steps=30)
+    gib = 1024**3
+    fits = InpaintService._first_fitting_attempt
+    assert fits(attempts, free_bytes=None, bytes_per_pixel=3072) == 0
+    assert fits(attempts, free_bytes=8 * gib, bytes_per_pixel=3072) == 0
+    assert fits(attempts, free_bytes=3 * gib, bytes_per_pixel=3072) == 1
+    assert fits(attempts, free_bytes=gib // 2, bytes_per_pixel=3072) == len(attempts) - 1
+
+
+def test_diffusers_batcher_coalesces_concurrent_calls() -> None:
+    batcher = _DiffusersBatcher(window_sec=0.2, max_batch=4)
+    calls: list[list[str]] = []
+
+    def execute(slots: list[_BatchSlot]) -> list[str]:
+        calls.append([slot.prompt for slot in slots])
+        return [f"img:{slot.prompt}" for slot in slots]
+
+    results: dict[str, str] = {}
+
+    def worker(prompt: str) -> None:
+        slot = _BatchSlot(prompt=prompt, negative_prompt="", seed=1)
+        results[prompt] = batcher.run(("k", 512, 512), slot, execute)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(calls[0]) == ["a", "b", "c"]
+    assert results == {"a": "img:a", "b": "img:b", "c": "img:c"}
+
+
+def test_find_model_index_dir_walks_shallowest_first(tmp_path: Path) -> None:
+    snapshot = tmp_path / "models--org--name" / "snapshots" / "abc123"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model_index.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "blobs" / "x").mkdir(parents=True)
+    (tmp_path / "blobs" / "x" / "model_index.json").write_text("{}", encoding="utf-8")
+    assert find_model_index_dir(tmp_path) == snapshot
+    assert find_model_index_dir(tmp_path, max_depth=2) is None
+    assert find_model_index_dir(tmp_path / "missing") is None
+
+
+def test_model_index_cache_rescans_only_when_folder_changes(tmp_path: Path, monkeypatch) -> None:
+    import app.services.model_manager as model_manager
+
+    walks: list[Path] = []
+    real_find = model_manager.find_model_index_dir
+    monkeypatch.setattr(
+        model_manager, "find_model_index_dir", lambda root: walks.append(root) or real_find(root)
     )
+    cache = ModelIndexCache()
+    folder = tmp_path / "sdxl-base"
+    assert cache.lookup(folder) is None
+    folder.mkdir()
+    assert cache.find(folder) is None
+    assert cache.find(folder) is None
+    assert walks == [folder]
+
+    (folder / "model_index.json").write_text("{}", encoding="utf-8")
+    os.utime(folder, ns=(0, folder.stat().st_mtime_ns + 1))
+    assert cache.find(folder) == folder
+    assert len(walks) == 2
+
+
+def test_model_manager_defaults_and_strict_env(settings: Settings, monkeypatch) -> None:
     settings.model_path.mkdir(parents=True, exist_ok=True)
     monkeypatch.setenv("CLIPPER_STRICT_REAL_IMAGE", "1")
     monkeypatch.setenv("CLIPPER_STRICT_REAL_INPAINT", "1")
@@ -93,3 +403,174 @@ def test_model_manager_defaults_and_strict_env(tmp_path: Path, monkeypatch) -> N
     assert manager.hq_image_model_default() == "unavailable"
     assert manager.strict_real_image_enabled() is True
     assert manager.strict_real_inpaint_enabled() is True
+
+    # Flags are read once; refresh() picks up a changed environment.
+    monkeypatch.setenv("CLIPPER_STRICT_REAL_IMAGE", "0")
+    assert manager.strict_real_image_enabled() is True
+    manager.refresh()
+    assert manager.strict_real_image_enabled() is False
+
+
+def test_model_manager_probes_gpu_once_until_refresh(settings: Settings, monkeypatch) -> None:
+    probes: list[int] = []
+
+    def fake_probe() -> dict:
+        probes.append(1)
+        return {"available": False, "name": None, "vram_gb": None, "cuda": None}
+
+    monkeypatch.setattr(ModelManager, "_probe_gpu", staticmethod(fake_probe))
+    manager = ModelManager(settings)
+    manager.system_capabilities()
+    manager.gpu_info()["available"] = True
+    assert manager.gpu_available() is False
+    assert len(probes) == 1
+
+    manager.refresh()
+    manager.gpu_info()
+    assert len(probes) == 2
+
+
+class _FakeLatent:
+    shape = (1,)
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __sub__(self, other: "_FakeLatent") -> "_FakeLatent":
+        return _FakeLatent(self.value - other.value)
+
+    def abs(self) -> "_FakeLatent":
+        return _FakeLatent(abs(self.value))
+
+    def mean(self) -> "_FakeLatent":
+        return self
+
+    def clamp_min(self, low: float) -> "_FakeLatent":
+        return _FakeLatent(max(self.value, low))
+
+    def __truediv__(self, other: "_FakeLatent") -> float:
+        return self.value / other.value
+
+
+def test_denoiser_step_cache_skips_small_changes_per_branch() -> None:
+    from app.services.video_t2v import _DenoiserStepCache
+
+    calls: list[tuple[float, str]] = []
+    denoiser = SimpleNamespace()
+    denoiser.forward = lambda hidden_states, timestep, encoder_hidden_states: (
+        calls.append((hidden_states.value, encoder_hidden_states[0])) or encoder_hidden_states[0]
+    )
+    cache = _DenoiserStepCache(denoiser)
+    cache.reset(threshold=0.15, num_steps=4)
+
+    cond, uncond = "cond", "uncond"
+    outputs = []
+    for timestep, latent in zip((999, 666, 333, 0), (1.0, 1.05, 1.5, 1.55)):
+        for embeds in (cond, uncond):
+            # Pipelines may build fresh embedding tensors every step.
+            outputs.append(
+                denoiser.forward(
+                    hidden_states=_FakeLatent(latent), timestep=timestep, encoder_hidden_states=[embeds]
+                )
+            )
+
+    assert outputs == [cond, uncond] * 4
+    assert calls == [(1.0, cond), (1.0, uncond), (1.5, cond), (1.5, uncond), (1.55, cond), (1.55, uncond)]
+    assert cache.skipped == 2
+    assert len(cache._branches) == 2
+
+    cache.reset(threshold=0.0, num_steps=0)
+    denoiser.forward(hidden_states=_FakeLatent(2.0), timestep=999, encoder_hidden_states=[cond])
+    assert calls[-1] == (2.0, cond)
+
+
+def test_encode_image_sequence_builds_concat_list(tmp_path: Path, monkeypatch) -> None:
+    import subprocess
+
+    from app.services import video_storyboard
+
+    scenes = [tmp_path / "scene_01.png", tmp_path / "it's.png"]
+    captured: dict = {}
+
+    def fake_run(cmd, **kwargs):
+        captured["cmd"] = cmd
+        captured["list"] = Path(cmd[cmd.index("-i") + 1]).read_text(encoding="utf-8")
+        Path(cmd[-1]).write_bytes(b"mp4")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(video_storyboard.subprocess, "run", fake_run)
+    output = video_storyboard.encode_image_sequence(
+        ffmpeg_exe="ffmpeg",
+        image_paths=scenes,
+        seconds_per_image=2.5,
+        output_path=tmp_path / "out.mp4",
+        fps=24,
+    )
+
+    assert output == tmp_path / "out.mp4"
+    entries = captured["list"].splitlines()
+    assert entries[0] == "ffconcat version 1.0"
+    assert entries[-1] == entries[-3] == "file '" + str(scenes[1].resolve()).replace("'", "'\\''") + "'"
+    assert entries.count("duration 2.500000") == 2
+    assert captured["cmd"][captured["cmd"].index("-t") + 1] == "5.000"
+    assert "-tune" in captured["cmd"]
+    assert not (tmp_path / "out.ffconcat").exists()
+
+
+def test_encode_image_sequence_falls_back_to_libx264(tmp_path: Path, monkeypatch) -> None:
+    import subprocess
+
+    from app.services import video_storyboard
+
+    codecs: list[str] = []
+
+    def fake_run(cmd, **kwargs):
+        codecs.append(cmd[cmd.index("-c:v") + 1])
+        if codecs[-1] == "libx264":
+            Path(cmd[-1]).write_bytes(b"mp4")
+            return subprocess.CompletedProcess(cmd, 0)
+        return subprocess.CompletedProcess(cmd, 1)
+
+    monkeypatch.setattr(video_storyboard.subprocess, "run", fake_run)
+    output = video_storyboard.encode_image_sequence(
+        ffmpeg_exe="ffmpeg",
+        image_paths=[tmp_path / "frame_000.png"],
+        seconds_per_image=0.25,
+        output_path=tmp_path / "out.mp4",
+        fps=4,
+        stills=False,
+        encoder="h264_nvenc",
+    )
+    assert output == tmp_path / "out.mp4"
+    assert codecs == ["h264_nvenc", "libx264"]
+
+
+def test_encode_raw_frames_streams_rgb_to_stdin(tmp_path: Path, monkeypatch) -> None:
+    import io
+
+    from PIL import Image
+
+    from app.services import video_storyboard
+
+    written = io.BytesIO()
+    commands: list[list[str]] = []
+
+    class FakeProc:
+        def __init__(self, cmd, **kwargs):
+            commands.append(cmd)
+            self.stdin = SimpleNamespace(write=written.write, close=lambda: None)
+
+        def wait(self, timeout=None):
+            Path(commands[-1][-1]).write_bytes(b"mp4")
+            return 0
+
+    monkeypatch.setattr(video_storyboard.subprocess, "Popen", FakeProc)
+    frames = [Image.new("RGB", (8, 4), (idx, 0, 0)) for idx in range(3)] + [Image.new("L", (8, 4), 9)]
+    output = video_storyboard.encode_raw_frames(
+        ffmpeg_exe="ffmpeg", frames=frames, output_path=tmp_path / "t2v.mp4", fps=4
+    )
+
+    assert output == tmp_path / "t2v.mp4"
+    assert commands[0][commands[0].index("-s") + 1] == "8x4"
+    assert len(written.getvalue()) == 4 * 8 * 4 * 3
+    assert written.getvalue()[-3:] == bytes((9, 9, 9))
@@ -159,14 +159,20 @@ export async function uploadAsset(
   });
 }
 
+// Short jobs finish in well under a second, so start polling fast and back off.
+const POLL_INITIAL_MS = 150;
+const POLL_MAX_MS = 1200;
+
 export async function pollJob(jobId: string, onProgress?: (job: Job) => void): Promise<{ job: Job; assets: Asset[] }> {
+  let delay = POLL_INITIAL_MS;
   while (true) {
     const result = await getJob(jobId);
     onProgress?.(result.job);
     if (result.job.status === "done" || result.job.status === "error" || result.job.status === "cancelled") {
       return result;
     }
-    await new Promise((resolve) => setTimeout(resolve, 1200));
+    await new Promise((resolve) => setTimeout(resolve, delay));
+    delay = Math.min(delay * 1.7, POLL_MAX_MS);
   }
 }
 
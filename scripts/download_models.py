@@ -3,6 +3,16 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+MODEL_SUBDIRS = (
+    ".cache",
+    "text",
+    "image/sdxl-turbo",
+    "image/sdxl-base",
+    "image/sd-turbo",
+    "inpaint/sdxl-inpaint",
+    "inpaint/sd-inpaint",
+    "video",
+)
 
 STARTER_NOTES = [
     "Starter profile (~8-12GB target):",
@@ -26,16 +36,9 @@ def main() -> None:
     args = parser.parse_args()
 
     model_root = Path(args.model_path)
-    (model_root / ".cache").mkdir(parents=True, exist_ok=True)
-    (model_root / "text").mkdir(parents=True, exist_ok=True)
-    (model_root / "image").mkdir(parents=True, exist_ok=True)
-    (model_root / "image" / "sdxl-turbo").mkdir(parents=True, exist_ok=True)
-    (model_root / "image" / "sdxl-base").mkdir(parents=True, exist_ok=True)
-    (model_root / "image" / "sd-turbo").mkdir(parents=True, exist_ok=True)
-    (model_root / "inpaint").mkdir(parents=True, exist_ok=True)
-    (model_root / "inpaint" / "sdxl-inpaint").mkdir(parents=True, exist_ok=True)
-    (model_root / "inpaint" / "sd-inpaint").mkdir(parents=True, exist_ok=True)
-    (model_root / "video").mkdir(parents=True, exist_ok=True)
+    # Leaves only: parents=True creates image/ and inpaint/ on the way.
+    for sub in MODEL_SUBDIRS:
+        (model_root / sub).mkdir(parents=True, exist_ok=True)
 
     notes = STARTER_NOTES if args.profile == "starter" else FULL_NOTES
     readme = model_root / "MODEL_DOWNLOAD_INSTRUCTIONS.txt"
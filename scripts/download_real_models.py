@@ -1,30 +1,77 @@
 from __future__ import annotations
 
 import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from huggingface_hub import HfApi, hf_hub_download, snapshot_download
 
+# Parallel file downloads inside one repo; --jobs controls how many repos overlap.
+SNAPSHOT_WORKERS = 8
+# Repo file listings are reused from <model-path>/.cache for this long.
+LISTING_CACHE_TTL_SEC = 24 * 3600
+# Written after a complete snapshot; holds the revision sha that was downloaded.
+DOWNLOAD_COMPLETE_MARKER = ".download_complete"
+
 
 def _ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def _list_repo_files(model_root: Path, repo_id: str) -> list[str]:
+    cache_path = model_root / ".cache" / f"{repo_id.replace('/', '--')}.files.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < LISTING_CACHE_TTL_SEC:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    files = HfApi().list_repo_files(repo_id=repo_id)
+    _ensure_dir(cache_path.parent)
+    cache_path.write_text(json.dumps(files), encoding="utf-8")
+    return files
+
+
+def _snapshot(*, repo_id: str, local_dir: Path) -> None:
+    """Download ``repo_id`` unless ``local_dir`` already holds its current revision.
+
+    A re-run then costs one ``repo_info`` call instead of re-hashing every file.
+    """
+    marker = local_dir / DOWNLOAD_COMPLETE_MARKER
+    try:
+        revision = HfApi().repo_info(repo_id=repo_id).sha
+    except Exception:  # noqa: BLE001
+        revision = None
+    if revision and marker.is_file() and marker.read_text(encoding="utf-8").strip() == revision:
+        print(f"{repo_id}: already at {revision[:12]}, skipping")
+        return
+    snapshot_download(
+        repo_id=repo_id,
+        revision=revision,
+        local_dir=str(local_dir),
+        max_workers=SNAPSHOT_WORKERS,
+    )
+    if revision:
+        marker.write_text(revision, encoding="utf-8")
+
+
 def download_text_model(model_root: Path) -> Path:
     text_dir = model_root / "text"
     _ensure_dir(text_dir)
 
     repo_id = "Qwen/Qwen2.5-1.5B-Instruct-GGUF"
-    api = HfApi()
-    files = api.list_repo_files(repo_id=repo_id)
-    ggufs = [file for file in files if file.lower().endswith(".gguf")]
     preferred = None
-    for name in ggufs:
-        if "q4_k_m" in name.lower():
+    fallback = None
+    for name in _list_repo_files(model_root, repo_id):
+        lowered = name.lower()
+        if not lowered.endswith(".gguf"):
+            continue
+        fallback = fallback or name
+        if "q4_k_m" in lowered:
             preferred = name
             break
-    if preferred is None and ggufs:
-        preferred = ggufs[0]
+    preferred = preferred or fallback
     if preferred is None:
         raise RuntimeError(f"No GGUF files found in {repo_id}.")
 
@@ -32,7 +79,6 @@ def download_text_model(model_root: Path) -> Path:
         repo_id=repo_id,
         filename=preferred,
         local_dir=str(text_dir),
-        local_dir_use_symlinks=False,
     )
     return Path(out_path)
 
@@ -40,66 +86,42 @@ def download_text_model(model_root: Path) -> Path:
 def download_image_fast_sdxl_turbo(model_root: Path) -> Path:
     image_dir = model_root / "image" / "sdxl-turbo"
     _ensure_dir(image_dir)
-    snapshot_download(
-        repo_id="stabilityai/sdxl-turbo",
-        local_dir=str(image_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="stabilityai/sdxl-turbo", local_dir=image_dir)
     return image_dir
 
 
 def download_image_hq_sdxl_base(model_root: Path) -> Path:
     image_dir = model_root / "image" / "sdxl-base"
     _ensure_dir(image_dir)
-    snapshot_download(
-        repo_id="stabilityai/stable-diffusion-xl-base-1.0",
-        local_dir=str(image_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="stabilityai/stable-diffusion-xl-base-1.0", local_dir=image_dir)
     return image_dir
 
 
 def download_inpaint_hq_sdxl(model_root: Path) -> Path:
     inpaint_dir = model_root / "inpaint" / "sdxl-inpaint"
     _ensure_dir(inpaint_dir)
-    snapshot_download(
-        repo_id="diffusers/stable-diffusion-xl-1.0-inpainting-0.1",
-        local_dir=str(inpaint_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="diffusers/stable-diffusion-xl-1.0-inpainting-0.1", local_dir=inpaint_dir)
     return inpaint_dir
 
 
 def download_legacy_image_model(model_root: Path) -> Path:
     image_dir = model_root / "image" / "sd-turbo"
     _ensure_dir(image_dir)
-    snapshot_download(
-        repo_id="stabilityai/sd-turbo",
-        local_dir=str(image_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="stabilityai/sd-turbo", local_dir=image_dir)
     return image_dir
 
 
 def download_legacy_inpaint_model(model_root: Path) -> Path:
     inpaint_dir = model_root / "inpaint" / "sd-inpaint"
     _ensure_dir(inpaint_dir)
-    snapshot_download(
-        repo_id="runwayml/stable-diffusion-inpainting",
-        local_dir=str(inpaint_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="runwayml/stable-diffusion-inpainting", local_dir=inpaint_dir)
     return inpaint_dir
 
 
 def download_video_model(model_root: Path) -> Path:
     video_dir = model_root / "video" / "zeroscope_v2_576w"
     _ensure_dir(video_dir)
-    snapshot_download(
-        repo_id="cerspense/zeroscope_v2_576w",
-        local_dir=str(video_dir),
-        local_dir_use_symlinks=False,
-    )
+    _snapshot(repo_id="cerspense/zeroscope_v2_576w", local_dir=video_dir)
     return video_dir
 
 
@@ -127,6 +149,12 @@ def main() -> None:
         ],
         choices=all_targets,
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="How many repos to download at once (default: 4).",
+    )
     args = parser.parse_args()
 
     model_root = Path(args.model_path)
@@ -148,17 +176,30 @@ def main() -> None:
     print(f"Model root: {model_root}")
     print(f"Targets: {', '.join(args.targets)}")
 
-    results: dict[str, str] = {}
+    # Aliases share a downloader; run each one once so two workers never write
+    # the same folder.
+    by_fn: dict[object, list[str]] = {}
     for target in args.targets:
-        fn = actions[target]
-        print(f"Downloading {target}...")
-        try:
-            path = fn(model_root)
-            results[target] = f"ok -> {path}"
-            print(f"{target}: done ({path})")
-        except Exception as exc:  # noqa: BLE001
-            results[target] = f"failed -> {exc}"
-            print(f"{target}: failed ({exc})")
+        by_fn.setdefault(actions[target], []).append(target)
+
+    results: dict[str, str] = {}
+    workers = max(1, min(args.jobs, len(by_fn)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for fn, targets in by_fn.items():
+            print(f"Downloading {', '.join(targets)}...")
+            futures[pool.submit(fn, model_root)] = targets
+        for future in as_completed(futures):
+            targets = futures[future]
+            try:
+                path = future.result()
+                outcome = f"ok -> {path}"
+                print(f"{', '.join(targets)}: done ({path})")
+            except Exception as exc:  # noqa: BLE001
+                outcome = f"failed -> {exc}"
+                print(f"{', '.join(targets)}: failed ({exc})")
+            for target in targets:
+                results[target] = outcome
 
     print("\nSummary:")
     for key in args.targets: